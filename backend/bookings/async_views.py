@@ -0,0 +1,180 @@
+"""
+Async versions of the Stripe payment endpoints, routed instead of the sync ones
+when the app is served over ASGI (see `bookings/urls.py`). Behaviour and
+responses match `payment_views.create_payment_order` and
+`BookingViewSet.verify_payment`; the Stripe calls are awaited, so a worker keeps
+serving other requests while Stripe answers.
+"""
+import asyncio
+from decimal import Decimal
+
+import aiohttp
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from config.async_views import AsyncAPIView
+
+from .models import Booking
+from .payment_views import PaymentThrottle
+from .payments import (
+    StripeAPIError,
+    acreate_stripe_checkout_session,
+    apply_cart_checkout_result,
+    aretrieve_checkout_session,
+    checkout_booking_ids,
+)
+from .permissions import BookingPermission
+from .serializers import BookingSerializer
+from .views import BookingThrottle
+
+
+class CreatePaymentOrderView(AsyncAPIView):
+    """
+    Create a Stripe Checkout Session for a booking
+    Expects: { "booking_id": <id> }
+    Returns: { "session_id": "...", "url": "...", "publishable_key": "..." }
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [PaymentThrottle]
+
+    async def post(self, request):
+        if not settings.STRIPE_SECRET_KEY:
+            return Response(
+                {"detail": "Payment gateway is not configured."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        booking_id = request.data.get("booking_id")
+        if not booking_id:
+            return Response(
+                {"detail": "booking_id is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            booking = await Booking.objects.select_related("session").aget(id=booking_id, user=request.user)
+        except Booking.DoesNotExist:
+            return Response(
+                {"detail": "Booking not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if booking.payment_status == "paid":
+            return Response(
+                {"detail": "Booking already paid."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Skip payment for free sessions
+        if booking.session.price == Decimal("0"):
+            return Response(
+                {"detail": "This is a free session. No payment required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            checkout_session = await acreate_stripe_checkout_session(
+                amount=booking.session.price,
+                booking_id=booking.id,
+                session_title=booking.session.title,
+                customer_email=request.user.email,
+                customer_name=request.user.name,
+            )
+            return Response(
+                {
+                    "session_id": checkout_session["id"],
+                    "url": checkout_session["url"],
+                    "publishable_key": settings.STRIPE_PUBLISHABLE_KEY,
+                },
+                status=status.HTTP_201_CREATED,
+            )
+        except Exception as e:
+            return Response(
+                {"detail": f"Failed to create payment session: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class VerifyPaymentView(AsyncAPIView):
+    """Verify Stripe payment and update booking status"""
+
+    permission_classes = [BookingPermission]
+    throttle_classes = [BookingThrottle]
+
+    def get_booking(self, pk):
+        # The same lookup as BookingViewSet.get_object.
+        user = self.request.user
+        qs = Booking.objects.select_related("session")
+        if getattr(user, "role", None) == "CREATOR":
+            qs = qs.filter(creator=user)
+        else:
+            qs = qs.filter(user=user)
+        try:
+            booking = qs.get(pk=pk)
+        except Booking.DoesNotExist:
+            raise Http404
+        self.check_object_permissions(self.request, booking)
+        return booking
+
+    def serialize(self, booking, checkout_session=None):
+        if checkout_session is not None:
+            apply_cart_checkout_result(booking, checkout_session)
+        return BookingSerializer(booking, context={"request": self.request}).data
+
+    async def post(self, request, pk):
+        booking = await sync_to_async(self.get_booking)(pk)
+        if booking.user_id != request.user.id:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        session_id = request.data.get("session_id")
+
+        if not session_id:
+            return Response(
+                {"detail": "session_id is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if booking.payment_status == "paid":
+            # Already confirmed (usually by the Stripe webhook); no need to ask Stripe again.
+            return Response(
+                {
+                    "detail": "Payment verified successfully.",
+                    "booking": await sync_to_async(self.serialize)(booking),
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        try:
+            # Retrieve the checkout session from Stripe
+            checkout_session = await aretrieve_checkout_session(session_id)
+
+            # Verify the session belongs to this booking (or to a cart holding it)
+            if booking.id not in checkout_booking_ids(checkout_session):
+                return Response(
+                    {"detail": "Session does not match booking."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            # Update booking (and the rest of its cart) based on payment status
+            return Response(
+                {
+                    "detail": "Payment verified successfully.",
+                    "booking": await sync_to_async(self.serialize)(booking, checkout_session),
+                },
+                status=status.HTTP_200_OK,
+            )
+        except (StripeAPIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return Response(
+                {"detail": f"Stripe error: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"detail": f"Payment verification failed: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
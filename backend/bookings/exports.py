@@ -0,0 +1,101 @@
+"""
+Streaming booking exports, as CSV or NDJSON.
+
+Rows come from `.values_list(...).iterator()` (a server-side cursor on Postgres) and
+are formatted as plain strings, never as model instances or serializers, so memory
+stays flat however many bookings there are. The CSV header goes out before the
+query has returned anything.
+"""
+import csv
+import json
+from datetime import datetime
+
+from rest_framework import renderers
+
+# Export column: the lookup it reads.
+COLUMNS = {
+    "id": "id",
+    "created_at": "created_at",
+    "status": "status",
+    "payment_status": "payment_status",
+    "payment_id": "payment_id",
+    "amount_paid": "amount_paid",
+    "user": "user_id",
+    "session": "session_id",
+    "session_title": "session__title",
+    "session_start_time": "session__start_time",
+    "session_price": "session__price",
+}
+# Rows fetched from the cursor at a time, and written to the response at a time.
+CHUNK_SIZE = 2000
+
+
+class ExportRenderer(renderers.BaseRenderer):
+    """
+    Names an export format for content negotiation (`?format=` or `Accept`). Exports
+    are StreamingHttpResponses, which skip rendering; only error bodies get here, and
+    they are sent as JSON.
+    """
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = "application/json"
+        return json.dumps(data).encode()
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+def rows(queryset):
+    return queryset.values_list(*COLUMNS.values()).iterator(chunk_size=CHUNK_SIZE)
+
+
+def _value(value):
+    if isinstance(value, datetime):
+        # As DRF renders it with TIME_ZONE = "UTC".
+        return value.isoformat().replace("+00:00", "Z")
+    if value is None or isinstance(value, (int, str)):
+        return value
+    return str(value)
+
+
+class _Echo:
+    """The file csv.writer writes to: `writerow` returns the formatted line."""
+
+    def write(self, line):
+        return line
+
+
+def _batched(lines):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= CHUNK_SIZE:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def csv_stream(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(COLUMNS)
+    yield from _batched(writer.writerow([_value(value) for value in row]) for row in rows)
+
+
+def ndjson_stream(rows):
+    names = list(COLUMNS)
+    yield from _batched(json.dumps(dict(zip(names, map(_value, row)))) + "\n" for row in rows)
+
+
+STREAMS = {"csv": csv_stream, "ndjson": ndjson_stream}
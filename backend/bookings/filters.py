@@ -0,0 +1,23 @@
+from rest_framework import filters, serializers
+
+
+class BookingQuerySerializer(serializers.Serializer):
+    """Validates the list query parameters accepted by `BookingFilter`."""
+
+    session = serializers.IntegerField(required=False, min_value=1)
+
+
+class BookingFilter(filters.BaseFilterBackend):
+    """Narrow the bookings list to one session with `?session=<id>`."""
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, "action", None) != "list":
+            return queryset
+
+        params = BookingQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        if "session" in data:
+            queryset = queryset.filter(session_id=data["session"])
+        return queryset
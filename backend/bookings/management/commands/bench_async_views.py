@@ -0,0 +1,191 @@
+import asyncio
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+from http.server import ThreadingHTTPServer
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from bookings import async_views
+from bookings.models import Booking
+from bookings.payment_views import create_payment_order
+from bookings.views import BookingViewSet
+from config.http import get_async_session
+from sessions.models import Session
+from users import async_views as users_async_views
+from users.management.commands.bench_github_login import StubGitHubHandler
+from users.views import GitHubLoginView
+
+User = get_user_model()
+
+
+class StubUpstreamHandler(StubGitHubHandler):
+    """The stub GitHub plus the two Stripe Checkout Session endpoints the payment views call."""
+
+    def do_POST(self):
+        if self.path != '/v1/checkout/sessions':
+            return super().do_POST()
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._respond({
+            'id': f'cs_test_{uuid.uuid4().hex}',
+            'object': 'checkout.session',
+            'url': 'https://checkout.stripe.com/c/pay/bench',
+        })
+
+    def do_GET(self):
+        if not self.path.startswith('/v1/checkout/sessions/'):
+            return super().do_GET()
+        # The benchmark names its Checkout Sessions `cs_bench_<booking id>`.
+        session_id = self.path.rsplit('/', 1)[1]
+        self._respond({
+            'id': session_id,
+            'object': 'checkout.session',
+            'client_reference_id': session_id.rsplit('_', 1)[1],
+            # Never "paid", so every verification has to ask Stripe.
+            'payment_status': 'unpaid',
+            'payment_intent': None,
+        })
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the sync and async payment/login views against a local stub Stripe and GitHub '
+        'that answers every call after a fixed latency'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--latency-ms', type=float, default=500, help='Stub latency per upstream call (default: 500)')
+        parser.add_argument('--requests', type=int, default=300, help='Requests per async measurement (default: 300)')
+        parser.add_argument('--concurrency', type=int, default=100, help='Requests in flight on the event loop (default: 100)')
+        parser.add_argument('--sync-requests', type=int, default=6, help='Requests per sync measurement (default: 6)')
+
+    def handle(self, *args, **options):
+        StubUpstreamHandler.latency = options['latency_ms'] / 1000
+        StubUpstreamHandler.handshake = 0
+        server = StubServer(('127.0.0.1', 0), StubUpstreamHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        stub_url = f'http://127.0.0.1:{server.server_port}'
+        self.stdout.write(f'Stub Stripe/GitHub at {stub_url}: {options["latency_ms"]:.0f} ms per call')
+        self.stdout.write(
+            f'sync: one request at a time, like a sync gunicorn worker; '
+            f'async: up to {options["concurrency"]} in flight on one event loop, like one uvicorn worker\n'
+        )
+
+        try:
+            with override_settings(
+                STRIPE_SECRET_KEY='sk_test_bench',
+                STRIPE_API_BASE=stub_url,
+                GITHUB_OAUTH_URL=stub_url,
+                GITHUB_API_URL=stub_url,
+                GITHUB_OAUTH_CLIENT_ID='bench',
+                GITHUB_OAUTH_CLIENT_SECRET='bench',
+            ):
+                # Everything happens inside one transaction that is rolled back at the end.
+                with transaction.atomic():
+                    self._run(options)
+                    transaction.set_rollback(True)
+        finally:
+            server.shutdown()
+
+    def _run(self, options):
+        suffix = time.time_ns()
+        creator = User.objects.create_user(email=f'bench-creator-{suffix}@example.com', name='Bench Creator', role=User.Role.CREATOR)
+        member = User.objects.create_user(email=f'bench-member-{suffix}@example.com', name='Bench Member')
+        session = Session.objects.create(
+            title='Bench Session',
+            price=Decimal('499.00'),
+            creator=creator,
+            start_time=timezone.now() + timedelta(days=7),
+            duration=timedelta(hours=1),
+        )
+        booking = Booking.objects.create(user=member, session=session)
+        auth = {'Authorization': f'Bearer {AccessToken.for_user(member)}'}
+
+        scenarios = [
+            (
+                'POST /api/bookings/create-payment-order/',
+                create_payment_order.cls.as_view(throttle_classes=[]),
+                async_views.CreatePaymentOrderView.as_view(throttle_classes=[]),
+                '/api/bookings/create-payment-order/', {'booking_id': booking.pk}, auth, {},
+            ),
+            (
+                f'POST /api/bookings/{booking.pk}/verify_payment/',
+                BookingViewSet.as_view({'post': 'verify_payment'}, throttle_classes=[]),
+                async_views.VerifyPaymentView.as_view(throttle_classes=[]),
+                f'/api/bookings/{booking.pk}/verify_payment/', {'session_id': f'cs_bench_{booking.pk}'}, auth,
+                {'pk': booking.pk},
+            ),
+            (
+                'POST /api/users/github-login/',
+                GitHubLoginView.as_view(throttle_classes=[]),
+                users_async_views.GitHubLoginView.as_view(throttle_classes=[]),
+                '/api/users/github-login/', {'code': 'bench-code'}, {}, {},
+            ),
+        ]
+
+        sync_factory, async_factory = RequestFactory(), AsyncRequestFactory()
+        for label, sync_view, async_view, path, data, headers, kwargs in scenarios:
+            self.stdout.write(label)
+
+            def make_sync_request():
+                return sync_factory.post(path, data, content_type='application/json', headers=headers)
+
+            def make_async_request():
+                return async_factory.post(path, data, content_type='application/json', headers=headers)
+
+            started = time.perf_counter()
+            latencies, statuses = [], Counter()
+            for _ in range(options['sync_requests']):
+                request_started = time.perf_counter()
+                statuses[sync_view(make_sync_request(), **kwargs).status_code] += 1
+                latencies.append(time.perf_counter() - request_started)
+            self._report('sync', time.perf_counter() - started, latencies, statuses)
+
+            elapsed, latencies, statuses = async_to_sync(self._run_async)(
+                async_view, make_async_request, kwargs, options['requests'], options['concurrency']
+            )
+            self._report('async', elapsed, latencies, statuses)
+
+    async def _run_async(self, view, make_request, kwargs, total, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies, statuses = [], Counter()
+
+        async def one():
+            async with semaphore:
+                request_started = time.perf_counter()
+                response = await view(make_request(), **kwargs)
+                latencies.append(time.perf_counter() - request_started)
+                statuses[response.status_code] += 1
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(one() for _ in range(total)))
+        finally:
+            await get_async_session().close()
+        return time.perf_counter() - started, latencies, statuses
+
+    def _report(self, mode, elapsed, latencies, statuses):
+        line = (
+            f'  {mode:<6} {len(latencies):>5} requests in {elapsed:6.2f} s  '
+            f'{len(latencies) / elapsed:7.1f} req/s   median {statistics.median(latencies) * 1000:6.0f} ms   '
+            f'status {dict(sorted(statuses.items()))}'
+        )
+        if all(code < 400 for code in statuses):
+            self.stdout.write(line)
+        else:
+            self.stdout.write(self.style.WARNING(line))
@@ -0,0 +1,92 @@
+import re
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+
+from bookings.models import Booking
+from bookings.views import BookingPagination
+
+EXECUTION_TIME = re.compile(r'Execution Time: ([\d.]+) ms')
+BUFFERS = re.compile(r'Buffers: shared(?: hit=(\d+))?(?: read=(\d+))?')
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN ANALYZE the booking dashboard queries (first page and a deep page, for the busiest creator and user) '
+        'before and after the denormalized creator column and its (creator|user, created_at, id) indexes. Postgres only; '
+        'fill the database first, e.g. with seed_scale_data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--creator', type=int, help='Creator id (default: the one with the most bookings)')
+        parser.add_argument('--user', type=int, help='User id (default: the one with the most bookings)')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query; the median is reported (default: 5)')
+        parser.add_argument('--plans', action='store_true', help='Print the query plans too')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('This benchmark compares Postgres query plans; set POSTGRES_HOST.')
+
+        total = Booking.objects.count()
+        creator_id = options['creator'] or self._busiest('creator')
+        user_id = options['user'] or self._busiest('user')
+        self.stdout.write(
+            f'{total:,} bookings; creator {creator_id} has {Booking.objects.filter(creator_id=creator_id).count():,}, '
+            f'user {user_id} has {Booking.objects.filter(user_id=user_id).count():,}'
+        )
+
+        pagination = BookingPagination()
+
+        def pages(queryset):
+            # The first page, and one half-way down the list as a "next" link would fetch it.
+            queryset = queryset.order_by(*pagination.ordering)
+            middle = queryset.values_list('created_at', 'id')[queryset.count() // 2]
+            deep = queryset.filter(pagination._seek_filter(list(middle), reverse=False))
+            return [('first page', queryset[: pagination.page_size + 1]), ('deep page', deep[: pagination.page_size + 1])]
+
+        # Before: the creator filter joins through sessions, as the dashboard did, and
+        # only the original single-column user index exists.
+        before = {}
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('DROP INDEX booking_creator_created_idx')
+                cursor.execute('DROP INDEX booking_user_created_idx')
+                cursor.execute('CREATE INDEX bench_booking_user_id ON bookings_booking (user_id)')
+                cursor.execute('ANALYZE bookings_booking')
+            for name, queryset in pages(Booking.objects.filter(session__creator_id=creator_id)):
+                before[('creator', name)] = self._explain(queryset, options['repeat'])
+            for name, queryset in pages(Booking.objects.filter(user_id=user_id)):
+                before[('user', name)] = self._explain(queryset, options['repeat'])
+            transaction.set_rollback(True)
+
+        after = {}
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE bookings_booking')
+        for name, queryset in pages(Booking.objects.filter(creator_id=creator_id)):
+            after[('creator', name)] = self._explain(queryset, options['repeat'])
+        for name, queryset in pages(Booking.objects.filter(user_id=user_id)):
+            after[('user', name)] = self._explain(queryset, options['repeat'])
+
+        self.stdout.write(f'\n{"query":<22} {"before":>12} {"after":>12} {"buffers before":>16} {"buffers after":>15}')
+        for key in before:
+            (old_ms, old_buffers, old_plan), (new_ms, new_buffers, new_plan) = before[key], after[key]
+            self.stdout.write(
+                f'{" ".join(key):<22} {old_ms:>9.2f} ms {new_ms:>9.2f} ms {old_buffers:>16,} {new_buffers:>15,}'
+            )
+            if options['plans']:
+                self.stdout.write(f'\n-- before\n{old_plan}\n-- after\n{new_plan}\n')
+
+    def _busiest(self, field):
+        return Booking.objects.values(field).annotate(n=Count('id')).order_by('-n').values_list(field, flat=True)[0]
+
+    def _explain(self, queryset, repeat):
+        """Median execution time, shared buffers touched and the plan of the last run."""
+        timings = []
+        for _ in range(repeat):
+            plan = queryset.explain(analyze=True, buffers=True)
+            timings.append(float(EXECUTION_TIME.search(plan).group(1)))
+        top = BUFFERS.search(plan)
+        buffers = sum(int(n or 0) for n in top.groups()) if top else 0
+        return statistics.median(timings), buffers, plan
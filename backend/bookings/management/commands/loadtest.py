@@ -0,0 +1,375 @@
+import itertools
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+import requests
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from bookings import stats
+from bookings.management.commands.bench_async_views import StubServer, StubUpstreamHandler
+from bookings.models import Booking, BookingStats
+from sessions.cache import bump_collection_version
+from sessions.models import Session
+
+User = get_user_model()
+
+SCENARIOS = (
+    'sessions_list',
+    'session_detail',
+    'booking_create',
+    'bookings_list_user',
+    'bookings_list_creator',
+    'bookings_analytics',
+    'token_refresh',
+)
+BATCH_SIZE = 1000
+
+
+class StubProviderHandler(StubUpstreamHandler):
+    """The benchmark's stub Stripe and GitHub, plus Google's ID token signing certificates."""
+
+    def do_GET(self):
+        if self.path == '/oauth2/v1/certs':
+            return self._respond({})
+        return super().do_GET()
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the hot API endpoints on a local server against a freshly seeded dataset and '
+        'report throughput and p50/p95/p99 latency per endpoint as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Test an already running server instead of starting one (it must use this database)')
+        parser.add_argument('--server', choices=('wsgi', 'asgi'), default='wsgi', help='Server to start: gunicorn or uvicorn (default: wsgi)')
+        parser.add_argument('--workers', type=int, default=3, help='Worker processes of the started server (default: 3)')
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='Run only this scenario (repeatable; default: all)')
+        parser.add_argument('--duration', type=float, default=20, help='Measured seconds per scenario (default: 20)')
+        parser.add_argument('--warmup', type=float, default=2, help='Unmeasured seconds before each scenario (default: 2)')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight (default: 32)')
+        parser.add_argument('--creators', type=int, default=2000, help='Creators owning sessions (default: 2000)')
+        parser.add_argument('--sessions-per-creator', type=int, default=2, help='Sessions per creator (default: 2)')
+        parser.add_argument('--members', type=int, default=5000, help='Users with existing bookings (default: 5000)')
+        parser.add_argument('--bookings-per-member', type=int, default=4, help='Seeded bookings per user (default: 4)')
+        parser.add_argument('--bookers', type=int, default=5000, help='Accounts that make the new bookings (default: 5000)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the dataset (default: 0)')
+        parser.add_argument('--label', help='Name of this run in the report, e.g. a release (default: git revision)')
+        parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+        parser.add_argument('--baseline', help='Earlier JSON report to compare throughput and p95 against')
+        parser.add_argument('--keep-data', action='store_true', help='Leave the seeded rows in the database')
+
+    def handle(self, *args, **options):
+        if min(options['creators'], options['sessions_per_creator'], options['members'], options['bookers']) < 1:
+            raise CommandError('--creators, --sessions-per-creator, --members and --bookers must all be positive.')
+        if options['bookings_per_member'] > options['creators'] * options['sessions_per_creator']:
+            raise CommandError('--bookings-per-member exceeds the number of sessions.')
+
+        tag = uuid.uuid4().hex[:8]
+        stub = StubServer(('127.0.0.1', 0), StubProviderHandler)
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+        stub_url = f'http://127.0.0.1:{stub.server_port}'
+        server = None
+        try:
+            started = time.perf_counter()
+            data = self._seed(tag, options)
+            self.log(f'Seeded dataset loadtest-{tag} on {connection.vendor} in {time.perf_counter() - started:.1f} s')
+            if options['url']:
+                base_url = options['url'].rstrip('/')
+                self.log(f'Testing {base_url}; point its Stripe/GitHub/Google settings at {stub_url} to keep it offline.')
+            else:
+                server, base_url = self._start_server(options, stub_url)
+                self.log(f'Started {options["server"]} server with {options["workers"]} workers at {base_url}')
+
+            report = {
+                'label': options['label'] or self._revision(),
+                'revision': self._revision(),
+                'started_at': timezone.now().isoformat(),
+                'target': {
+                    'url': base_url,
+                    'server': 'external' if options['url'] else options['server'],
+                    'workers': None if options['url'] else options['workers'],
+                    'database': connection.vendor,
+                },
+                'load': {key: options[key] for key in ('concurrency', 'duration', 'warmup')},
+                'dataset': {key: len(data[key]) for key in ('creators', 'sessions', 'members', 'bookings', 'bookers')},
+                'scenarios': {},
+            }
+            requests_for = self._scenarios(data)
+            for name in options['scenario'] or SCENARIOS:
+                result = self._run(base_url, requests_for[name], options)
+                report['scenarios'][name] = result
+                self.log(self._describe(name, result), ok=not result['errors'])
+        finally:
+            if server is not None:
+                server.terminate()
+                try:
+                    server.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+            stub.shutdown()
+            if not options['keep_data']:
+                self._delete(tag)
+
+        if options['baseline']:
+            self._compare(report, options['baseline'])
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.log(f'Report written to {options["output"]}')
+        else:
+            self.stdout.write(output)
+
+    def log(self, message, ok=True):
+        # Progress goes to stderr so that stdout carries nothing but the JSON report.
+        self.stderr.write(message, style_func=(lambda text: text) if ok else self.style.WARNING)
+
+    def _seed(self, tag, options):
+        rng = random.Random(options['seed'])
+
+        def create_users(kind, count, role):
+            users = User.objects.bulk_create(
+                (User(email=f'loadtest-{tag}-{kind}-{i}@example.com', name=f'Load {kind} {i}', role=role) for i in range(count)),
+                batch_size=BATCH_SIZE,
+            )
+            if users and users[0].pk is None:
+                users = list(User.objects.filter(email__startswith=f'loadtest-{tag}-{kind}-').order_by('pk'))
+            return users
+
+        creators = create_users('creator', options['creators'], User.Role.CREATOR)
+        members = create_users('member', options['members'], User.Role.USER)
+        # Only creators may book (see BookingSerializer.validate); these own no sessions.
+        bookers = create_users('booker', options['bookers'], User.Role.CREATOR)
+
+        now = timezone.now()
+        Session.objects.bulk_create(
+            (
+                Session(
+                    title=f'Load test session {creator.pk}-{i}',
+                    description='Seeded by the loadtest command.',
+                    price=rng.choice((Decimal('0'), Decimal('199'), Decimal('499'), Decimal('999'))),
+                    creator=creator,
+                    start_time=now + timedelta(days=rng.randint(1, 60), hours=rng.randint(0, 23)),
+                    duration=timedelta(minutes=rng.choice((30, 60, 90))),
+                )
+                for creator in creators
+                for i in range(options['sessions_per_creator'])
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        sessions = list(Session.objects.filter(creator__in=creators).only('id', 'creator_id', 'price').order_by('pk'))
+
+        bookings = [
+            Booking(
+                user=member,
+                session=session,
+                creator_id=session.creator_id,
+                status=Booking.Status.CONFIRMED if session.price == 0 else Booking.Status.PENDING,
+                payment_status='free' if session.price == 0 else 'pending',
+            )
+            for member in members
+            for session in rng.sample(sessions, options['bookings_per_member'])
+        ]
+        Booking.objects.bulk_create(bookings, batch_size=BATCH_SIZE)
+        seats = Counter(booking.session_id for booking in bookings)
+        for session in sessions:
+            session.seats_taken = session.bookings_count = seats[session.pk]
+            # Free bookings are confirmed; paid ones stay pending.
+            session.confirmed_count = seats[session.pk] if session.price == 0 else 0
+        Session.objects.bulk_update(sessions, ['seats_taken', 'bookings_count', 'confirmed_count'], batch_size=BATCH_SIZE)
+        # bulk_create skips Booking.save(), which keeps the analytics counters.
+        stats.rebuild([session.pk for session in sessions])
+        bump_collection_version()
+
+        def access(user):
+            # Long enough for any run; the accounts are deleted afterwards anyway.
+            token = AccessToken.for_user(user)
+            token.set_exp(lifetime=timedelta(days=1))
+            return f'Bearer {token}'
+
+        return {
+            'creators': creators,
+            'members': members,
+            'bookers': bookers,
+            'sessions': sessions,
+            'bookings': bookings,
+            'creator_auth': [access(user) for user in creators],
+            'member_auth': [access(user) for user in members],
+            'booker_auth': [access(user) for user in bookers],
+            'member_refresh': [str(RefreshToken.for_user(user)) for user in members],
+        }
+
+    def _delete(self, tag):
+        # Raw deletes skip the per-row delete signals (seat release, cache bumps), which
+        # take far longer than the run itself and do nothing useful for throwaway rows.
+        prefix = f'loadtest-{tag}-'
+        Booking.objects.filter(user__email__startswith=prefix)._raw_delete(connection.alias)
+        BookingStats.objects.filter(creator__email__startswith=prefix)._raw_delete(connection.alias)
+        Session.objects.filter(creator__email__startswith=prefix)._raw_delete(connection.alias)
+        User.objects.filter(email__startswith=prefix)._raw_delete(connection.alias)
+        bump_collection_version()
+
+    def _scenarios(self, data):
+        """Per scenario, a function turning the n-th request into (method, path, headers, json body)."""
+        sessions = data['sessions']
+
+        def visitor(n):
+            # DRF keys anonymous throttles on X-Forwarded-For; spread requests over addresses like real visitors.
+            return {'X-Forwarded-For': f'10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}'}
+
+        def each(pool, n):
+            # Round-robin over the accounts keeps every one under the per-user rate limits.
+            return pool[n % len(pool)]
+
+        def new_booking(n):
+            # Each pass over the bookers moves them on to the next session, so no pair repeats.
+            session = each(sessions, n + n // len(data['bookers']))
+            return 'POST', '/api/bookings/', {'Authorization': each(data['booker_auth'], n)}, {'session_id': session.pk}
+
+        return {
+            'sessions_list': lambda n: ('GET', '/api/sessions/', visitor(n), None),
+            'session_detail': lambda n: ('GET', f'/api/sessions/{each(sessions, n * 7919).pk}/', visitor(n), None),
+            'booking_create': new_booking,
+            'bookings_list_user': lambda n: ('GET', '/api/bookings/', {'Authorization': each(data['member_auth'], n)}, None),
+            'bookings_list_creator': lambda n: ('GET', '/api/bookings/', {'Authorization': each(data['creator_auth'], n)}, None),
+            'bookings_analytics': lambda n: ('GET', '/api/bookings/analytics/', {'Authorization': each(data['creator_auth'], n)}, None),
+            'token_refresh': lambda n: ('POST', '/api/auth/token/refresh/', visitor(n), {'refresh': each(data['member_refresh'], n)}),
+        }
+
+    def _start_server(self, options, stub_url):
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+        env = {
+            **os.environ,
+            'DJANGO_DEBUG': '0',
+            'SERVER_MODE': options['server'],
+            'STRIPE_SECRET_KEY': 'sk_test_loadtest',
+            'STRIPE_API_BASE': stub_url,
+            'GITHUB_OAUTH_URL': stub_url,
+            'GITHUB_API_URL': stub_url,
+            'GITHUB_OAUTH_CLIENT_ID': 'loadtest',
+            'GITHUB_OAUTH_CLIENT_SECRET': 'loadtest',
+            'GOOGLE_OAUTH_CERTS_URL': f'{stub_url}/oauth2/v1/certs',
+        }
+        if options['server'] == 'asgi':
+            command = [
+                sys.executable, '-m', 'uvicorn', 'config.asgi:application', '--host', '127.0.0.1', '--port', str(port),
+                '--workers', str(options['workers']), '--no-access-log',
+            ]
+        else:
+            command = [
+                sys.executable, '-m', 'gunicorn', 'config.wsgi:application', '--bind', f'127.0.0.1:{port}',
+                '--workers', str(options['workers']),
+            ]
+        log = tempfile.TemporaryFile()
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+        base_url = f'http://127.0.0.1:{port}'
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                break
+            try:
+                requests.get(f'{base_url}/api/sessions/', headers={'X-Forwarded-For': '10.255.255.255'}, timeout=1)
+                return server, base_url
+            except requests.RequestException:
+                time.sleep(0.2)
+        server.kill()
+        server.wait()
+        log.seek(0)
+        raise CommandError(f'Server did not come up:\n{log.read().decode(errors="replace")[-2000:]}')
+
+    def _run(self, base_url, make_request, options):
+        counter = itertools.count()
+        measure_from = time.perf_counter() + options['warmup']
+        stop = measure_from + options['duration']
+        results = []
+
+        def worker():
+            http = requests.Session()
+            measured = []
+            while True:
+                method, path, headers, body = make_request(next(counter))
+                started = time.perf_counter()
+                if started >= stop:
+                    break
+                try:
+                    outcome = http.request(method, base_url + path, headers=headers, json=body, timeout=30).status_code
+                except requests.RequestException as e:
+                    outcome = type(e).__name__
+                finished = time.perf_counter()
+                if started >= measure_from:
+                    measured.append((finished - started, finished, outcome))
+            results.extend(measured)
+
+        threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        statuses = Counter(str(outcome) for _, _, outcome in results)
+        # Latency of successful responses only: a burst of fast 429s or 500s must not look like a speed-up.
+        latencies = sorted(elapsed * 1000 for elapsed, _, outcome in results if isinstance(outcome, int) and outcome < 400)
+        elapsed = max([stop] + [finished for _, finished, _ in results]) - measure_from
+        result = {
+            'requests': len(results),
+            'errors': len(results) - len(latencies),
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'latency_ms': None,
+            'statuses': dict(sorted(statuses.items())),
+        }
+        if len(latencies) >= 2:
+            percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+            result['latency_ms'] = {
+                'mean': round(statistics.fmean(latencies), 2),
+                'p50': round(percentiles[49], 2),
+                'p95': round(percentiles[94], 2),
+                'p99': round(percentiles[98], 2),
+                'max': round(latencies[-1], 2),
+            }
+        return result
+
+    def _describe(self, name, result):
+        line = f'{name:<22} {result["throughput_rps"]:8.1f} req/s'
+        if result['latency_ms']:
+            line += '   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms   p99 {p99:7.1f} ms'.format(**result['latency_ms'])
+        return f'{line}   status {result["statuses"]}'
+
+    def _compare(self, report, path):
+        with open(path) as f:
+            baseline = json.load(f)
+        self.log(f'Compared with {baseline.get("label")} ({baseline.get("started_at")}):')
+        for name, result in report['scenarios'].items():
+            before = baseline.get('scenarios', {}).get(name)
+            if not before or not before['throughput_rps'] or not (before['latency_ms'] and result['latency_ms']):
+                continue
+            throughput = (result['throughput_rps'] / before['throughput_rps'] - 1) * 100
+            p95 = (result['latency_ms']['p95'] / before['latency_ms']['p95'] - 1) * 100
+            self.log(f'  {name:<22} throughput {throughput:+6.1f}%   p95 {p95:+6.1f}%', ok=throughput > -10 and p95 < 10)
+
+    def _revision(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
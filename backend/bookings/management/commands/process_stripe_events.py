@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from bookings.models import StripeEvent
+from bookings.webhooks import process_event
+
+
+class Command(BaseCommand):
+    help = 'Process stored Stripe webhook events that are pending or failed (e.g. after a crash)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--include-stuck',
+            action='store_true',
+            help='Also retry events left in PROCESSING (only when no other processor is running)',
+        )
+
+    def handle(self, *args, **options):
+        statuses = [StripeEvent.Status.PENDING, StripeEvent.Status.FAILED]
+        if options['include_stuck']:
+            statuses.append(StripeEvent.Status.PROCESSING)
+
+        processed = failed = 0
+        for event_pk in StripeEvent.objects.filter(status__in=statuses).order_by('received_at').values_list('pk', flat=True):
+            try:
+                if process_event(event_pk, force=options['include_stuck']):
+                    processed += 1
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f'Event {event_pk} failed: {e}'))
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} event(s), {failed} failed'))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings import stats
+from sessions.models import Session
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the BookingStats rows behind /api/bookings/analytics/ from the bookings table, a chunk of '
+        'sessions per transaction. Run it once after migrating, and after loading bookings without saving them '
+        'through the ORM (COPY, bulk_create, raw deletes).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Sessions per transaction (default: 500)')
+        parser.add_argument('--creator', type=int, help='Only the sessions of this creator id')
+
+    def handle(self, *args, **options):
+        sessions = Session.objects.order_by('pk')
+        if options['creator']:
+            sessions = sessions.filter(creator_id=options['creator'])
+
+        started = last_report = time.monotonic()
+        last_pk = done = rows = 0
+        while True:
+            chunk = list(sessions.filter(pk__gt=last_pk).values_list('pk', flat=True)[: options['chunk_size']])
+            if not chunk:
+                break
+            rows += stats.rebuild(chunk)
+            done += len(chunk)
+            last_pk = chunk[-1]
+            if time.monotonic() - last_report >= 2:
+                last_report = time.monotonic()
+                self.stdout.write(f'  {done:,} sessions, {rows:,} rows')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt {rows:,} rows for {done:,} sessions in {time.monotonic() - started:.1f} s')
+        )
@@ -0,0 +1,80 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from bookings.models import Booking
+from sessions.cache import bump_collection_version
+from sessions.models import Session
+
+COLUMNS = ('bookings_count', 'confirmed_count', 'revenue')
+
+
+def counted(session_ids):
+    """The counters as the bookings table has them, by session id."""
+    rows = (
+        Booking.objects.filter(session_id__in=session_ids)
+        .values('session_id')
+        .annotate(
+            n=Count('id'),
+            confirmed=Count('id', filter=Q(status=Booking.Status.CONFIRMED)),
+            paid=Sum('amount_paid', default=Decimal('0')),
+        )
+        .order_by()
+    )
+    actual = {session_id: (0, 0, Decimal('0')) for session_id in session_ids}
+    actual.update((row['session_id'], (row['n'], row['confirmed'], row['paid'])) for row in rows)
+    return actual
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the bookings_count, confirmed_count and revenue columns of sessions with their bookings, '
+        'a batch of sessions at a time, and repair the ones that drifted (e.g. after raw SQL or bulk loads).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Sessions per batch (default: 1000)')
+        parser.add_argument('--dry-run', action='store_true', help='Only report the drift')
+
+    def handle(self, *args, **options):
+        started = last_report = time.monotonic()
+        last_pk = checked = drifted = 0
+        while True:
+            stored = {
+                row[0]: tuple(row[1:])
+                for row in Session.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', *COLUMNS)[: options['batch_size']]
+            }
+            if not stored:
+                break
+            last_pk = max(stored)
+            checked += len(stored)
+            actual = counted(list(stored))
+            stale = [pk for pk, values in stored.items() if values != actual[pk]]
+            drifted += len(stale)
+            if options['dry_run']:
+                for pk in stale[:5]:
+                    self.stdout.write(f'  session {pk}: stored {stored[pk]}, counted {actual[pk]}')
+            elif stale:
+                self._repair(stale)
+            if time.monotonic() - last_report >= 2:
+                last_report = time.monotonic()
+                self.stdout.write(f'  {checked:,} sessions checked, {drifted:,} drifted')
+
+        if drifted and not options['dry_run']:
+            bump_collection_version()
+        action = 'found' if options['dry_run'] else 'repaired'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {checked:,} sessions in {time.monotonic() - started:.1f} s; {action} {drifted:,} with drifted counters'
+        ))
+
+    def _repair(self, session_ids):
+        with transaction.atomic():
+            # Booking writes update their session row, so with the rows locked none can
+            # land between the recount and the update; those already waiting apply
+            # their difference on top of the corrected values afterwards.
+            list(Session.objects.select_for_update().filter(pk__in=session_ids).values_list('pk', flat=True))
+            for pk, values in counted(session_ids).items():
+                Session.objects.filter(pk=pk).update(**dict(zip(COLUMNS, values)))
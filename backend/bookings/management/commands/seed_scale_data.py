@@ -0,0 +1,305 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from bookings.models import Booking, BookingStats
+from sessions.cache import bump_collection_version
+from sessions.models import Session
+
+User = get_user_model()
+
+FIRST_NAMES = (
+    'Aarav', 'Aditi', 'Ananya', 'Arjun', 'Diya', 'Ishaan', 'Kabir', 'Kavya', 'Meera', 'Neha',
+    'Nikhil', 'Priya', 'Rahul', 'Riya', 'Rohan', 'Sara', 'Tanvi', 'Varun', 'Vihaan', 'Zoya',
+)
+LAST_NAMES = (
+    'Agarwal', 'Bose', 'Chopra', 'Das', 'Gupta', 'Iyer', 'Joshi', 'Kapoor', 'Khan', 'Menon',
+    'Mehta', 'Nair', 'Patel', 'Rao', 'Reddy', 'Sharma', 'Singh', 'Thomas', 'Verma', 'Yadav',
+)
+TOPICS = (
+    'Web Development', 'React Patterns', 'Python for Data Science', 'UI/UX Design', 'DevOps Pipelines',
+    'Cloud Computing', 'Mobile Apps', 'Machine Learning', 'Public Speaking', 'Yoga', 'Meditation',
+    'Guitar', 'Photography', 'Creative Writing', 'Personal Finance', 'Product Management',
+)
+FORMATS = ('Introduction to', 'Advanced', 'Hands-on', 'Masterclass:', 'Office Hours:', 'Workshop:')
+# (price, weight): a few free sessions, most in the low hundreds, a long tail of premium ones.
+PRICES = ((Decimal('0'), 15), (Decimal('199'), 25), (Decimal('499'), 25), (Decimal('999'), 20), (Decimal('1999'), 10), (Decimal('4999'), 5))
+CAPACITIES = ((None, 40), (10, 15), (20, 15), (50, 15), (100, 10), (500, 5))
+DURATIONS = ((timedelta(minutes=30), 20), (timedelta(hours=1), 45), (timedelta(minutes=90), 20), (timedelta(hours=3), 15))
+# Sessions start at any hour, but mostly in the evening.
+START_HOURS = tuple((hour, 6 if 17 <= hour <= 21 else 2 if 8 <= hour <= 22 else 1) for hour in range(24))
+PROGRESS_INTERVAL = 2.0
+
+
+def weighted(options):
+    values, weights = zip(*options)
+    return values, weights
+
+
+def rounded(rng, x):
+    """Round `x` up with probability equal to its fraction, so the totals come out right on average."""
+    whole = int(x)
+    return whole + (rng.random() < x - whole)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created_at/date_joined values we set instead of stamping now()."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    flags = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flags:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class RowWriter:
+    """
+    Inserts rows of `fields` (attnames, so `creator_id` rather than `creator`) in
+    batches: with `COPY ... FROM STDIN` on Postgres, `bulk_create` elsewhere.
+    """
+
+    def __init__(self, command, model, fields, batch_size, use_copy, total):
+        self.command = command
+        self.model = model
+        self.fields = fields
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self.total = total
+        self.rows = []
+        self.written = 0
+        self.started = self.reported = time.monotonic()
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.use_copy:
+            columns = ', '.join(connection.ops.quote_name(self.model._meta.get_field(name).column) for name in self.fields)
+            with connection.cursor() as cursor:
+                with cursor.copy(f'COPY {connection.ops.quote_name(self.model._meta.db_table)} ({columns}) FROM STDIN') as copy:
+                    for row in self.rows:
+                        copy.write_row(row)
+        else:
+            self.model.objects.bulk_create([self.model(**dict(zip(self.fields, row))) for row in self.rows])
+        self.written += len(self.rows)
+        self.rows = []
+        now = time.monotonic()
+        if now - self.reported >= PROGRESS_INTERVAL:
+            self.reported = now
+            self.command.stdout.write(
+                f'  {self.model._meta.verbose_name_plural}: {self.written:,} of ~{self.total:,} '
+                f'({self.written / (now - self.started):,.0f} rows/s)'
+            )
+
+    def close(self):
+        self.flush()
+        if connection.vendor == 'postgresql':
+            # Fresh statistics before anything plans against the table: the foreign key
+            # checks of the child rows (run at commit) would otherwise pick sequential
+            # scans planned for an empty table, one per row.
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(self.model._meta.db_table)}')
+        elapsed = time.monotonic() - self.started
+        self.command.stdout.write(self.command.style.SUCCESS(
+            f'{self.model._meta.verbose_name_plural.capitalize()}: {self.written:,} rows in {elapsed:.1f} s '
+            f'({self.written / max(elapsed, 1e-9):,.0f} rows/s)'
+        ))
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate users, sessions and bookings at scale for performance testing: popular creators, '
+        'evening sessions, bookings bunched after publication and before the start. Deterministic per --seed and --epoch.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000, help='Users including creators (default: 100000)')
+        parser.add_argument('--creators', type=int, default=2_000, help='Users who host sessions (default: 2000)')
+        parser.add_argument('--sessions', type=int, default=20_000, help='Approximate number of sessions (default: 20000)')
+        parser.add_argument('--bookings', type=int, default=500_000, help='Approximate number of bookings (default: 500000)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+        parser.add_argument('--epoch', help='"Now" of the generated history, YYYY-MM-DD (default: today, UTC)')
+        parser.add_argument('--prefix', default='scale', help='Email prefix of the generated users (default: scale)')
+        parser.add_argument('--password', help='Give every generated user this password (default: unusable)')
+        parser.add_argument('--batch-size', type=int, default=5_000, help='Rows per insert batch (default: 5000)')
+        parser.add_argument('--no-copy', action='store_true', help='Use bulk_create on Postgres too instead of COPY')
+        parser.add_argument('--clear', action='store_true', help='First delete the users (and their data) of an earlier run with this prefix')
+
+    def handle(self, *args, **options):
+        if not 0 < options['creators'] <= options['users']:
+            raise CommandError('--creators must be between 1 and --users.')
+        if options['epoch']:
+            try:
+                epoch = datetime.strptime(options['epoch'], '%Y-%m-%d').replace(tzinfo=dt_timezone.utc)
+            except ValueError:
+                raise CommandError('--epoch must be a date like 2025-01-31.')
+        else:
+            epoch = datetime.now(dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        users = User.objects.filter(email__startswith=f'{options["prefix"]}-', email__endswith='@example.com')
+        if options['clear']:
+            self._clear(users)
+        elif users.exists():
+            raise CommandError(f'Users with the prefix "{options["prefix"]}" already exist; pass --clear or another --prefix.')
+
+        use_copy = connection.vendor == 'postgresql' and not options['no_copy']
+        self.stdout.write(
+            f'Generating ~{options["users"]:,} users, ~{options["sessions"]:,} sessions and ~{options["bookings"]:,} bookings '
+            f'with {"COPY" if use_copy else "bulk_create"} (seed {options["seed"]}, epoch {epoch.date()})'
+        )
+        started = time.monotonic()
+        with transaction.atomic(), explicit_timestamps(User, Session, Booking):
+            self._generate(random.Random(options['seed']), epoch, use_copy, options)
+            # Explicit ids leave the Postgres sequences behind; move them past the new rows.
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [User, Session, Booking]):
+                    cursor.execute(sql)
+        bump_collection_version()
+        # The rows went in without Booking.save(), so nothing has counted them for the analytics yet.
+        call_command('rebuild_booking_stats', stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.monotonic() - started:.1f} s'))
+
+    def _clear(self, users):
+        # Raw deletes: the per-row delete signals would take hours at this scale.
+        Booking.objects.filter(user__in=users)._raw_delete(connection.alias)
+        Booking.objects.filter(creator__in=users)._raw_delete(connection.alias)
+        BookingStats.objects.filter(creator__in=users)._raw_delete(connection.alias)
+        Session.objects.filter(creator__in=users)._raw_delete(connection.alias)
+        count = users._raw_delete(connection.alias)
+        self.stdout.write(self.style.WARNING(f'Deleted {count:,} users from an earlier run, with their sessions and bookings'))
+
+    def _generate(self, rng, epoch, use_copy, options):
+        batch_size = options['batch_size']
+        user_count, creator_count = options['users'], options['creators']
+        first_user_id = (User.objects.aggregate(Max('pk'))['pk__max'] or 0) + 1
+        first_session_id = (Session.objects.aggregate(Max('pk'))['pk__max'] or 0) + 1
+        first_booking_id = (Booking.objects.aggregate(Max('pk'))['pk__max'] or 0) + 1
+
+        # Users. The first `creator_count` are creators, ranked by popularity.
+        if options['password']:
+            password = make_password(options['password'])
+        else:
+            password = f'{UNUSABLE_PASSWORD_PREFIX}scale-data'
+        writer = RowWriter(
+            self, User,
+            ['id', 'password', 'is_superuser', 'email', 'name', 'avatar', 'role', 'is_active', 'is_staff', 'date_joined'],
+            batch_size, use_copy, user_count,
+        )
+        for i in range(user_count):
+            # Signups grow over two years: recent dates are more likely.
+            joined = epoch - timedelta(days=730 * rng.random() ** 2, seconds=rng.randrange(86400))
+            writer.add((
+                first_user_id + i, password, False, f'{options["prefix"]}-{i}@example.com',
+                f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', '',
+                User.Role.CREATOR if i < creator_count else User.Role.USER, True, False, joined,
+            ))
+        writer.close()
+
+        # Zipf-like popularity: creator k draws ~1/k of the bookings, spread over
+        # ~1/sqrt(k) of the sessions, each of which draws ~1/sqrt(k) bookings.
+        appeal = [(1 / (rank + 1)) ** 0.5 for rank in range(creator_count)]
+        total_appeal = sum(appeal)
+        session_counts = [rounded(rng, options['sessions'] * weight / total_appeal) for weight in appeal]
+
+        sessions = []  # (id, creator id, appeal, price, capacity, created_at, start_time, duration)
+        prices, price_weights = weighted(PRICES)
+        capacities, capacity_weights = weighted(CAPACITIES)
+        durations, duration_weights = weighted(DURATIONS)
+        hours, hour_weights = weighted(START_HOURS)
+        for creator, count in enumerate(session_counts):
+            for _ in range(count):
+                # Half a year of history and three months of upcoming sessions.
+                day = epoch + timedelta(days=rng.randint(-180, 90))
+                start_time = day.replace(hour=rng.choices(hours, hour_weights)[0], minute=rng.choice((0, 15, 30, 45)))
+                created_at = min(start_time - timedelta(days=rng.uniform(3, 60)), epoch - timedelta(minutes=rng.randrange(1, 600)))
+                sessions.append((
+                    first_session_id + len(sessions), first_user_id + creator,
+                    appeal[creator] * rng.lognormvariate(0, 1),
+                    rng.choices(prices, price_weights)[0], rng.choices(capacities, capacity_weights)[0],
+                    created_at, start_time, rng.choices(durations, duration_weights)[0],
+                ))
+
+        # Bookings per session follow the session's appeal, within its capacity. What
+        # full sessions turn away goes to the ones with room left, once.
+        limits = [user_count - 1 if session[4] is None else min(session[4], user_count - 1) for session in sessions]
+        booking_counts = [0] * len(sessions)
+        for _ in range(2):
+            open_sessions = [i for i, limit in enumerate(limits) if booking_counts[i] < limit]
+            demand = options['bookings'] - sum(booking_counts)
+            total_appeal = sum(sessions[i][2] for i in open_sessions)
+            if demand <= 0 or not open_sessions:
+                break
+            for i in open_sessions:
+                booking_counts[i] = min(booking_counts[i] + rounded(rng, demand * sessions[i][2] / total_appeal), limits[i])
+
+        writer = RowWriter(
+            self, Session,
+            ['id', 'title', 'description', 'price', 'creator_id', 'image', 'image_variants', 'start_time', 'duration',
+             'capacity', 'seats_taken', 'bookings_count', 'confirmed_count', 'revenue', 'created_at', 'updated_at'],
+            batch_size, use_copy, len(sessions),
+        )
+        booking_plans = []
+        for (session_id, creator_id, _, price, capacity, created_at, start_time, duration), count in zip(sessions, booking_counts):
+            topic = rng.choice(TOPICS)
+            statuses = [self._booking_status(rng, price) for _ in range(count)]
+            seats_taken = sum(status != Booking.Status.CANCELLED for status in statuses)
+            # Every confirmed booking paid the price (free sessions: nothing).
+            confirmed = statuses.count(Booking.Status.CONFIRMED)
+            writer.add((
+                session_id, f'{rng.choice(FORMATS)} {topic}', f'A live session on {topic.lower()}.', price,
+                creator_id, '', '{}' if use_copy else {}, start_time, duration, capacity, seats_taken,
+                len(statuses), confirmed, price * confirmed, created_at, created_at,
+            ))
+            booking_plans.append((session_id, creator_id, price, created_at, min(start_time, epoch), statuses))
+        writer.close()
+
+        writer = RowWriter(
+            self, Booking,
+            ['id', 'user_id', 'session_id', 'creator_id', 'status', 'payment_id', 'payment_status', 'amount_paid', 'created_at', 'updated_at'],
+            batch_size, use_copy, sum(booking_counts),
+        )
+        next_id = first_booking_id
+        for session_id, creator_id, price, opens, closes, statuses in booking_plans:
+            bookers = rng.sample(range(user_count), len(statuses) + 1)
+            window = max((closes - opens).total_seconds(), 0)
+            for user, status in zip((user for user in bookers if first_user_id + user != creator_id), statuses):
+                # U-shaped: bookings bunch up right after publication and just before the start.
+                created_at = opens + timedelta(seconds=window * rng.betavariate(0.4, 0.4))
+                paid = status == Booking.Status.CONFIRMED and price > 0
+                writer.add((
+                    next_id, first_user_id + user, session_id, creator_id, status, f'pi_scale_{next_id}' if paid else '',
+                    'paid' if paid else 'free' if price == 0 else 'pending', price if paid or price == 0 else None,
+                    created_at, created_at,
+                ))
+                next_id += 1
+        writer.close()
+
+    def _booking_status(self, rng, price):
+        if price == 0:
+            return Booking.Status.CONFIRMED
+        draw = rng.random()
+        if draw < 0.8:
+            return Booking.Status.CONFIRMED
+        return Booking.Status.PENDING if draw < 0.9 else Booking.Status.CANCELLED
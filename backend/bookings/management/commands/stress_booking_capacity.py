@@ -0,0 +1,85 @@
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from bookings.models import Booking
+from bookings.views import BookingViewSet
+from sessions.models import Session
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Fire concurrent booking POSTs at one limited-capacity session and verify it is never oversold'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--capacity', type=int, default=50, help='Seats in the session (default: 50)')
+        parser.add_argument('--clients', type=int, default=300, help='Distinct users trying to book (default: 300)')
+        parser.add_argument('--threads', type=int, default=64, help='Concurrent booking requests (default: 64)')
+
+    def handle(self, *args, **options):
+        capacity, clients, threads = options['capacity'], options['clients'], options['threads']
+        tag = uuid.uuid4().hex[:8]
+
+        creator = User.objects.create_user(
+            email=f'stress-creator-{tag}@example.com', name='Stress Creator', role=User.Role.CREATOR, password=None
+        )
+        session = Session.objects.create(
+            title=f'Capacity stress test {tag}',
+            price=Decimal('0'),
+            creator=creator,
+            start_time=timezone.now() + timedelta(days=1),
+            duration=timedelta(hours=1),
+            capacity=capacity,
+        )
+        # Only creators may book, see BookingSerializer.validate.
+        bookers = User.objects.bulk_create(
+            User(email=f'stress-{tag}-{i}@example.com', name=f'Stress {i}', role=User.Role.CREATOR) for i in range(clients)
+        )
+        if bookers[0].pk is None:
+            bookers = list(User.objects.filter(email__startswith=f'stress-{tag}-'))
+
+        factory = APIRequestFactory()
+        view = BookingViewSet.as_view({'post': 'create'})
+
+        def book(user):
+            request = factory.post('/api/bookings/', {'session_id': session.pk}, format='json')
+            force_authenticate(request, user=user)
+            try:
+                return view(request).status_code
+            except Exception as e:
+                return type(e).__name__
+            finally:
+                connection.close()
+
+        self.stdout.write(f'Booking session {session.pk} (capacity {capacity}) from {clients} users on {threads} threads '
+                          f'against {connection.vendor}...')
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            outcomes = Counter(pool.map(book, bookers))
+        elapsed = time.perf_counter() - started
+
+        session.refresh_from_db()
+        booked = Booking.objects.filter(session=session).count()
+
+        try:
+            self.stdout.write(f'Finished in {elapsed:.2f}s, outcomes: {dict(outcomes)}')
+            self.stdout.write(f'Bookings: {booked}, seats_taken: {session.seats_taken}, capacity: {capacity}')
+            if booked > capacity or session.seats_taken != booked:
+                raise CommandError('Session was oversold or the seat counter drifted from the booking rows!')
+            if booked < min(capacity, clients):
+                self.stdout.write(self.style.WARNING('Some requests failed before the session filled up; see outcomes above.'))
+            self.stdout.write(self.style.SUCCESS('No overselling: seat counter and bookings agree and stay within capacity.'))
+        finally:
+            session.delete()
+            User.objects.filter(email__startswith=f'stress-{tag}-').delete()
+            creator.delete()
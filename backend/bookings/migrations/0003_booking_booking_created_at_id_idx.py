@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_sessions', '0003_session_session_start_time_id_idx'),
+        ('bookings', '0002_booking_amount_paid_booking_payment_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['created_at', 'id'], name='booking_created_at_id_idx'),
+        ),
+    ]
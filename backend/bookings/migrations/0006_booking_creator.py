@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+import django.db.models.deletion
+
+BATCH_SIZE = 10000
+
+
+def backfill_creator(apps, schema_editor):
+    """Copy every booking's session creator, one primary key range at a time."""
+    Booking = apps.get_model('bookings', 'Booking')
+    Session = apps.get_model('app_sessions', 'Session')
+    creator = Subquery(Session.objects.filter(pk=OuterRef('session_id')).values('creator_id')[:1])
+    last = Booking.objects.aggregate(last=Max('pk'))['last'] or 0
+    for start in range(0, last, BATCH_SIZE):
+        Booking.objects.filter(pk__gt=start, pk__lte=start + BATCH_SIZE, creator__isnull=True).update(creator=creator)
+
+
+def backfill_late_creators(apps, schema_editor):
+    """Fill bookings that servers still running the old code created during the batched backfill."""
+    Booking = apps.get_model('bookings', 'Booking')
+    Session = apps.get_model('app_sessions', 'Session')
+    creator = Subquery(Session.objects.filter(pk=OuterRef('session_id')).values('creator_id')[:1])
+    Booking.objects.filter(creator__isnull=True).update(creator=creator)
+
+
+class Migration(migrations.Migration):
+    # Backfills over whole tables run outside a transaction so that each batch
+    # commits on its own: a single transaction would hold its row locks and keep
+    # every rewritten row version alive until the last batch, blocking bookings
+    # and bloating the table for the whole run. Later backfill migrations follow
+    # the same pattern.
+    atomic = False
+
+    dependencies = [
+        ('app_sessions', '0006_session_image_variants'),
+        ('bookings', '0005_stripeevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='creator',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='creator_bookings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_creator, migrations.RunPython.noop),
+        # Old servers keep inserting bookings without a creator until the new code is
+        # deployed, so catch those up right before the column becomes NOT NULL.
+        migrations.RunPython(backfill_late_creators, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='booking',
+            name='creator',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='creator_bookings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='booking_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['creator', 'created_at', 'id'], name='booking_creator_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_sessions', '0006_session_image_variants'),
+        ('bookings', '0006_booking_creator'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('bookings', models.IntegerField(default=0)),
+                ('confirmed', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('creator', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('session', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='booking_stats', to='app_sessions.session')),
+            ],
+            options={
+                'verbose_name_plural': 'booking stats',
+                'indexes': [models.Index(fields=['creator', 'day'], name='booking_stats_creator_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('session', 'day'), name='unique_booking_stats_session_day')],
+            },
+        ),
+    ]
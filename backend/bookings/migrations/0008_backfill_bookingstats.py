@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+from django.db import migrations, transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncDate
+
+BATCH_SIZE = 2000
+
+
+def backfill_stats(apps, schema_editor):
+    """Count the bookings made before BookingStats existed, one session primary key range at a time."""
+    Session = apps.get_model('app_sessions', 'Session')
+    Booking = apps.get_model('bookings', 'Booking')
+    BookingStats = apps.get_model('bookings', 'BookingStats')
+
+    last = Session.objects.aggregate(last=Max('pk'))['last'] or 0
+    for start in range(0, last, BATCH_SIZE):
+        in_range = Q(session_id__gt=start, session_id__lte=start + BATCH_SIZE)
+        with transaction.atomic():
+            # Rows written by bookings made since 0007 are recounted along with the rest.
+            BookingStats.objects.filter(in_range).delete()
+            rows = (
+                Booking.objects.filter(in_range)
+                .values('session_id', 'creator_id', day=TruncDate('created_at'))
+                .annotate(
+                    n_bookings=Count('id'),
+                    n_confirmed=Count('id', filter=Q(status='CONFIRMED')),
+                    n_pending=Count('id', filter=Q(status='PENDING')),
+                    n_cancelled=Count('id', filter=Q(status='CANCELLED')),
+                    n_revenue=Sum('amount_paid', default=Decimal('0')),
+                )
+                .order_by()
+            )
+            BookingStats.objects.bulk_create(
+                BookingStats(
+                    session_id=row['session_id'],
+                    creator_id=row['creator_id'],
+                    day=row['day'],
+                    bookings=row['n_bookings'],
+                    confirmed=row['n_confirmed'],
+                    pending=row['n_pending'],
+                    cancelled=row['n_cancelled'],
+                    revenue=row['n_revenue'],
+                )
+                for row in rows
+            )
+
+
+class Migration(migrations.Migration):
+    # Non-atomic so that each session range only holds its BookingStats rows while
+    # it is being recounted; bookings made in between update the rows after it.
+    atomic = False
+
+    dependencies = [
+        ('bookings', '0007_bookingstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
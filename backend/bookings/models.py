@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 
 from sessions.models import Session
 
@@ -10,18 +10,106 @@ class Booking(models.Model):
         CONFIRMED = "CONFIRMED", "CONFIRMED"
         CANCELLED = "CANCELLED", "CANCELLED"
 
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="bookings")
+    # The (user, created_at) index serves lookups by user.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="bookings", db_index=False)
     session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="bookings")
+    # The session's creator, copied here so that a creator's bookings need no join
+    # through sessions; set on insert and when a session changes hands (see signals).
+    creator = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="creator_bookings", editable=False, db_index=False
+    )
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     payment_id = models.CharField(max_length=255, blank=True, help_text="Razorpay payment ID")
     payment_status = models.CharField(max_length=50, blank=True, default="pending")
     amount_paid = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["user", "session"], name="unique_booking_per_user_session"),
         ]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="booking_created_at_id_idx"),
+            # The booking dashboards: one user's or one creator's bookings, newest first.
+            models.Index(fields=["user", "created_at", "id"], name="booking_user_created_idx"),
+            models.Index(fields=["creator", "created_at", "id"], name="booking_creator_created_idx"),
+        ]
 
     def __str__(self):
         return str(self.id)
+
+    # The columns BookingStats is derived from, see bookings/stats.py.
+    STATS_FIELDS = ("session_id", "creator_id", "created_at", "status", "amount_paid")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        booking = super().from_db(db, field_names, values)
+        # What BookingStats counts for this row as loaded; saving it applies the difference.
+        booking._counted = booking.stats_state()
+        return booking
+
+    def stats_state(self):
+        """The values of STATS_FIELDS, or None if some of them were not loaded."""
+        if self.get_deferred_fields().intersection(self.STATS_FIELDS):
+            return None
+        return tuple(getattr(self, name) for name in self.STATS_FIELDS)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.session_id is not None:
+            self.creator_id = self.session.creator_id
+        # The BookingStats update (a post_save handler) commits or rolls back with the row.
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+
+class BookingStats(models.Model):
+    """
+    The bookings made for one session on one day, by status, and the revenue they
+    brought in. Kept current from Booking saves and deletes, see bookings/stats.py.
+    """
+
+    # The unique (session, day) constraint serves lookups by session.
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name="booking_stats", db_index=False)
+    creator = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    day = models.DateField()
+    # Plain integers: a booking from before the table was built can briefly take a counter below zero.
+    bookings = models.IntegerField(default=0)
+    confirmed = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name_plural = "booking stats"
+        constraints = [
+            models.UniqueConstraint(fields=["session", "day"], name="unique_booking_stats_session_day"),
+        ]
+        indexes = [
+            models.Index(fields=["creator", "day"], name="booking_stats_creator_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.session_id} on {self.day}"
+
+
+class StripeEvent(models.Model):
+    """A received Stripe webhook event; the unique `event_id` makes redeliveries no-ops."""
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "PENDING"
+        PROCESSING = "PROCESSING", "PROCESSING"
+        PROCESSED = "PROCESSED", "PROCESSED"
+        FAILED = "FAILED", "FAILED"
+
+    event_id = models.CharField(max_length=255, unique=True)
+    type = models.CharField(max_length=100)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.event_id
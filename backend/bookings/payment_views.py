@@ -1,17 +1,24 @@
 """
-Payment views for creating Stripe Checkout Sessions
+Payment views for creating Stripe Checkout Sessions and receiving Stripe webhooks
 """
+import json
+
 from django.conf import settings
-from rest_framework import status, throttling
-from rest_framework.decorators import api_view, permission_classes, throttle_classes
-from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, throttle_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from ratelimit import throttling
+
 from .models import Booking
-from .payments import create_stripe_checkout_session
+from .payments import create_stripe_checkout_session, stripe
+from .webhooks import record_event, schedule_event
 
 
 class PaymentThrottle(throttling.UserRateThrottle):
+    scope = "payment"
     rate = "10/minute"
 
 
@@ -82,3 +89,35 @@ def create_payment_order(request):
             {"detail": f"Failed to create payment session: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def stripe_webhook(request):
+    """
+    Receive Stripe events (checkout.session.completed and friends).
+    Verifies the `Stripe-Signature` header, stores the event once per Stripe event ID
+    and acknowledges immediately; the booking is updated in the background.
+    """
+    if not settings.STRIPE_WEBHOOK_SECRET or stripe is None:
+        return Response(
+            {"detail": "Stripe webhooks are not configured."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+    payload = request.body
+    try:
+        stripe.Webhook.construct_event(payload, request.headers.get("Stripe-Signature", ""), settings.STRIPE_WEBHOOK_SECRET)
+    except ValueError:
+        return Response({"detail": "Invalid payload."}, status=status.HTTP_400_BAD_REQUEST)
+    except stripe.error.SignatureVerificationError:
+        return Response({"detail": "Invalid signature."}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        event, created = record_event(json.loads(payload))
+        if created:
+            schedule_event(event.pk)
+
+    return Response({"received": True, "duplicate": not created}, status=status.HTTP_200_OK)
@@ -1,18 +1,38 @@
 """
 Payment utilities for Stripe integration
 """
+import logging
+
 from django.conf import settings
 from decimal import Decimal
+from typing import NamedTuple
+from urllib.parse import quote, urlencode
+
+import aiohttp
+
+from config.http import get_async_session
 
 try:
     import stripe
 except ImportError:
     stripe = None
 
+logger = logging.getLogger(__name__)
 
-def create_stripe_checkout_session(amount: Decimal, booking_id: int, session_title: str, customer_email: str = None, customer_name: str = None, currency: str = "inr"):
+STRIPE_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+
+class CheckoutItem(NamedTuple):
+    """One booking paid for in a Checkout Session."""
+
+    amount: Decimal
+    booking_id: int
+    session_title: str
+
+
+def checkout_session_params(amount: Decimal, booking_id: int, session_title: str, customer_email: str = None, customer_name: str = None, currency: str = "inr") -> dict:
     """
-    Create a Stripe Checkout Session for booking payment
+    Parameters for a Stripe Checkout Session paying for one booking
     
     For Indian export transactions, customer name and address are required per regulations.
     See: https://stripe.com/docs/india-exports
@@ -24,19 +44,17 @@ def create_stripe_checkout_session(amount: Decimal, booking_id: int, session_tit
         customer_email: Customer email address (required for Indian exports)
         customer_name: Customer name (required for Indian exports)
         currency: Currency code (default: "inr")
-    
-    Returns session details with session_id and url
     """
-    if not settings.STRIPE_SECRET_KEY:
-        raise ValueError("Stripe credentials not configured")
+    return cart_checkout_params([CheckoutItem(amount, booking_id, session_title)], customer_email, customer_name, currency)
 
-    if stripe is None:
-        raise ImportError("stripe package is not installed")
-
-    stripe.api_key = settings.STRIPE_SECRET_KEY
 
-    # Convert Decimal to smallest currency unit (paise for INR, cents for USD)
-    amount_in_smallest_unit = int(amount * 100)
+def cart_checkout_params(items: list, customer_email: str = None, customer_name: str = None, currency: str = "inr") -> dict:
+    """
+    Parameters for a Stripe Checkout Session paying for several bookings at once,
+    one line item per `CheckoutItem`. The booking IDs go comma-separated into
+    `client_reference_id` (a single ID for one booking, as before), see `checkout_booking_ids`.
+    """
+    booking_ids = ",".join(str(item.booking_id) for item in items)
 
     # Build checkout session parameters
     session_params = {
@@ -45,24 +63,27 @@ def create_stripe_checkout_session(amount: Decimal, booking_id: int, session_tit
             'price_data': {
                 'currency': currency,
                 'product_data': {
-                    'name': session_title,
-                    'description': f'Booking #{booking_id}',
+                    'name': item.session_title,
+                    'description': f'Booking #{item.booking_id}',
                 },
-                'unit_amount': amount_in_smallest_unit,
+                # Convert Decimal to smallest currency unit (paise for INR, cents for USD)
+                'unit_amount': int(item.amount * 100),
             },
             'quantity': 1,
-        }],
+        } for item in items],
         'mode': 'payment',
-        'success_url': f"{settings.FRONTEND_URL}/dashboard?payment=success&booking_id={booking_id}",
+        'success_url': f"{settings.FRONTEND_URL}/dashboard?payment=success&booking_id={items[0].booking_id}",
         'cancel_url': f"{settings.FRONTEND_URL}/dashboard?payment=cancelled",
-        'client_reference_id': str(booking_id),
+        'client_reference_id': booking_ids,
         'metadata': {
-            'booking_id': booking_id,
+            'booking_id': items[0].booking_id,
         },
         # Indian export regulations require customer name and billing address
         # See: https://stripe.com/docs/india-exports
         'billing_address_collection': 'required',  # Required for Indian export compliance
     }
+    if len(items) > 1:
+        session_params['metadata']['booking_ids'] = booking_ids
     
     # Add customer email if provided (required for Indian exports)
     if customer_email:
@@ -72,7 +93,165 @@ def create_stripe_checkout_session(amount: Decimal, booking_id: int, session_tit
     if customer_name:
         session_params['metadata']['customer_name'] = customer_name
 
+    return session_params
+
+
+def checkout_booking_ids(checkout_session) -> list[int]:
+    """The IDs of the bookings a Checkout Session pays for (several for a cart), [] if it names none."""
+    metadata = checkout_session.get("metadata") or {}
+    reference = checkout_session.get("client_reference_id") or metadata.get("booking_ids") or metadata.get("booking_id")
+    try:
+        return [int(booking_id) for booking_id in str(reference or "").split(",") if booking_id]
+    except ValueError:
+        return []
+
+
+def create_stripe_checkout_session(amount: Decimal, booking_id: int, session_title: str, customer_email: str = None, customer_name: str = None, currency: str = "inr"):
+    """
+    Create a Stripe Checkout Session for booking payment
+    (see `checkout_session_params` for the arguments)
+
+    Returns session details with session_id and url
+    """
+    return _create_checkout_session(checkout_session_params(amount, booking_id, session_title, customer_email, customer_name, currency))
+
+
+def create_stripe_cart_checkout_session(items: list, customer_email: str = None, customer_name: str = None, currency: str = "inr"):
+    """
+    Create one Stripe Checkout Session paying for several bookings (see `cart_checkout_params`),
+    a single Stripe API call however many bookings the cart holds.
+    """
+    return _create_checkout_session(cart_checkout_params(items, customer_email, customer_name, currency))
+
+
+def _create_checkout_session(session_params: dict):
+    if not settings.STRIPE_SECRET_KEY:
+        raise ValueError("Stripe credentials not configured")
+
+    if stripe is None:
+        raise ImportError("stripe package is not installed")
+
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    stripe.api_base = settings.STRIPE_API_BASE
+
     # Create checkout session
     checkout_session = stripe.checkout.Session.create(**session_params)
 
     return checkout_session
+
+
+class StripeAPIError(Exception):
+    """An error response from the Stripe API, raised by the async helpers below."""
+
+
+def _form_encode(value, prefix=""):
+    """Stripe's form encoding of nested parameters: `line_items[0][price_data][currency]=inr`."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, (list, tuple)):
+        items = enumerate(value)
+    else:
+        return [(prefix, value)]
+    pairs = []
+    for key, item in items:
+        pairs.extend(_form_encode(item, f"{prefix}[{key}]" if prefix else str(key)))
+    return pairs
+
+
+async def _stripe_request(method: str, path: str, params: dict = None) -> dict:
+    """
+    Call the Stripe REST API over the event loop's shared session. The stripe SDK
+    (8.x) is sync-only, so the async views talk to the API directly.
+    """
+    if not settings.STRIPE_SECRET_KEY:
+        raise ValueError("Stripe credentials not configured")
+
+    headers = {"Authorization": f"Bearer {settings.STRIPE_SECRET_KEY}"}
+    content = None
+    if params:
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+        content = urlencode(_form_encode(params))
+    if stripe is not None:
+        # Same API version the SDK would request.
+        headers["Stripe-Version"] = stripe.api_version
+    async with get_async_session().request(
+        method,
+        f"{settings.STRIPE_API_BASE}{path}",
+        data=content,
+        headers=headers,
+        timeout=STRIPE_TIMEOUT,
+    ) as response:
+        body = await response.json(content_type=None)
+        if response.status >= 400:
+            error = body.get("error", {}) if isinstance(body, dict) else {}
+            raise StripeAPIError(error.get("message") or f"HTTP {response.status}")
+        return body
+
+
+async def acreate_stripe_checkout_session(amount: Decimal, booking_id: int, session_title: str, customer_email: str = None, customer_name: str = None, currency: str = "inr") -> dict:
+    """`create_stripe_checkout_session` for async views; returns the Checkout Session as a dict."""
+    params = checkout_session_params(amount, booking_id, session_title, customer_email, customer_name, currency)
+    return await _stripe_request("POST", "/v1/checkout/sessions", params)
+
+
+async def aretrieve_checkout_session(session_id: str) -> dict:
+    """`stripe.checkout.Session.retrieve` for async views; returns the Checkout Session as a dict."""
+    return await _stripe_request("GET", f"/v1/checkout/sessions/{quote(session_id, safe='')}")
+
+
+def apply_checkout_result(booking, payment_status: str, payment_intent: str = None):
+    """
+    Update a booking from a Stripe Checkout Session's payment state.
+
+    Shared by `verify_payment` and the webhook receiver. A booking that is already
+    paid is never downgraded, so out-of-order or replayed events are harmless. An
+    expired checkout cancels the booking, which releases its seat in the same transaction.
+    """
+    from sessions.models import Session
+
+    from .models import Booking
+
+    if booking.payment_status == "paid":
+        return booking
+
+    if payment_intent:
+        booking.payment_id = payment_intent
+
+    if payment_status == "paid":
+        booking.payment_status = "paid"
+        booking.amount_paid = booking.session.price
+        # A booking cancelled when an earlier checkout expired needs its seat back first.
+        if booking.status != Booking.Status.CANCELLED or Session.objects.reserve_seat(booking.session_id):
+            booking.status = Booking.Status.CONFIRMED
+        else:
+            logger.warning(f"Booking {booking.pk} was paid after it was cancelled and its session is now full; refund it")
+    elif payment_status == "expired":
+        # Nobody paid in time: cancelling frees the seat (see bookings/signals.py).
+        booking.payment_status = "expired"
+        booking.status = Booking.Status.CANCELLED
+    else:
+        booking.payment_status = payment_status or "unpaid"
+        # Only a payment brings a cancelled booking back.
+        if booking.status != Booking.Status.CANCELLED:
+            booking.status = Booking.Status.PENDING
+
+    booking.save()
+    return booking
+
+
+def apply_cart_checkout_result(booking, checkout_session):
+    """
+    `apply_checkout_result` for `booking` and for the other bookings of its user that
+    the same Checkout Session paid for (a cart, see `checkout_booking_ids`).
+    """
+    from .models import Booking
+
+    payment_status, payment_intent = checkout_session.get("payment_status"), checkout_session.get("payment_intent")
+    others = (
+        Booking.objects.select_related("session")
+        .filter(pk__in=checkout_booking_ids(checkout_session), user_id=booking.user_id)
+        .exclude(pk=booking.pk)
+    )
+    for other in others:
+        apply_checkout_result(other, payment_status, payment_intent)
+    return apply_checkout_result(booking, payment_status, payment_intent)
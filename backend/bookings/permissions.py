@@ -17,4 +17,4 @@ class BookingPermission(permissions.BasePermission):
         if not (user and user.is_authenticated):
             return False
         # Only creators can view their bookings, or session creators can view bookings for their sessions
-        return bool(obj.user_id == user.id or obj.session.creator_id == user.id)
+        return bool(obj.user_id == user.id or obj.creator_id == user.id)
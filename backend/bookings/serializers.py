@@ -1,12 +1,16 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
 
+from config.sparse import SparseFieldsMixin
 from sessions.models import Session
 from sessions.serializers import SessionSerializer
 
 from .models import Booking
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     session_id = serializers.PrimaryKeyRelatedField(source="session", queryset=Session.objects.all(), write_only=True)
     session = SessionSerializer(read_only=True)
     user = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -24,6 +28,7 @@ class BookingSerializer(serializers.ModelSerializer):
             "amount_paid",
             "created_at",
         )
+        expandable_fields = ("session",)
         read_only_fields = ("id", "user", "session", "status", "payment_id", "payment_status", "amount_paid", "created_at")
 
     def validate(self, attrs):
@@ -38,3 +43,82 @@ class BookingSerializer(serializers.ModelSerializer):
         if session and session.creator_id == user.id:
             raise serializers.ValidationError({"session_id": "You cannot book your own session."})
         return attrs
+
+
+class CartSerializer(serializers.Serializer):
+    """`{"session_ids": [...]}`: the sessions to book together in one checkout."""
+
+    # The booking IDs of a cart share Stripe's 200-character client_reference_id.
+    MAX_ITEMS = 10
+
+    session_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_ITEMS
+    )
+
+    def validate_session_ids(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Each session can only be booked once.")
+        return value
+
+    def validate(self, attrs):
+        user = getattr(self.context.get("request"), "user", None)
+        # Only creators can book sessions, as in BookingSerializer.validate
+        if getattr(user, "role", None) != "CREATOR":
+            raise serializers.ValidationError({"detail": "Only creators can book sessions."})
+        return attrs
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    """`?since=` / `?until=` for the daily series: the last 30 days by default, at most a year."""
+
+    MAX_DAYS = 366
+
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        until = attrs.get("until") or timezone.localdate()
+        since = attrs.get("since") or until - timedelta(days=29)
+        if since > until:
+            raise serializers.ValidationError({"since": "Must not be after until."})
+        if (until - since).days >= self.MAX_DAYS:
+            raise serializers.ValidationError({"since": f"The range may span at most {self.MAX_DAYS} days."})
+        return {"since": since, "until": until}
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """`?since=` / `?until=` for exports: days the bookings were made on, both optional."""
+
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if "since" in attrs and "until" in attrs and attrs["since"] > attrs["until"]:
+            raise serializers.ValidationError({"since": "Must not be after until."})
+        return attrs
+
+
+class BookingCountsSerializer(serializers.Serializer):
+    bookings = serializers.IntegerField()
+    confirmed = serializers.IntegerField()
+    pending = serializers.IntegerField()
+    cancelled = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class SessionBookingCountsSerializer(BookingCountsSerializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    start_time = serializers.DateTimeField()
+
+
+class DailyBookingCountsSerializer(BookingCountsSerializer):
+    day = serializers.DateField()
+
+
+class CreatorAnalyticsSerializer(serializers.Serializer):
+    since = serializers.DateField()
+    until = serializers.DateField()
+    totals = BookingCountsSerializer()
+    sessions = SessionBookingCountsSerializer(many=True)
+    daily = DailyBookingCountsSerializer(many=True)
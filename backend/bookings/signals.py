@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from sessions.cache import bump_session_version
+from sessions.models import Session
+
+from . import stats
+from .models import Booking, BookingStats
+
+User = get_user_model()
+
+
+def _cascaded_from(origin):
+    """
+    The bookings already deleted by `origin`'s deletion, when that is a session or a user
+    deleting its bookings with it, or None when the bookings themselves are being deleted.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if model not in (Session, User):
+        return None
+    if not hasattr(origin, "_deleted_bookings"):
+        origin._deleted_bookings = []
+    return origin._deleted_bookings
+
+
+@receiver(post_delete, sender=Booking)
+def release_booking_seat(sender, instance, origin=None, **kwargs):
+    if _cascaded_from(origin) is not None:
+        # Released together with the counters, see count_cascaded_deletes.
+        return
+    if instance.status != Booking.Status.CANCELLED:
+        Session.objects.release_seat(instance.session_id)
+        transaction.on_commit(lambda: bump_session_version(instance.session_id))
+
+
+def _stored_state(booking):
+    """`Booking.stats_state()` as the database has it."""
+    values = Booking.objects.filter(pk=booking.pk).values_list(*Booking.STATS_FIELDS).first()
+    return tuple(values) if values else None
+
+
+@receiver(pre_save, sender=Booking)
+def load_counted_state(sender, instance, **kwargs):
+    # Rows that were not loaded in full (or not loaded at all) are read back before they change.
+    if not instance._state.adding and getattr(instance, "_counted", None) is None:
+        instance._counted = _stored_state(instance)
+
+
+@receiver(post_save, sender=Booking)
+def count_booking(sender, instance, created, **kwargs):
+    old = None if created else getattr(instance, "_counted", None)
+    new = instance.stats_state() or _stored_state(instance)
+    stats.record_change(old, new)
+    if old is not None:
+        _follow_seat(old, new)
+    instance._counted = new
+
+
+def _follow_seat(old, new):
+    """
+    Free the seat of a booking that is cancelled. Reinstating one takes its seat with
+    `Session.objects.reserve_seat` first, as creating a booking does, so it can't oversell.
+    """
+    if old[3] != Booking.Status.CANCELLED and new[3] == Booking.Status.CANCELLED:
+        session_id = new[0]
+        Session.objects.release_seat(session_id)
+        transaction.on_commit(lambda: bump_session_version(session_id))
+
+
+@receiver(post_delete, sender=Booking)
+def uncount_booking(sender, instance, origin=None, **kwargs):
+    state = getattr(instance, "_counted", None) or instance.stats_state()
+    cascaded = _cascaded_from(origin)
+    if cascaded is not None:
+        cascaded.append(state)
+    else:
+        stats.record_change(state, None)
+
+
+@receiver(post_delete, sender=Session)
+@receiver(post_delete, sender=User)
+def count_cascaded_deletes(sender, instance, origin=None, **kwargs):
+    # Bookings are deleted before the sessions and users they belong to, so by now the
+    # whole cascade has been collected: apply it in one pass instead of per booking.
+    cascaded = getattr(origin, "_deleted_bookings", None)
+    if cascaded:
+        stats.record_deleted(cascaded)
+        cascaded.clear()
+
+
+@receiver(post_save, sender=Session)
+def follow_session_creator(sender, instance, created, **kwargs):
+    # Keep the denormalized Booking.creator (and the stats rows) in step if a session changes hands.
+    if not created:
+        Booking.objects.filter(session=instance).exclude(creator_id=instance.creator_id).update(creator_id=instance.creator_id)
+        BookingStats.objects.filter(session=instance).exclude(creator_id=instance.creator_id).update(creator_id=instance.creator_id)
@@ -0,0 +1,219 @@
+"""
+Booking counters.
+
+BookingStats holds, per session and per day bookings were made, how many of them
+are in each status and the revenue collected from them; it backs the creator
+analytics. Session carries running totals of its own (`bookings_count`,
+`confirmed_count`, `revenue`) for the catalog. Saving or deleting a Booking applies
+the difference it makes to both, in the same transaction (see signals.py), so
+neither the analytics nor the catalog scan the bookings table. Bookings deleted along
+with their session or user are taken out together, see `record_deleted`.
+`manage.py rebuild_booking_stats` and
+`manage.py reconcile_session_counters` recompute them from the bookings themselves.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from functools import partial
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from sessions.cache import bump_session_version
+from sessions.models import Session
+
+from .models import Booking, BookingStats
+
+COUNTERS = ("bookings", "confirmed", "pending", "cancelled", "revenue")
+# Session column: the counter it follows.
+SESSION_COUNTERS = {"bookings_count": "bookings", "confirmed_count": "confirmed", "revenue": "revenue"}
+# Rows (or sessions) changed by one UPDATE in `record_deleted`.
+DELETE_BATCH_SIZE = 200
+
+
+def contribution(state):
+    """The BookingStats row a booking (as given by `Booking.stats_state()`) counts towards, and what it adds there."""
+    session_id, creator_id, created_at, status, amount_paid = state
+    key = (session_id, timezone.localdate(created_at))
+    return key, {
+        "creator_id": creator_id,
+        "bookings": 1,
+        "confirmed": int(status == Booking.Status.CONFIRMED),
+        "pending": int(status == Booking.Status.PENDING),
+        "cancelled": int(status == Booking.Status.CANCELLED),
+        "revenue": amount_paid or Decimal("0"),
+    }
+
+
+def record_change(old, new):
+    """Move a booking's contribution from its `old` state to its `new` one; None stands for no row."""
+    if old == new:
+        return
+    if old is None:
+        key, values = contribution(new)
+        _add(key, values, insert=values)
+        return
+
+    old_key, old_values = contribution(old)
+    if new is None:
+        _add(old_key, {name: -old_values[name] for name in COUNTERS})
+        return
+
+    new_key, new_values = contribution(new)
+    if old_key == new_key:
+        _add(new_key, {name: new_values[name] - old_values[name] for name in COUNTERS}, insert=new_values)
+    else:
+        _add(old_key, {name: -old_values[name] for name in COUNTERS})
+        _add(new_key, new_values, insert=new_values)
+
+
+def record_created(bookings):
+    """Count bookings inserted with `bulk_create`, which skips `Booking.save()` and its signals."""
+    for booking in bookings:
+        booking._counted = booking.stats_state()
+        record_change(None, booking._counted)
+
+
+def record_deleted(states):
+    """
+    Take many deleted bookings (their `Booking.stats_state()`s) out of the counters
+    together, and release the seats of those that were not cancelled: one UPDATE per
+    batch of BookingStats rows and one per batch of sessions, whatever the number of
+    bookings. Used when a session or a user is deleted with all its bookings.
+    """
+    rows = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    seats = defaultdict(int)
+    for state in states:
+        key, values = contribution(state)
+        for name in COUNTERS:
+            rows[key][name] += values[name]
+        if state[3] != Booking.Status.CANCELLED:
+            seats[key[0]] += 1
+
+    # Sessions deleted in the same cascade have already taken their rows with them.
+    remaining = set(Session.objects.filter(pk__in={session_id for session_id, _ in rows}).values_list("pk", flat=True))
+    rows = [(key, values) for key, values in rows.items() if key[0] in remaining]
+    sessions = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for (session_id, _), values in rows:
+        for name in COUNTERS:
+            sessions[session_id][name] += values[name]
+    sessions = list(sessions.items())
+
+    for start in range(0, len(rows), DELETE_BATCH_SIZE):
+        batch = rows[start:start + DELETE_BATCH_SIZE]
+        matches = Q()
+        for (session_id, day), _ in batch:
+            matches |= Q(session_id=session_id, day=day)
+        BookingStats.objects.filter(matches).update(**{
+            name: F(name) - _per_row(
+                BookingStats, name, [(Q(session_id=session_id, day=day), values[name]) for (session_id, day), values in batch]
+            )
+            for name in COUNTERS
+        })
+
+    for start in range(0, len(sessions), DELETE_BATCH_SIZE):
+        batch = sessions[start:start + DELETE_BATCH_SIZE]
+        changes = {
+            column: F(column) - _per_row(Session, column, [(Q(pk=session_id), values[name]) for session_id, values in batch])
+            for column, name in SESSION_COUNTERS.items()
+        }
+        # As Session.objects.release_seat does, one seat per booking, never below zero.
+        taken = _per_row(Session, "seats_taken", [(Q(pk=session_id), seats[session_id]) for session_id, _ in batch])
+        changes["seats_taken"] = Greatest(F("seats_taken") - taken, Value(0))
+        Session.objects.filter(pk__in=[session_id for session_id, _ in batch]).update(**changes, updated_at=timezone.now())
+
+    for session_id, _ in sessions:
+        transaction.on_commit(partial(bump_session_version, session_id))
+
+
+def _per_row(model, name, amounts):
+    """`CASE WHEN <condition> THEN <amount> ... ELSE 0 END`, typed as `model.name`."""
+    field = model._meta.get_field(name)
+    return Case(*(When(condition, then=Value(amount)) for condition, amount in amounts), default=Value(0), output_field=field)
+
+
+def _add(key, values, insert=None):
+    """
+    Add the COUNTERS in `values` to the row for `key` (if there is none yet, create it
+    from `insert`, if given) and to the session's totals.
+    """
+    session_id, day = key
+    changes = {name: F(name) + values[name] for name in COUNTERS if values[name]}
+    if not changes:
+        return
+    session_changes = {column: F(column) + values[name] for column, name in SESSION_COUNTERS.items() if values[name]}
+    if session_changes:
+        Session.objects.filter(pk=session_id).update(**session_changes, updated_at=timezone.now())
+        # Only this session's cached detail goes stale; the rest of the catalog stays cached.
+        transaction.on_commit(lambda: bump_session_version(session_id))
+
+    rows = BookingStats.objects.filter(session_id=session_id, day=day)
+    if rows.update(**changes) or insert is None:
+        return
+    try:
+        with transaction.atomic():
+            BookingStats.objects.create(session_id=session_id, day=day, **insert)
+    except IntegrityError:
+        # Another booking for the same session and day created the row first.
+        rows.update(**changes)
+
+
+def rebuild(session_ids):
+    """Recompute the rows of the given sessions from their bookings. Returns the number of rows written."""
+    with transaction.atomic():
+        # New bookings take a seat on their session first, so holding the sessions keeps
+        # them from creating rows this rebuild is about to insert. Bookings that change
+        # status meanwhile wait on the rows deleted here and then apply their difference.
+        list(Session.objects.select_for_update().filter(pk__in=session_ids).values_list("pk", flat=True))
+        BookingStats.objects.filter(session_id__in=session_ids).delete()
+        rows = (
+            Booking.objects.filter(session_id__in=session_ids)
+            .values("session_id", "creator_id", day=TruncDate("created_at"))
+            .annotate(
+                n_bookings=Count("id"),
+                n_confirmed=Count("id", filter=Q(status=Booking.Status.CONFIRMED)),
+                n_pending=Count("id", filter=Q(status=Booking.Status.PENDING)),
+                n_cancelled=Count("id", filter=Q(status=Booking.Status.CANCELLED)),
+                n_revenue=Sum("amount_paid", default=Decimal("0")),
+            )
+            .values_list("session_id", "creator_id", "day", *(f"n_{name}" for name in COUNTERS))
+            .order_by()
+        )
+        # INSERT ... SELECT: the aggregated rows never leave the database.
+        select, params = rows.query.sql_with_params()
+        columns = ", ".join(
+            connection.ops.quote_name(BookingStats._meta.get_field(name).column) for name in ("session", "creator", "day", *COUNTERS)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {connection.ops.quote_name(BookingStats._meta.db_table)} ({columns}) {select}", params)
+            return cursor.rowcount
+
+
+def session_totals(creator):
+    """Every session of `creator`, newest first, with its counters summed over all days."""
+    sessions = (
+        Session.objects.filter(creator=creator)
+        .annotate(**{f"n_{name}": Sum(f"booking_stats__{name}", default=0) for name in COUNTERS})
+        .order_by("-start_time", "-id")
+        .values("id", "title", "start_time", *(f"n_{name}" for name in COUNTERS))
+    )
+    return [_rename(session) for session in sessions]
+
+
+def daily_totals(creator, since, until):
+    """One entry per day from `since` to `until` (inclusive), with the counters of the bookings made that day."""
+    rows = (
+        BookingStats.objects.filter(creator=creator, day__range=(since, until))
+        .values("day")
+        .annotate(**{f"n_{name}": Sum(name) for name in COUNTERS})
+        .order_by("day")
+    )
+    by_day = {row["day"]: _rename(row) for row in rows}
+    days = (since + timedelta(days=offset) for offset in range((until - since).days + 1))
+    return [by_day.get(day, {"day": day, **dict.fromkeys(COUNTERS, 0)}) for day in days]
+
+
+def _rename(row):
+    return {name.removeprefix("n_"): value for name, value in row.items()}
@@ -0,0 +1,10 @@
+from jobs.queue import task
+
+from .webhooks import PROCESS_EVENT_TASK, process_event
+
+
+@task(PROCESS_EVENT_TASK, max_attempts=8)
+def process_stripe_event(event_pk: int) -> None:
+    # The job lease already guarantees a single runner, so force lets a retry pick up
+    # an event that a crashed worker left in PROCESSING.
+    process_event(event_pk, force=True)
@@ -1,13 +1,27 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .payment_views import create_payment_order
+from .payment_views import create_payment_order, stripe_webhook
 from .views import BookingViewSet
 
 router = DefaultRouter()
 router.register("", BookingViewSet, basename="booking")
 
-urlpatterns = [
-    path("create-payment-order/", create_payment_order, name="create-payment-order"),
+if settings.SERVER_MODE == "asgi":
+    from .async_views import CreatePaymentOrderView, VerifyPaymentView
+
+    payment_urls = [
+        path("create-payment-order/", CreatePaymentOrderView.as_view(), name="create-payment-order"),
+        # Ahead of the router, so it takes over BookingViewSet.verify_payment.
+        path("<int:pk>/verify_payment/", VerifyPaymentView.as_view(), name="booking-verify-payment"),
+    ]
+else:
+    payment_urls = [
+        path("create-payment-order/", create_payment_order, name="create-payment-order"),
+    ]
+
+urlpatterns = payment_urls + [
+    path("stripe-webhook/", stripe_webhook, name="stripe-webhook"),
     path("", include(router.urls)),
 ]
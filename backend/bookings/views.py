@@ -1,53 +1,258 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
 from django.conf import settings
-from rest_framework import mixins, status, throttling, viewsets
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from config.conditional import conditional_response, page_validators, queryset_validators
+from config.pagination import KeysetPagination
+from config.sparse import is_expanded, only_columns, requested_fields
+from ratelimit import throttling
+from sessions.models import Session
+from sessions.serializers import SessionSerializer
+
+from . import exports, stats
+from .filters import BookingFilter
 from .models import Booking
+from .payments import CheckoutItem, apply_cart_checkout_result, checkout_booking_ids, create_stripe_cart_checkout_session
 from .permissions import BookingPermission
-from .serializers import BookingSerializer
+from .serializers import (
+    AnalyticsQuerySerializer,
+    BookingSerializer,
+    CartSerializer,
+    CreatorAnalyticsSerializer,
+    ExportQuerySerializer,
+)
+
+ALREADY_BOOKED = "You have already booked this session. Check your dashboard to see your existing booking."
+
+
+def free_booking_fields(session):
+    """Bookings of free sessions (price = 0) are inserted confirmed, with nothing to pay."""
+    if session.price == Decimal("0"):
+        return {"status": Booking.Status.CONFIRMED, "payment_status": "free", "amount_paid": Decimal("0")}
+    return {}
 
 
 class BookingThrottle(throttling.UserRateThrottle):
+    scope = "booking"
     rate = "10/minute"
 
 
+class BookingPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
 class BookingViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     serializer_class = BookingSerializer
     permission_classes = [BookingPermission]
-    throttle_classes = [BookingThrottle]
+    pagination_class = BookingPagination
+    filter_backends = [BookingFilter]
+    # The nested session is part of the body, so its edits must change the validators too.
+    validator_fields = ("updated_at", "session__updated_at")
+
+    # Actions that book or pay, under BookingThrottle; reads keep the default throttles.
+    booking_actions = ("create", "cart", "verify_payment")
+
+    def get_throttles(self):
+        if self.action in self.booking_actions:
+            return [BookingThrottle()]
+        return super().get_throttles()
 
     def get_queryset(self):
+        return self._own(self._restrict_columns(Booking.objects.select_related("session").order_by("-created_at", "-id")))
+
+    def _own(self, qs):
         user = self.request.user
-        qs = Booking.objects.select_related("user", "session", "session__creator").order_by("-created_at")
         if getattr(user, "role", None) == "CREATOR":
-            return qs.filter(session__creator=user)
+            return qs.filter(creator=user)
         return qs.filter(user=user)
 
+    def _nests_session(self):
+        fields = requested_fields(self.request)
+        return is_expanded(self.request, "session") and (fields is None or "session" in fields)
+
+    def _restrict_columns(self, qs):
+        """Load only what `?fields=` / `?expand=` will actually serialize."""
+        fields = requested_fields(self.request)
+        nest_session = self._nests_session()
+        if not nest_session:
+            qs = qs.select_related(None)
+        if fields is None:
+            return qs
+
+        # `user` and `creator` are read by BookingPermission, `created_at` by the pagination,
+        # `updated_at` by the list's validators.
+        columns = only_columns(Booking, fields | {"created_at", "updated_at", "session", "user", "creator"})
+        if nest_session:
+            session_fields = requested_fields(self.request, "session")
+            if session_fields is None:
+                session_fields = [field.name for field in Session._meta.concrete_fields]
+            columns += only_columns(
+                Session, {*session_fields, "updated_at"}, SessionSerializer.Meta.column_sources, prefix="session__"
+            )
+        return qs.only(*columns)
+
+    def list(self, request, *args, **kwargs):
+        # The validators come from the page being served rather than from the whole list,
+        # so a page (or a 304 for it) costs one index range scan however many bookings there are.
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        timestamp_fields = ("updated_at", "session.updated_at") if self._nests_session() else ("updated_at",)
+        return conditional_response(
+            request,
+            lambda: page_validators(request, page, timestamp_fields, has_next=self.paginator.has_next),
+            lambda: self.get_paginated_response(self.get_serializer(page, many=True).data),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_response(
+            request,
+            lambda: queryset_validators(request, self.get_queryset().filter(pk=kwargs["pk"]), self.validator_fields),
+            lambda: super(BookingViewSet, self).retrieve(request, *args, **kwargs),
+        )
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context["request"] = self.request
         return context
 
     def perform_create(self, serializer):
-        """Create a booking, handling duplicate booking attempts gracefully"""
-        from django.db import IntegrityError
-        from decimal import Decimal
-        from rest_framework.exceptions import ValidationError
-        
+        """Create a booking, taking a seat atomically and handling duplicate booking attempts gracefully"""
+        session = serializer.validated_data["session"]
         try:
-            booking = serializer.save(user=self.request.user)
-            
-            # Auto-confirm free sessions (price = 0)
-            if booking.session.price == Decimal('0'):
-                booking.status = Booking.Status.CONFIRMED
-                booking.payment_status = "free"
-                booking.amount_paid = Decimal('0')
-                booking.save()
+            with transaction.atomic():
+                # The seat and the booking row commit (or roll back) together.
+                if not Session.objects.reserve_seat(session.pk):
+                    raise ValidationError({"detail": "This session is fully booked."})
+                # Auto-confirm free sessions (price = 0), inserting the booking confirmed
+                # rather than saving (and counting) it twice.
+                # Saving also bumps the session's counters, which invalidates its cached detail.
+                serializer.save(user=self.request.user, **free_booking_fields(session))
         except IntegrityError:
-            raise ValidationError(
-                {"detail": "You have already booked this session. Check your dashboard to see your existing booking."}
-            )
+            raise ValidationError({"detail": ALREADY_BOOKED})
+
+    @action(detail=False, methods=["post"])
+    def cart(self, request):
+        """
+        Book several sessions in one request: one transaction, one query for the sessions
+        and one Stripe Checkout Session with a line item per booking that needs paying.
+        Expects: { "session_ids": [<id>, ...] }
+        Returns: { "bookings": [...], "checkout": { "session_id", "url", "publishable_key" } or null }
+        """
+        cart = CartSerializer(data=request.data, context=self.get_serializer_context())
+        cart.is_valid(raise_exception=True)
+        bookings = self._book_cart(cart.validated_data["session_ids"])
+
+        data = {
+            "bookings": BookingSerializer(bookings, many=True, context=self.get_serializer_context()).data,
+            "checkout": None,
+        }
+        unpaid = [booking for booking in bookings if booking.status == Booking.Status.PENDING]
+        if unpaid:
+            # After the commit, so no session stays locked while Stripe answers.
+            try:
+                checkout_session = create_stripe_cart_checkout_session(
+                    [CheckoutItem(booking.session.price, booking.id, booking.session.title) for booking in unpaid],
+                    customer_email=request.user.email,
+                    customer_name=request.user.name,
+                )
+                data["checkout"] = {
+                    "session_id": checkout_session.id,
+                    "url": checkout_session.url,
+                    "publishable_key": settings.STRIPE_PUBLISHABLE_KEY,
+                }
+            except Exception as e:
+                # The bookings stand, pending; each can still be paid through create-payment-order.
+                data["detail"] = f"Failed to create payment session: {str(e)}"
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def _book_cart(self, session_ids):
+        """Validate the sessions and insert a booking for each, all or nothing."""
+        user = self.request.user
+        try:
+            with transaction.atomic():
+                # A single query for all the sessions. Locking them (in primary key order, so
+                # two carts can't deadlock) keeps their seat counts valid until the commit.
+                sessions = {
+                    session.pk: session
+                    for session in Session.objects.select_for_update().filter(pk__in=session_ids).order_by("pk")
+                }
+                missing = [pk for pk in session_ids if pk not in sessions]
+                if missing:
+                    raise ValidationError({"session_ids": f"Sessions not found: {', '.join(map(str, missing))}."})
+                sessions = [sessions[pk] for pk in session_ids]
+                if any(session.creator_id == user.id for session in sessions):
+                    raise ValidationError({"session_ids": "You cannot book your own session."})
+                full = [session.title for session in sessions if session.capacity is not None and session.seats_taken >= session.capacity]
+                if full:
+                    raise ValidationError({"detail": f"Fully booked: {', '.join(full)}."})
+                booked = set(Booking.objects.filter(user=user, session_id__in=session_ids).values_list("session_id", flat=True))
+                if booked:
+                    titles = ", ".join(session.title for session in sessions if session.pk in booked)
+                    raise ValidationError({"detail": f"You have already booked: {titles}."})
+
+                if Session.objects.reserve_seats(session_ids) != len(session_ids):
+                    raise ValidationError({"detail": "A session in the cart is fully booked."})
+                bookings = Booking.objects.bulk_create(
+                    Booking(user=user, session=session, creator_id=session.creator_id, **free_booking_fields(session))
+                    for session in sessions
+                )
+                # Per session this bumps the counters, as saving each booking would.
+                stats.record_created(bookings)
+        except IntegrityError:
+            raise ValidationError({"detail": ALREADY_BOOKED})
+        return bookings
+
+    @action(detail=False, methods=["get"])
+    def analytics(self, request):
+        """Booking counts and revenue across the creator's sessions, per session and per day."""
+        if getattr(request.user, "role", None) != "CREATOR":
+            return Response({"detail": "Only creators have booking analytics."}, status=status.HTTP_403_FORBIDDEN)
+        params = AnalyticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        # Read from BookingStats, so the cost grows with sessions and days, not bookings.
+        sessions = stats.session_totals(request.user)
+        data = {
+            **params.validated_data,
+            "totals": {name: sum(session[name] for session in sessions) for name in stats.COUNTERS},
+            "sessions": sessions,
+            "daily": stats.daily_totals(request.user, **params.validated_data),
+        }
+        return Response(CreatorAnalyticsSerializer(data).data)
+
+    @action(detail=False, methods=["get"], renderer_classes=[exports.CSVRenderer, exports.NDJSONRenderer])
+    def export(self, request):
+        """
+        The bookings `list` would return, oldest first, as a CSV (`?format=csv`, the default)
+        or NDJSON (`?format=ndjson`) download. `?since=` / `?until=` limit it to the days
+        the bookings were made on. Streamed from a cursor, so it starts at once and uses the
+        same memory for 100 bookings as for millions.
+        """
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        qs = self._own(Booking.objects.order_by("created_at", "id"))
+        # Bounds on the column itself rather than created_at__date, so the (..., created_at, id) indexes apply.
+        tz = timezone.get_current_timezone()
+        if "since" in params.validated_data:
+            qs = qs.filter(created_at__gte=datetime.combine(params.validated_data["since"], time.min, tzinfo=tz))
+        if "until" in params.validated_data:
+            qs = qs.filter(created_at__lt=datetime.combine(params.validated_data["until"] + timedelta(days=1), time.min, tzinfo=tz))
+
+        fmt = request.accepted_renderer.format
+        response = StreamingHttpResponse(
+            exports.STREAMS[fmt](exports.rows(qs)), content_type=f"{request.accepted_renderer.media_type}; charset=utf-8"
+        )
+        response["Content-Disposition"] = f'attachment; filename="bookings-{timezone.localdate():%Y-%m-%d}.{fmt}"'
+        # Tell nginx to pass the rows on as they come instead of buffering the response.
+        response["X-Accel-Buffering"] = "no"
+        return response
 
     @action(detail=True, methods=["post"])
     def verify_payment(self, request, pk=None):
@@ -64,36 +269,34 @@ class BookingViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, mixins.Retr
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if booking.payment_status == "paid":
+            # Already confirmed (usually by the Stripe webhook); no need to ask Stripe again.
+            return Response(
+                {
+                    "detail": "Payment verified successfully.",
+                    "booking": BookingSerializer(booking, context={"request": request}).data,
+                },
+                status=status.HTTP_200_OK,
+            )
+
         try:
             import stripe
 
             stripe.api_key = settings.STRIPE_SECRET_KEY
+            stripe.api_base = settings.STRIPE_API_BASE
             
             # Retrieve the checkout session from Stripe
             checkout_session = stripe.checkout.Session.retrieve(session_id)
 
-            # Verify the session belongs to this booking
-            if str(checkout_session.client_reference_id) != str(booking.id):
+            # Verify the session belongs to this booking (or to a cart holding it)
+            if booking.id not in checkout_booking_ids(checkout_session):
                 return Response(
                     {"detail": "Session does not match booking."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Update booking based on payment status
-            booking.payment_id = checkout_session.payment_intent
-            
-            if checkout_session.payment_status == "paid":
-                booking.payment_status = "paid"
-                booking.amount_paid = booking.session.price
-                booking.status = Booking.Status.CONFIRMED
-            elif checkout_session.payment_status == "unpaid":
-                booking.payment_status = "unpaid"
-                booking.status = Booking.Status.PENDING
-            else:
-                booking.payment_status = checkout_session.payment_status
-                booking.status = Booking.Status.PENDING
-
-            booking.save()
+            # Update booking (and the rest of its cart) based on payment status
+            apply_cart_checkout_result(booking, checkout_session)
 
             return Response(
                 {
@@ -0,0 +1,110 @@
+"""
+Stripe webhook handling.
+
+The receiver only verifies the signature, stores the event and queues a job for
+it; `manage.py runworker` applies it to the booking. Every event is recorded by
+its Stripe ID, so redeliveries and retries are idempotent.
+"""
+import hashlib
+import hmac
+import logging
+import time
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.queue import enqueue
+
+from .models import Booking, StripeEvent
+from .payments import apply_checkout_result, checkout_booking_ids
+
+logger = logging.getLogger(__name__)
+
+PROCESS_EVENT_TASK = "bookings.process_stripe_event"
+
+
+def sign_payload(payload: str, secret: str, timestamp: int = None) -> str:
+    """Build a `Stripe-Signature` header for `payload`, e.g. to replay local fixtures."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature = hmac.new(secret.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def record_event(event: dict) -> tuple[StripeEvent, bool]:
+    """Store a verified event. Returns `(event, created)`; `created` is False for redeliveries."""
+    return StripeEvent.objects.get_or_create(
+        event_id=event["id"],
+        defaults={"type": event.get("type", ""), "payload": event},
+    )
+
+
+def schedule_event(event_pk: int) -> None:
+    """Queue the event for a worker; the job becomes visible when the current transaction commits."""
+    enqueue(PROCESS_EVENT_TASK, event_pk=event_pk)
+
+
+def process_event(event_pk: int, force: bool = False) -> bool:
+    """
+    Apply a stored event. Claiming the row with a conditional UPDATE guarantees a
+    single processor even if the same event is scheduled twice. Returns True if
+    this call processed the event.
+    """
+    claimable = [StripeEvent.Status.PENDING, StripeEvent.Status.FAILED]
+    if force:
+        claimable.append(StripeEvent.Status.PROCESSING)
+    claimed = StripeEvent.objects.filter(pk=event_pk, status__in=claimable).update(
+        status=StripeEvent.Status.PROCESSING, attempts=F("attempts") + 1
+    )
+    if not claimed:
+        return False
+
+    event = StripeEvent.objects.get(pk=event_pk)
+    try:
+        with transaction.atomic():
+            handler = EVENT_HANDLERS.get(event.type)
+            if handler:
+                handler(event.payload["data"]["object"])
+    except Exception as e:
+        StripeEvent.objects.filter(pk=event_pk).update(status=StripeEvent.Status.FAILED, last_error=str(e))
+        raise
+
+    StripeEvent.objects.filter(pk=event_pk).update(
+        status=StripeEvent.Status.PROCESSED, processed_at=timezone.now(), last_error=""
+    )
+    return True
+
+
+def _bookings_for(checkout_session: dict) -> list:
+    """The bookings a checkout session pays for, locked: one, or all of a cart's."""
+    booking_ids = checkout_booking_ids(checkout_session)
+    if not booking_ids:
+        return []
+    bookings = list(Booking.objects.select_for_update().select_related("session").filter(pk__in=booking_ids).order_by("pk"))
+    if len(bookings) < len(set(booking_ids)):
+        missing = sorted(set(booking_ids) - {booking.pk for booking in bookings})
+        logger.warning(f"Stripe checkout session {checkout_session.get('id')} references unknown bookings {missing}")
+    return bookings
+
+
+def _checkout_completed(checkout_session: dict) -> None:
+    for booking in _bookings_for(checkout_session):
+        apply_checkout_result(booking, checkout_session.get("payment_status"), checkout_session.get("payment_intent"))
+
+
+def _checkout_async_payment_failed(checkout_session: dict) -> None:
+    for booking in _bookings_for(checkout_session):
+        apply_checkout_result(booking, "failed", checkout_session.get("payment_intent"))
+
+
+def _checkout_expired(checkout_session: dict) -> None:
+    for booking in _bookings_for(checkout_session):
+        apply_checkout_result(booking, "expired")
+
+
+EVENT_HANDLERS = {
+    "checkout.session.completed": _checkout_completed,
+    "checkout.session.async_payment_succeeded": _checkout_completed,
+    "checkout.session.async_payment_failed": _checkout_async_payment_failed,
+    "checkout.session.expired": _checkout_expired,
+}
@@ -0,0 +1,42 @@
+"""
+DRF views with coroutine handlers, for endpoints that mostly wait on third-party APIs.
+
+DRF's `APIView.dispatch` is synchronous. `AsyncAPIView` keeps its request
+parsing, exception handling and response finalization, but runs the blocking
+`initial()` step (authentication, permissions, throttles) in a worker thread and
+awaits the handler on the event loop. While a handler awaits an outbound call,
+the worker serves other requests. Handlers must not touch the ORM directly; use
+Django's async ORM methods or `sync_to_async`.
+
+Only served as async under ASGI (`SERVER_MODE=asgi`, see `config/urls.py`); under
+WSGI Django would start a new event loop per request.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or handler is None:
+                raise MethodNotAllowed(request.method)
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,86 @@
+"""
+Conditional GET support (ETag / Last-Modified) for read endpoints.
+
+Validators are derived from cheap aggregates (row count and newest `updated_at`),
+or from the rows of the page being served, instead of the rendered body, so a
+matching `If-None-Match` / `If-Modified-Since` is answered with 304 before any
+serializer runs.
+"""
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+def make_validators(request, fingerprint, timestamps, per_user=True):
+    """
+    Build `(etag, last_modified)` for the current URL (and requesting user, if `per_user`).
+    `fingerprint` identifies the rows, e.g. their count.
+    """
+    timestamps = [ts for ts in timestamps if ts is not None]
+    last_modified = max(timestamps) if timestamps else None
+    raw = "|".join(
+        [
+            request.get_full_path(),
+            str(getattr(request.user, "pk", None)) if per_user else "",
+            str(fingerprint),
+            last_modified.isoformat() if last_modified else "",
+        ]
+    )
+    return quote_etag(hashlib.sha1(raw.encode()).hexdigest()), last_modified
+
+
+def queryset_validators(request, queryset, timestamp_fields=("updated_at",), per_user=True):
+    """Validators for a (filtered) queryset: row count plus the newest timestamp."""
+    aggregates = {f"max_{i}": Max(field) for i, field in enumerate(timestamp_fields)}
+    values = queryset.order_by().aggregate(row_count=Count("pk"), **aggregates)
+    if not values["row_count"]:
+        return None, None
+    return make_validators(request, values["row_count"], [values[key] for key in aggregates], per_user=per_user)
+
+
+def page_validators(request, page, timestamp_fields=("updated_at",), has_next=False, per_user=True):
+    """
+    Validators for the page of objects being served: their primary keys, whether more
+    follow, and the newest of their `timestamp_fields` (dotted for related objects,
+    which must already be loaded). Nothing is queried beyond the page itself.
+    """
+    if not page:
+        return None, None
+    fingerprint = ",".join(str(obj.pk) for obj in page) + ("+" if has_next else "")
+    return make_validators(request, fingerprint, [_attribute(obj, field) for obj in page for field in timestamp_fields], per_user)
+
+
+def _attribute(obj, path):
+    for name in path.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def conditional_response(request, validators, build):
+    """
+    Return 304 when the client's validators still match, otherwise `build()` the
+    response. Either way the current ETag / Last-Modified headers are attached.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return build()
+
+    try:
+        etag, last_modified = validators()
+    except (TypeError, ValueError):
+        # Malformed lookups (e.g. a non-numeric pk); let `build()` report them properly.
+        return build()
+    last_modified_ts = timegm(last_modified.utctimetuple()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if response is None:
+        response = build()
+
+    if response.status_code in (200, 304):
+        if etag and not response.has_header("ETag"):
+            response.headers["ETag"] = etag
+        if last_modified_ts is not None and not response.has_header("Last-Modified"):
+            response.headers["Last-Modified"] = http_date(last_modified_ts)
+    return response
@@ -0,0 +1,84 @@
+"""
+Connection pool statistics for `/metrics`.
+
+With `DB_POOL` on (the default with Postgres), every process lends requests
+connections from its own psycopg pool. The pool counts checkouts, waits and
+reconnects in memory; `publish_pool_stats` adds them to the shared counters in
+`config.metrics` after a request at most every `DB_POOL_STATS_INTERVAL` seconds,
+and on every scrape, so the totals cover all workers.
+
+Sizing: `db_pool_checkout_milliseconds_total / 1000` grows by the average number of
+connections in use per second, `db_pool_wait_milliseconds_total` by the time
+requests spent queueing for one, and `db_pool_connections_opened_total` by
+connection churn.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# psycopg_pool statistic -> exported counter
+POOL_COUNTERS = {
+    "requests_num": ("db_pool_checkouts_total", "Connections lent to requests by the pool"),
+    "requests_queued": ("db_pool_checkouts_queued_total", "Checkouts that had to wait for a free connection"),
+    "requests_wait_ms": ("db_pool_wait_milliseconds_total", "Time spent waiting for a free connection"),
+    "requests_errors": ("db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT"),
+    "usage_ms": ("db_pool_checkout_milliseconds_total", "Time connections spent lent out"),
+    "connections_num": ("db_pool_connections_opened_total", "Connections opened to Postgres"),
+    "connections_ms": ("db_pool_connect_milliseconds_total", "Time spent opening connections"),
+    "connections_errors": ("db_pool_connection_errors_total", "Failed connection attempts"),
+    "connections_lost": ("db_pool_connections_lost_total", "Pooled connections found dead by the health check"),
+    "returns_bad": ("db_pool_connections_discarded_total", "Connections returned in a broken state and closed"),
+}
+
+for name, help_text in POOL_COUNTERS.values():
+    metrics.register(name, help_text)
+
+_lock = threading.Lock()
+_published_at = 0.0
+
+
+def publish_pool_stats(force: bool = False) -> None:
+    """Move this process's pool statistics into the shared counters."""
+    global _published_at
+    if not force and time.monotonic() - _published_at < settings.DB_POOL_STATS_INTERVAL:
+        return
+    with _lock:
+        if not force and time.monotonic() - _published_at < settings.DB_POOL_STATS_INTERVAL:
+            return
+        _published_at = time.monotonic()
+        for alias in connections:
+            connection = connections[alias]
+            pool = getattr(connection, "pool", None)
+            if pool is None:
+                continue
+            # Both pops reset their counters, so every checkout is counted once.
+            stats = Counter(pool.pop_stats())
+            if hasattr(connection, "pop_checkout_stats"):
+                stats.update(connection.pop_checkout_stats())
+            for stat, (name, _) in POOL_COUNTERS.items():
+                if stats.get(stat):
+                    metrics.incr(name, stats[stat])
+
+
+def _publish_after_request(sender, **kwargs):
+    try:
+        publish_pool_stats()
+    except Exception as e:
+        logger.debug(f"Failed to publish connection pool statistics: {e}")
+
+
+def _publish_on_scrape():
+    publish_pool_stats(force=True)
+
+
+request_finished.connect(_publish_after_request, dispatch_uid="config.db.publish_pool_stats")
+metrics.add_collector(_publish_on_scrape)
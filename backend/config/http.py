@@ -0,0 +1,47 @@
+"""
+Process-wide HTTP connection pool for calls to third-party APIs.
+
+`requests.get()`/`post()` open a new TCP + TLS connection per call. Sharing one
+`requests.Session` keeps connections alive between requests in the same worker,
+which saves a handshake (often 100ms+) on every outbound call after the first.
+
+Async views use `get_async_session()` instead: an `aiohttp.ClientSession`, one per
+event loop (one per worker under uvicorn), so a single worker can keep many
+outbound calls in flight over kept-alive connections.
+"""
+import asyncio
+import threading
+import weakref
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+_session = None
+_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+_async_sessions = weakref.WeakKeyDictionary()
+
+
+def get_async_session() -> aiohttp.ClientSession:
+    """The running event loop's shared session. Only call this from a coroutine."""
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=256, keepalive_timeout=30))
+        _async_sessions[loop] = session
+    return session
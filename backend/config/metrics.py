@@ -0,0 +1,78 @@
+"""
+Tiny counter registry shared by every worker through the default cache.
+
+Counters are plain integers under `metrics:<name>` keys, so they survive worker
+restarts and add up across gunicorn processes. That takes a shared cache (`REDIS_URL`):
+on the LocMem fallback every process keeps its own counters, and a scrape only sees
+those of the worker that answered it. `metrics_view` renders them in the Prometheus
+text exposition format.
+"""
+import hmac
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "metrics:"
+
+_registry: dict[str, str] = {}
+_collectors = []
+
+
+def register(name: str, help_text: str) -> None:
+    """Declare a counter so it is exported even before its first increment."""
+    _registry[name] = help_text
+
+
+def add_collector(collector) -> None:
+    """Run `collector()` before every scrape, e.g. to flush counts a process keeps locally."""
+    _collectors.append(collector)
+
+
+def incr(name: str, amount: int = 1) -> None:
+    """Add `amount` to a counter. Metrics must never break the request, so cache errors are swallowed."""
+    key = KEY_PREFIX + name
+    try:
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            # First increment since the key was created or evicted.
+            if not cache.add(key, amount, timeout=None):
+                cache.incr(key, amount)
+    except Exception as e:
+        logger.debug(f"Failed to increment metric {name}: {e}")
+
+
+def snapshot() -> dict[str, int]:
+    try:
+        values = cache.get_many([KEY_PREFIX + name for name in _registry])
+    except Exception as e:
+        logger.debug(f"Failed to read metrics: {e}")
+        values = {}
+    return {name: values.get(KEY_PREFIX + name, 0) for name in sorted(_registry)}
+
+
+def metrics_view(request):
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        # Open only in development; production must set a token.
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponseForbidden()
+
+    for collector in _collectors:
+        try:
+            collector()
+        except Exception as e:
+            logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+
+    lines = []
+    for name, value in snapshot().items():
+        lines.append(f"# HELP {name} {_registry[name]}")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+    return HttpResponse("\n".join(lines) + "\n", content_type="text/plain; version=0.0.4")
@@ -0,0 +1,94 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from .queries import QueryRecorder, record_queries
+
+query_logger = logging.getLogger("config.queries")
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs natively under ASGI.
+
+    WhiteNoise's middleware is sync-only, and Django adapts the rest of the stack
+    around a sync-only middleware by parking a thread on every request. This
+    version serves static files the same way and passes everything else straight
+    through to the async handler.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Count the SQL each request runs and report it.
+
+    Adds `Server-Timing: db;dur=<ms>;desc="<n> queries, <m> repeated"` to the
+    response (with `SQL_SERVER_TIMING`) and logs the same figures to the
+    `config.queries` logger at INFO. A query shape that runs more than
+    `SQL_REPEAT_THRESHOLD` times is logged as a warning, or raises
+    `RepeatedQueryError` at the offending query with `SQL_STRICT` on.
+
+    Queries made while a streamed body is being consumed are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with record_queries(settings.SQL_REPEAT_THRESHOLD, settings.SQL_STRICT) as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder)
+
+    async def __acall__(self, request):
+        # Connections belong to a thread, and under ASGI the request's sync code (views,
+        # the async ORM) all runs in one thread of its own. Record in that thread.
+        recorder = QueryRecorder(settings.SQL_REPEAT_THRESHOLD, settings.SQL_STRICT)
+        await sync_to_async(recorder.install)()
+        response = await self.get_response(request)
+        await sync_to_async(recorder.uninstall)()
+        return self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        if not recorder.count:
+            return response
+        if settings.SQL_SERVER_TIMING:
+            timing = response.get("Server-Timing")
+            response["Server-Timing"] = f"{timing}, {recorder.server_timing()}" if timing else recorder.server_timing()
+        query_logger.info(
+            f"{request.method} {request.path} {response.status_code}: {recorder.count} queries "
+            f"in {recorder.duration * 1000:.1f} ms, {recorder.repeated} repeated"
+        )
+        for shape, count in recorder.over_threshold():
+            query_logger.warning(f"{request.method} {request.path} ran the same query {count} times: {shape}")
+        return response
@@ -0,0 +1,120 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination keyed on a composite, unique ordering such as `(start_time, id)`.
+
+    DRF's `CursorPagination` only seeks on the first ordering field and falls back to
+    OFFSET for ties. Because the last ordering field here is always the primary key,
+    every position is unique, so each page is a single index range scan no matter
+    how deep the client has paged.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    position_separator = "|"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        # A trailing primary key makes every position unique.
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering.append("-id" if ordering[-1].startswith("-") else "id")
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        current_position = self.cursor.position if self.cursor else None
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            values = self._decode_position(queryset.model, current_position)
+            queryset = queryset.filter(self._seek_filter(values, reverse))
+
+        # Always fetch one extra row to find out whether another page follows.
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_more = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = current_position is not None
+
+        self.next_position = self.previous_position = current_position
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering) if self.page else self.next_position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering) if self.page else self.previous_position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            name = field.lstrip("-")
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else str(value))
+        return self.position_separator.join(values)
+
+    def _decode_position(self, model, position):
+        raw_values = position.split(self.position_separator)
+        if len(raw_values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        values = []
+        for field, raw in zip(self.ordering, raw_values):
+            name = field.lstrip("-")
+            model_field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+            try:
+                values.append(model_field.to_python(raw))
+            except DjangoValidationError:
+                raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def _seek_filter(self, values, reverse):
+        """
+        Build `(a, b) < (x, y)` as `a <= x AND (a < x OR b < y)` so the leading
+        column bounds the index scan on every backend.
+        """
+        condition = None
+        for field, value in reversed(list(zip(self.ordering, values))):
+            name = field.lstrip("-")
+            # Descending fields seek downwards unless the cursor walks backwards.
+            op = "lt" if field.startswith("-") != reverse else "gt"
+            strict = Q(**{f"{name}__{op}": value})
+            if condition is None:
+                condition = strict
+            else:
+                condition = Q(**{f"{name}__{op}e": value}) & (strict | condition)
+        return condition
@@ -0,0 +1,41 @@
+"""
+Django's PostgreSQL backend, timing how long requests hold pooled connections.
+
+psycopg_pool only measures that for its own `connection()` context manager, not
+for the `getconn()`/`putconn()` calls Django makes, so its `usage_ms` statistic
+stays at zero. `pop_checkout_stats()` supplies it instead (see `config/db.py`).
+"""
+import threading
+import time
+from collections import Counter
+
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    _checkout_stats = Counter()
+    _checkout_lock = threading.Lock()
+    _checked_out_at = None
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        if self.pool:
+            self._checked_out_at = time.monotonic()
+        return connection
+
+    def _close(self):
+        checked_out_at, self._checked_out_at = self._checked_out_at, None
+        try:
+            return super()._close()
+        finally:
+            if checked_out_at is not None:
+                held_ms = int((time.monotonic() - checked_out_at) * 1000)
+                with self._checkout_lock:
+                    self._checkout_stats["usage_ms"] += held_ms
+
+    @classmethod
+    def pop_checkout_stats(cls) -> dict[str, int]:
+        with cls._checkout_lock:
+            stats = dict(cls._checkout_stats)
+            cls._checkout_stats.clear()
+        return stats
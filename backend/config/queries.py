@@ -0,0 +1,80 @@
+"""
+Per-request SQL accounting for `config.middleware.QueryInstrumentationMiddleware`.
+
+`QueryRecorder` is installed with `connection.execute_wrapper` around a request and
+counts every query, its time, and how often each query *shape* ran. The shape is
+the SQL with its literals and placeholders collapsed, so `WHERE id = %s` run for
+fifty different ids, or an `IN (...)` of any length, count as one shape run fifty
+times: the N+1 pattern.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+_IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+class RepeatedQueryError(Exception):
+    """The same query shape ran more than `SQL_REPEAT_THRESHOLD` times in one request (strict mode)."""
+
+
+def query_shape(sql: str) -> str:
+    sql = _IN_LIST.sub("(%s, ...)", sql)
+    sql = _STRING.sub("%s", sql)
+    return _NUMBER.sub("%s", sql)
+
+
+class QueryRecorder:
+    def __init__(self, threshold: int, strict: bool = False):
+        self.threshold = threshold
+        self.strict = strict
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = query_shape(sql)
+        self.shapes[shape] += 1
+        if self.strict and self.shapes[shape] > self.threshold:
+            raise RepeatedQueryError(f"Query ran {self.shapes[shape]} times in one request: {shape}")
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+    @property
+    def repeated(self) -> int:
+        """Queries that repeated a shape already run in this request."""
+        return sum(n - 1 for n in self.shapes.values())
+
+    def over_threshold(self):
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > self.threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries, {self.repeated} repeated"'
+
+    def install(self):
+        """Start recording on the current thread's connections (they are thread-local)."""
+        self._wrappers = ExitStack()
+        for connection in connections.all():
+            self._wrappers.enter_context(connection.execute_wrapper(self))
+
+    def uninstall(self):
+        self._wrappers.close()
+
+
+@contextmanager
+def record_queries(threshold: int, strict: bool = False):
+    recorder = QueryRecorder(threshold, strict)
+    recorder.install()
+    try:
+        yield recorder
+    finally:
+        recorder.uninstall()
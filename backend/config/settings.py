@@ -33,6 +33,8 @@ _load_env_file(BASE_DIR.parent / ".env")
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY", "change-me")
 DEBUG = os.getenv("DJANGO_DEBUG", "1") == "1"
 ALLOWED_HOSTS = [h.strip() for h in os.getenv("DJANGO_ALLOWED_HOSTS", "*").split(",") if h.strip()]
+# "asgi" when served by uvicorn (see docker-entrypoint.sh): payment and login endpoints then use async views.
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -46,11 +48,14 @@ INSTALLED_APPS = [
     "users",
     "sessions.apps.SessionsConfig",
     "bookings",
+    "jobs",
+    "ratelimit",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "config.middleware.WhiteNoiseMiddleware",
+    "config.middleware.QueryInstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -82,22 +87,108 @@ WSGI_APPLICATION = "config.wsgi.application"
 if os.getenv("POSTGRES_HOST"):
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.postgresql",
+            # Django's backend plus checkout timing for the pool metrics.
+            "ENGINE": "config.postgresql",
             "NAME": os.getenv("POSTGRES_DB", "postgres"),
             "USER": os.getenv("POSTGRES_USER", "postgres"),
             "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
             "HOST": os.getenv("POSTGRES_HOST", "postgres"),
             "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            # Check a reused connection is still alive before handing it to a request.
+            "CONN_HEALTH_CHECKS": True,
         }
     }
+    if os.getenv("DB_POOL", "1") == "1":
+        # Each process keeps up to DB_POOL_MAX_SIZE connections open and lends them to requests,
+        # so Postgres sees at most (web workers + job workers) * DB_POOL_MAX_SIZE connections.
+        # Pool statistics are exported on /metrics (see config/db.py).
+        DATABASES["default"]["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "4")),
+                # Seconds a request waits for a free connection before failing.
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+                "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+                "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+            },
+        }
+    else:
+        # Without the pool, keep each thread's connection open between requests instead.
+        DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
 else:
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "OPTIONS": {
+                # Take the write lock at BEGIN so concurrent bookings queue instead of deadlocking.
+                "transaction_mode": "IMMEDIATE",
+                "timeout": 20,
+            },
+        }
+    }
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    # Per-process only; set REDIS_URL so gunicorn workers share one cache.
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         }
     }
 
+# Store for the API throttles (see ratelimit/stores.py): "redis", "database" or "cache".
+# Without Redis the counters go to the database so every worker enforces the same limit;
+# "cache" on the per-process LocMem cache would let N workers admit N times the rate.
+THROTTLE_STORE = os.getenv("THROTTLE_STORE", "redis" if REDIS_URL else "database")
+THROTTLE_REDIS_URL = os.getenv("THROTTLE_REDIS_URL", REDIS_URL)
+
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", "300"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# Seconds between copies of a process's connection pool statistics into the shared metrics.
+DB_POOL_STATS_INTERVAL = float(os.getenv("DB_POOL_STATS_INTERVAL", "10"))
+
+# Per-request SQL accounting (see config/middleware.py QueryInstrumentationMiddleware)
+SQL_SERVER_TIMING = os.getenv("SQL_SERVER_TIMING", "1" if DEBUG else "0") == "1"
+# A query shape repeated more often than this in one request is logged as N+1 ...
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+# ... or raises RepeatedQueryError when strict mode is on (development and CI).
+SQL_STRICT = os.getenv("SQL_STRICT", "0") == "1"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "config.queries": {
+            "handlers": ["console"],
+            "level": os.getenv("SQL_LOG_LEVEL", "INFO" if DEBUG else "WARNING"),
+            "propagate": False,
+        },
+    },
+}
+
+# Background jobs (see jobs/queue.py and `manage.py runworker`)
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "4"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))
+# Leases are not renewed: keep this above the longest a job handler can run.
+JOBS_LEASE_SECONDS = int(os.getenv("JOBS_LEASE_SECONDS", "300"))
+JOBS_RETRY_BASE_DELAY = float(os.getenv("JOBS_RETRY_BASE_DELAY", "10"))
+JOBS_RETRY_MAX_DELAY = float(os.getenv("JOBS_RETRY_MAX_DELAY", "3600"))
+# Finished jobs are deleted after this many days; runworker prunes every JOBS_PRUNE_INTERVAL seconds.
+JOBS_KEEP_SUCCEEDED_DAYS = float(os.getenv("JOBS_KEEP_SUCCEEDED_DAYS", "7"))
+JOBS_KEEP_DEAD_DAYS = float(os.getenv("JOBS_KEEP_DEAD_DAYS", "30"))
+JOBS_PRUNE_INTERVAL = float(os.getenv("JOBS_PRUNE_INTERVAL", "3600"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -120,13 +211,16 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
+    # The cached variant needs the shared cache to see saves made by other workers.
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication"
+        if REDIS_URL
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "ratelimit.throttling.AnonRateThrottle",
+        "ratelimit.throttling.UserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/hour",
@@ -141,6 +235,13 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+
+# Per-process cache of JWT users (see users/authentication.py), used only with REDIS_URL. Saves
+# invalidate entries in every worker through the shared cache; the TTL bounds a missed invalidation.
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "300"))
+
+
 def _parse_cors_origins(origins_str: str) -> list[str]:
     """Parse CORS origins, stripping any paths from URLs."""
     from urllib.parse import urlparse
@@ -186,14 +287,22 @@ SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 SECURE_CROSS_ORIGIN_OPENER_POLICY = "same-origin-allow-popups"
 
 GOOGLE_OAUTH_CLIENT_ID = os.getenv("GOOGLE_OAUTH_CLIENT_ID", "")
+# Google's ID token signing certificates; point at a local fake (JWKS or {kid: PEM}) for testing.
+GOOGLE_OAUTH_CERTS_URL = os.getenv("GOOGLE_OAUTH_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
 
 GITHUB_OAUTH_CLIENT_ID = os.getenv("GITHUB_OAUTH_CLIENT_ID", "")
 GITHUB_OAUTH_CLIENT_SECRET = os.getenv("GITHUB_OAUTH_CLIENT_SECRET", "")
+# Overridable so logins can be exercised against a local stub (see `bench_github_login`).
+GITHUB_OAUTH_URL = os.getenv("GITHUB_OAUTH_URL", "https://github.com")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_PROFILE_CACHE_TTL = int(os.getenv("GITHUB_PROFILE_CACHE_TTL", "60"))
 
 
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
 STRIPE_PUBLISHABLE_KEY = os.getenv("STRIPE_PUBLISHABLE_KEY", "")
 STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
+# Override to point the payment views at a local stub (see the loadtest command).
+STRIPE_API_BASE = os.getenv("STRIPE_API_BASE", "https://api.stripe.com")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
 USE_S3 = os.getenv("USE_S3", "0") == "1"
@@ -215,6 +324,9 @@ if USE_S3:
     AWS_DEFAULT_ACL = "public-read"
 else:
     STORAGES = {
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+        },
         "staticfiles": {
             "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
         }
@@ -0,0 +1,96 @@
+"""
+Sparse fieldsets (`?fields=`) and relation expansion (`?expand=`) for read endpoints.
+
+`?fields=id,title` keeps only those keys; dotted names reach into nested serializers
+(`?fields=id,status,session.title`). `?expand=` lists the relations to nest in full;
+once it is present, unlisted relations collapse to their primary key. Without
+`?expand=` every relation is nested as before.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _split(value: str) -> list[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _query_params(request):
+    return getattr(request, "query_params", getattr(request, "GET", {}))
+
+
+def requested_fields(request, path: str = "") -> set[str] | None:
+    """Field names requested at `path` (`""` for the top level), or None when unrestricted."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    raw = _query_params(request).get("fields")
+    if not raw:
+        return None
+
+    prefix = f"{path}." if path else ""
+    names = set()
+    for name in _split(raw):
+        if path and name == path:
+            # The whole relation was asked for.
+            return None
+        if name.startswith(prefix):
+            names.add(name[len(prefix):].split(".", 1)[0])
+    return names or None
+
+
+def is_expanded(request, path: str) -> bool:
+    if request is None:
+        return True
+    raw = _query_params(request).get("expand")
+    if raw is None:
+        return True
+    return path in _split(raw)
+
+
+def only_columns(model, fields, sources=None, prefix: str = "") -> list[str]:
+    """
+    Translate serializer field names into `QuerySet.only()` paths. `sources` maps
+    computed fields (e.g. `image_url`) to the model columns they read.
+    """
+    sources = sources or {}
+    columns = [f"{prefix}{model._meta.pk.name}"]
+    for name in fields:
+        for column in sources.get(name, (name,)):
+            try:
+                model._meta.get_field(column)
+            except FieldDoesNotExist:
+                continue
+            columns.append(f"{prefix}{column}")
+    return columns
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin that prunes fields according to `?fields=` / `?expand=` on the
+    request in the serializer context. `Meta.expandable_fields` names the nested
+    relations that may collapse to a primary key. Only safe methods are affected.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+
+        for name in getattr(self.Meta, "expandable_fields", ()):
+            if name in fields and not is_expanded(request, self._field_path(name)):
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+        keep = requested_fields(request, self._field_path())
+        if keep is not None:
+            for name in list(fields):
+                if name not in keep:
+                    fields.pop(name)
+        return fields
+
+    def _field_path(self, name: str = "") -> str:
+        names = [name] if name else []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.insert(0, node.field_name)
+            node = node.parent
+        return ".".join(names)
@@ -2,11 +2,16 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
-from rest_framework import throttling
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from ratelimit import throttling
+
+from . import db  # noqa: F401  (exports connection pool statistics)
+from .metrics import metrics_view
+
 
 class TokenObtainPairThrottle(throttling.AnonRateThrottle):
+    scope = "token"
     rate = "5/minute"
 
 
@@ -21,6 +26,7 @@ urlpatterns = [
     path("api/users/", include("users.urls")),
     path("api/sessions/", include("sessions.urls")),
     path("api/bookings/", include("bookings.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 if settings.DEBUG:
@@ -20,9 +20,27 @@ print("Postgres is reachable")
 PY
 fi
 
+# Extra arguments run a management command instead of the web server, e.g. `runworker`.
+# The web container applies migrations; the worker retries until they are in place.
+if [ "$#" -gt 0 ]; then
+  exec python manage.py "$@"
+fi
+
 python manage.py migrate --noinput
 python manage.py collectstatic --noinput
 
+# SERVER_MODE=asgi serves the app with uvicorn: the payment and login endpoints then
+# await Stripe/Google/GitHub instead of tying up a worker for the whole call.
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+  exec uvicorn config.asgi:application \
+    --host 0.0.0.0 \
+    --port 8000 \
+    --workers ${UVICORN_WORKERS:-${GUNICORN_WORKERS:-3}} \
+    --proxy-headers \
+    --forwarded-allow-ips "*" \
+    --no-access-log
+fi
+
 exec gunicorn config.wsgi:application \
   --bind 0.0.0.0:8000 \
   --workers ${GUNICORN_WORKERS:-3} \
@@ -0,0 +1,19 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "task", "status", "attempts", "max_attempts", "run_at", "locked_by", "finished_at")
+    list_filter = ("status", "task")
+    search_fields = ("task", "last_error")
+    actions = ("requeue",)
+
+    @admin.action(description="Requeue selected jobs")
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status=Job.Status.RUNNING).update(
+            status=Job.Status.QUEUED, attempts=0, run_at=timezone.now(), locked_until=None, finished_at=None
+        )
+        self.message_user(request, f"Requeued {updated} job(s).")
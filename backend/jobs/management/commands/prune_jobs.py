@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.queue import prune_finished
+
+
+class Command(BaseCommand):
+    help = (
+        f'Delete SUCCEEDED jobs older than JOBS_KEEP_SUCCEEDED_DAYS ({settings.JOBS_KEEP_SUCCEEDED_DAYS:g}) and DEAD '
+        f'jobs older than JOBS_KEEP_DEAD_DAYS ({settings.JOBS_KEEP_DEAD_DAYS:g}). runworker also does this periodically.'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f'Pruned {prune_finished():,} finished job(s)'))
@@ -0,0 +1,127 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connection
+
+from config.db import publish_pool_stats
+from jobs.models import Job
+from jobs.queue import bury_abandoned, prune_finished, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the database queue until stopped (SIGINT/SIGTERM finish the jobs in flight)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.JOBS_CONCURRENCY,
+            help=f'Jobs run in parallel, one thread each (default: {settings.JOBS_CONCURRENCY})',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help=f'Seconds to wait when the queue is empty (default: {settings.JOBS_POLL_INTERVAL})',
+        )
+        parser.add_argument(
+            '--lease',
+            type=int,
+            default=settings.JOBS_LEASE_SECONDS,
+            help=(
+                f'Seconds before a job held by a crashed worker is retried; must exceed the longest job '
+                f'(default: {settings.JOBS_LEASE_SECONDS})'
+            ),
+        )
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is runnable instead of polling')
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self._request_stop)
+            signal.signal(signal.SIGTERM, self._request_stop)
+
+        name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout.write(f'Worker {name} running {options["concurrency"]} thread(s) against {connection.vendor}')
+        pool = connection.settings_dict.get('OPTIONS', {}).get('pool')
+        if isinstance(pool, dict) and pool.get('max_size', options['concurrency']) < options['concurrency']:
+            self.stdout.write(self.style.WARNING(
+                f'DB_POOL_MAX_SIZE ({pool.get("max_size")}) is below --concurrency; threads will queue for connections'
+            ))
+        threads = [
+            threading.Thread(target=self._loop, args=(f'{name}:{i}', options), name=f'runworker-{i}')
+            for i in range(max(options['concurrency'], 1))
+        ]
+        for thread in threads:
+            thread.start()
+        # Jobs abandoned on their last attempt are never claimed again, so sweeping them once
+        # per lease period is enough and keeps the UPDATE out of every claim poll.
+        self._bury()
+        next_bury = time.monotonic() + options['lease']
+        next_prune = time.monotonic()
+        for thread in threads:
+            # join() with a timeout keeps the main thread responsive to signals.
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+                if time.monotonic() >= next_bury:
+                    next_bury = time.monotonic() + options['lease']
+                    self._bury()
+                if time.monotonic() >= next_prune and not options['burst']:
+                    next_prune = time.monotonic() + settings.JOBS_PRUNE_INTERVAL
+                    self._prune()
+
+        self.stdout.write(self.style.SUCCESS(f'Worker {name} stopped'))
+
+    def _bury(self):
+        try:
+            bury_abandoned()
+        except DatabaseError as e:
+            self.stderr.write(f'Could not dead-letter abandoned jobs: {e}')
+        finally:
+            connection.close()
+
+    def _prune(self):
+        try:
+            pruned = prune_finished()
+        except DatabaseError as e:
+            self.stderr.write(f'Could not prune finished jobs: {e}')
+            return
+        finally:
+            connection.close()
+        if pruned:
+            self.stdout.write(f'Pruned {pruned:,} finished job(s)')
+
+    def _request_stop(self, signum, frame):
+        self.stdout.write(f'Received signal {signum}, finishing jobs in flight...')
+        self.stop.set()
+
+    def _loop(self, worker, options):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                publish_pool_stats()
+                try:
+                    job = Job.objects.claim(worker, options['lease'])
+                except DatabaseError as e:
+                    # e.g. migrations not applied yet, or the database restarting.
+                    self.stderr.write(f'{worker}: could not claim a job: {e}')
+                    self.stop.wait(options['poll_interval'])
+                    continue
+
+                if job is None:
+                    if options['burst']:
+                        return
+                    self.stop.wait(options['poll_interval'])
+                    continue
+
+                if run_job(job):
+                    self.stdout.write(f'{worker}: {job} succeeded')
+                else:
+                    self.stdout.write(self.style.WARNING(f'{worker}: {job} failed (attempt {job.attempts})'))
+        finally:
+            connection.close()
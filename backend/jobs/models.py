@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.db import connection, models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+PRUNE_BATCH_SIZE = 1000
+
+
+class JobQuerySet(models.QuerySet):
+    def runnable(self, now=None):
+        """Queued jobs that are due, plus running jobs with attempts left whose worker let the lease expire."""
+        now = now or timezone.now()
+        return self.filter(
+            Q(status=Job.Status.QUEUED, run_at__lte=now)
+            | Q(status=Job.Status.RUNNING, locked_until__lt=now, attempts__lt=F("max_attempts"))
+        )
+
+    def bury_abandoned(self, now=None) -> int:
+        """
+        Dead-letter running jobs whose lease expired on their last attempt: the worker died
+        (or hung) running them, so `run_job` never got to record the failure. Returns how many.
+        """
+        now = now or timezone.now()
+        return self.filter(status=Job.Status.RUNNING, locked_until__lt=now, attempts__gte=F("max_attempts")).update(
+            status=Job.Status.DEAD,
+            locked_until=None,
+            finished_at=now,
+            last_error="Lease expired during the last attempt (the worker crashed, was killed or hung).",
+        )
+
+    def prune(self, succeeded_before, dead_before) -> int:
+        """
+        Delete SUCCEEDED jobs finished before `succeeded_before` and DEAD ones finished before
+        `dead_before`, a batch at a time so the table is never locked for long. Returns how many.
+        """
+        finished = Q(status=Job.Status.SUCCEEDED, finished_at__lt=succeeded_before) | Q(
+            status=Job.Status.DEAD, finished_at__lt=dead_before
+        )
+        deleted = 0
+        while True:
+            batch = list(self.filter(finished).values_list("id", flat=True)[:PRUNE_BATCH_SIZE])
+            if not batch:
+                return deleted
+            deleted += self.filter(pk__in=batch).delete()[0]
+
+    def claim(self, worker: str, lease_seconds: int):
+        """
+        Take the next runnable job for `worker` and return it, or None when the queue is idle.
+
+        On backends with `SELECT ... FOR UPDATE SKIP LOCKED` (Postgres) concurrent workers skip
+        rows another worker is claiming instead of queueing behind its lock. Elsewhere (SQLite)
+        the claim is a conditional UPDATE on the lease: only one worker's UPDATE can match.
+        """
+        now = timezone.now()
+        claim = {
+            "status": Job.Status.RUNNING,
+            "locked_by": worker,
+            "locked_until": now + timedelta(seconds=lease_seconds),
+            "attempts": F("attempts") + 1,
+        }
+        candidates = self.runnable(now).order_by("run_at", "id")
+
+        if connection.features.has_select_for_update_skip_locked:
+            with transaction.atomic():
+                job_id = candidates.select_for_update(skip_locked=True).values_list("id", flat=True).first()
+                if job_id is None:
+                    return None
+                self.filter(pk=job_id).update(**claim)
+        else:
+            for job_id in candidates.values_list("id", flat=True)[:5]:
+                if self.runnable(now).filter(pk=job_id).update(**claim):
+                    break
+            else:
+                return None
+        return self.get(pk=job_id)
+
+
+class Job(models.Model):
+    """A unit of background work, run by `manage.py runworker`."""
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "QUEUED"
+        RUNNING = "RUNNING", "RUNNING"
+        SUCCEEDED = "SUCCEEDED", "SUCCEEDED"
+        DEAD = "DEAD", "DEAD"
+
+    task = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now, help_text="Not picked up before this time (retry backoff)")
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True, help_text="Lease; another worker may retake the job after it")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk}"
@@ -0,0 +1,136 @@
+"""
+Database-backed job queue.
+
+Apps declare work with `@task` in their `tasks.py` and queue it with `enqueue()`.
+Jobs are rows in the default database, so enqueueing inside a transaction only
+makes the job visible to workers once that transaction commits. `manage.py
+runworker` claims and runs them; failures are retried with exponential backoff
+and end up DEAD after `max_attempts`.
+
+A claimed job is leased for JOBS_LEASE_SECONDS. If the worker dies (or hangs) the
+lease runs out and another worker retakes the job, counting it as an attempt; on
+its last attempt the job is dead-lettered instead, by the sweep each worker runs
+once per lease period (`bury_abandoned`). Leases are not renewed, so
+JOBS_LEASE_SECONDS must exceed the longest a handler can legitimately run, or a
+slow job gets run twice. Finished jobs are pruned after JOBS_KEEP_SUCCEEDED_DAYS
+(SUCCEEDED) and JOBS_KEEP_DEAD_DAYS (DEAD), see `prune_finished`.
+"""
+import logging
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.utils import timezone
+
+from config import metrics
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+SUCCEEDED_METRIC = "jobs_succeeded_total"
+RETRIED_METRIC = "jobs_retried_total"
+DEAD_METRIC = "jobs_dead_total"
+
+metrics.register(SUCCEEDED_METRIC, "Background jobs that finished successfully.")
+metrics.register(RETRIED_METRIC, "Background job attempts that failed and were scheduled again.")
+metrics.register(DEAD_METRIC, "Background jobs that exhausted their attempts (dead-lettered).")
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: Callable
+    max_attempts: int
+
+
+_registry: dict[str, Task] = {}
+
+
+def task(name: str, max_attempts: int = 5):
+    """Register `func` as the handler for jobs named `name`. Handlers receive the payload as kwargs."""
+
+    def decorator(func):
+        _registry[name] = Task(name, func, max_attempts)
+        return func
+
+    return decorator
+
+
+def enqueue(name: str, delay: float = 0, **payload) -> Job:
+    """Queue a registered task. `payload` must be JSON serialisable."""
+    if name not in _registry:
+        raise ValueError(f"Unknown task {name!r}")
+    return Job.objects.create(
+        task=name,
+        payload=payload,
+        max_attempts=_registry[name].max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter: ~base, 2*base, 4*base... capped at JOBS_RETRY_MAX_DELAY."""
+    delay = min(settings.JOBS_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.JOBS_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def run_job(job: Job) -> bool:
+    """
+    Run a job claimed by `job.locked_by`. Returns True on success. The result is only
+    recorded while the worker still holds the lease, so a job retaken by another worker
+    after a lease expiry is not overwritten.
+    """
+    owned = Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, locked_by=job.locked_by)
+    registered = _registry.get(job.task)
+    try:
+        if registered is None:
+            raise LookupError(f"No handler registered for task {job.task!r}")
+        registered.func(**job.payload)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if job.attempts >= job.max_attempts or registered is None:
+            logger.exception(f"Job {job} failed permanently after {job.attempts} attempt(s)")
+            owned.update(status=Job.Status.DEAD, last_error=error, locked_until=None, finished_at=timezone.now())
+            metrics.incr(DEAD_METRIC)
+        else:
+            delay = retry_delay(job.attempts)
+            logger.warning(f"Job {job} failed (attempt {job.attempts}/{job.max_attempts}), retrying in {delay:.0f}s: {error}")
+            owned.update(
+                status=Job.Status.QUEUED,
+                last_error=error,
+                locked_until=None,
+                run_at=timezone.now() + timedelta(seconds=delay),
+            )
+            metrics.incr(RETRIED_METRIC)
+        return False
+
+    finished = timezone.now()
+    if job.locked_until and finished > job.locked_until:
+        logger.warning(
+            f"Job {job} ran past its lease ({(finished - job.locked_until).total_seconds():.0f}s over); another "
+            f"worker may have run it again. Raise JOBS_LEASE_SECONDS above the handler's longest run."
+        )
+    owned.update(status=Job.Status.SUCCEEDED, locked_until=None, finished_at=finished)
+    metrics.incr(SUCCEEDED_METRIC)
+    return True
+
+
+def bury_abandoned() -> int:
+    """Dead-letter jobs whose lease expired on their last attempt, see `JobQuerySet.bury_abandoned`."""
+    buried = Job.objects.bury_abandoned()
+    if buried:
+        logger.error(f"Dead-lettered {buried} job(s) whose lease expired on their last attempt")
+        metrics.incr(DEAD_METRIC, buried)
+    return buried
+
+
+def prune_finished() -> int:
+    """Delete finished jobs older than their retention (JOBS_KEEP_SUCCEEDED_DAYS / JOBS_KEEP_DEAD_DAYS)."""
+    now = timezone.now()
+    return Job.objects.prune(
+        succeeded_before=now - timedelta(days=settings.JOBS_KEEP_SUCCEEDED_DAYS),
+        dead_before=now - timedelta(days=settings.JOBS_KEEP_DEAD_DAYS),
+    )
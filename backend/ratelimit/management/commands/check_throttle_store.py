@@ -0,0 +1,54 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ratelimit.stores import CacheStore, DatabaseStore, RedisStore, get_store
+
+
+class Command(BaseCommand):
+    help = 'Hammer one throttle key from many threads and verify the store never admits more than the limit'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--store', choices=['cache', 'database', 'redis'], help='Store to check (default: THROTTLE_STORE)')
+        parser.add_argument('--redis-url', help='Redis-protocol server for --store redis (default: THROTTLE_REDIS_URL)')
+        parser.add_argument('--limit', type=int, default=100, help='Requests allowed per window (default: 100)')
+        parser.add_argument('--requests', type=int, default=1000, help='Requests to fire (default: 1000)')
+        parser.add_argument('--threads', type=int, default=16, help='Concurrent clients (default: 16)')
+
+    def handle(self, *args, **options):
+        if options['store'] == 'cache':
+            store = CacheStore()
+        elif options['store'] == 'database':
+            store = DatabaseStore(prune_probability=0)
+        elif options['store'] == 'redis':
+            store = RedisStore(url=options['redis_url'])
+        else:
+            store = get_store()
+
+        limit = options['limit']
+        # A window far longer than the run, so every request lands in the same one.
+        period = 86400
+        window = int(time.time() // period)
+        key = f'check-{uuid.uuid4().hex}'
+
+        def request(_):
+            count, previous = store.hit(key, window, period)
+            if count + previous > limit:
+                store.undo(key, window)
+                return False
+            return True
+
+        self.stdout.write(f'{options["requests"]} requests, limit {limit}, {options["threads"]} threads '
+                          f'against {type(store).__name__}...')
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+            allowed = sum(pool.map(request, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f'Allowed {allowed}, throttled {options["requests"] - allowed} in {elapsed:.2f}s '
+                          f'({options["requests"] / elapsed:,.0f} checks/s)')
+        if allowed != min(limit, options['requests']):
+            raise CommandError(f'Expected exactly {min(limit, options["requests"])} allowed requests')
+        self.stdout.write(self.style.SUCCESS('Store admitted exactly the limit.'))
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class RateCounter(models.Model):
+    """
+    Sliding-window counter state for one throttle key: hits in the current fixed
+    window and in the one before it. Written by `DatabaseStore` with a single upsert.
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    window = models.BigIntegerField(help_text="Index of the current window (unix time // period)")
+    count = models.PositiveIntegerField(default=0)
+    previous_count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.key
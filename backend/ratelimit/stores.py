@@ -0,0 +1,144 @@
+"""
+Shared counter stores for the sliding-window throttles.
+
+Each store keeps O(1) state per throttle key: the hit count of the current fixed
+window and of the previous one. `hit()` atomically records a hit and returns both
+counts, so every gunicorn worker and host sees the same numbers.
+
+- `DatabaseStore`: one `ratelimit_ratecounter` row per key, updated with a single
+  `INSERT ... ON CONFLICT DO UPDATE ... RETURNING` (PostgreSQL, SQLite >= 3.35).
+- `RedisStore`: two integer keys per throttle key, updated in one MULTI/EXEC round
+  trip using only INCR/DECR/GET/EXPIRE, so any Redis-protocol server works
+  (Redis, Valkey, KeyDB, Dragonfly, or a local stand-in).
+- `CacheStore`: the same two counters in Django's default cache. Shared when that is
+  Redis or Memcached; on the LocMem fallback every process counts on its own, so it
+  is only used when `THROTTLE_STORE=cache` asks for it.
+"""
+import random
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import F
+from django.utils.module_loading import import_string
+
+from .models import RateCounter
+
+# Share of hits that also delete expired rows, keeping the table at the number of active keys.
+PRUNE_PROBABILITY = 0.001
+
+
+class DatabaseStore:
+    def __init__(self, prune_probability: float = PRUNE_PROBABILITY):
+        self.prune_probability = prune_probability
+        # `window` and `key` are SQL keywords, so every identifier is quoted. SET expressions
+        # read the old row, which lets one statement roll the window over.
+        q = connection.ops.quote_name
+        table, key, window, count, previous = (
+            q(RateCounter._meta.db_table), q("key"), q("window"), q("count"), q("previous_count")
+        )
+        self._hit_sql = f"""
+            INSERT INTO {table} ({key}, {window}, {count}, {previous}, {q("expires_at")})
+            VALUES (%s, %s, 1, 0, %s)
+            ON CONFLICT ({key}) DO UPDATE SET
+                {previous} = CASE
+                    WHEN {table}.{window} = excluded.{window} THEN {table}.{previous}
+                    WHEN {table}.{window} = excluded.{window} - 1 THEN {table}.{count}
+                    ELSE 0
+                END,
+                {count} = CASE WHEN {table}.{window} = excluded.{window} THEN {table}.{count} + 1 ELSE 1 END,
+                {window} = excluded.{window},
+                {q("expires_at")} = excluded.{q("expires_at")}
+            RETURNING {count}, {previous}
+        """
+
+    def hit(self, key: str, window: int, period: int) -> tuple[int, int]:
+        """Record a hit in `window` and return `(current_count, previous_count)`."""
+        # The row is useful until the window after `window` has ended.
+        expires_at = datetime.fromtimestamp((window + 2) * period, tz=dt_timezone.utc)
+        with connection.cursor() as cursor:
+            cursor.execute(self._hit_sql, [key, window, expires_at])
+            count, previous_count = cursor.fetchone()
+        if random.random() < self.prune_probability:
+            self.prune()
+        return count, previous_count
+
+    def undo(self, key: str, window: int) -> None:
+        """Take back a hit that was rejected, so denied requests don't extend the block."""
+        RateCounter.objects.filter(key=key, window=window, count__gt=0).update(count=F("count") - 1)
+
+    def prune(self) -> int:
+        return RateCounter.objects.filter(expires_at__lt=datetime.now(tz=dt_timezone.utc)).delete()[0]
+
+    def clear(self) -> None:
+        RateCounter.objects.all().delete()
+
+
+class RedisStore:
+    def __init__(self, url: str = None, key_prefix: str = "throttle:", client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url or settings.THROTTLE_REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def _key(self, key: str, window: int) -> str:
+        return f"{self.key_prefix}{key}:{window}"
+
+    def hit(self, key: str, window: int, period: int) -> tuple[int, int]:
+        current = self._key(key, window)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.incr(current)
+        pipe.expire(current, period * 2)
+        pipe.get(self._key(key, window - 1))
+        count, _, previous_count = pipe.execute()
+        return int(count), int(previous_count or 0)
+
+    def undo(self, key: str, window: int) -> None:
+        self.client.decr(self._key(key, window))
+
+    def clear(self) -> None:
+        for name in self.client.scan_iter(match=f"{self.key_prefix}*"):
+            self.client.delete(name)
+
+
+class CacheStore:
+    def __init__(self, alias: str = "default", key_prefix: str = "throttle:"):
+        self.cache = caches[alias]
+        self.key_prefix = key_prefix
+
+    def _key(self, key: str, window: int) -> str:
+        return f"{self.key_prefix}{key}:{window}"
+
+    def hit(self, key: str, window: int, period: int) -> tuple[int, int]:
+        current = self._key(key, window)
+        # add() leaves an existing counter alone; incr() is atomic in every backend.
+        self.cache.add(current, 0, timeout=period * 2)
+        try:
+            count = self.cache.incr(current)
+        except ValueError:
+            # Evicted between the two calls: start the window again.
+            self.cache.set(current, 1, timeout=period * 2)
+            count = 1
+        return count, self.cache.get(self._key(key, window - 1), 0)
+
+    def undo(self, key: str, window: int) -> None:
+        try:
+            self.cache.decr(self._key(key, window))
+        except ValueError:
+            pass
+
+
+_store = None
+
+
+def get_store():
+    """The process-wide store named by `THROTTLE_STORE`: "cache", "database", "redis" or a dotted class path."""
+    global _store
+    if _store is None:
+        name = settings.THROTTLE_STORE
+        store_class = {"cache": CacheStore, "database": DatabaseStore, "redis": RedisStore}.get(name) or import_string(name)
+        _store = store_class()
+    return _store
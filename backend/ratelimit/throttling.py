@@ -0,0 +1,75 @@
+"""
+Drop-in replacements for DRF's rate throttles backed by a shared store.
+
+DRF's throttles keep a list of request timestamps per client in the default cache,
+which is per-process unless a shared cache is configured, and grows with the rate.
+These use a sliding window counter instead: the hit counts of the current and the
+previous fixed window, weighted by how far into the current window we are. That is
+O(1) state and one round trip per request, in a store every worker shares (see
+`ratelimit.stores`).
+"""
+import logging
+
+from rest_framework import throttling
+
+from .stores import get_store
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowMixin:
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        self.window = int(self.now // self.duration)
+        store = get_store()
+        try:
+            self.count, self.previous_count = store.hit(self.key, self.window, self.duration)
+        except Exception as e:
+            # An unavailable store must not take the API down with it.
+            logger.warning(f"Throttle store unavailable, allowing request: {e}")
+            return True
+
+        if self._estimate() > self.num_requests:
+            self.count -= 1
+            try:
+                store.undo(self.key, self.window)
+            except Exception as e:
+                logger.debug(f"Failed to undo throttled hit for {self.key}: {e}")
+            return self.throttle_failure()
+        return True
+
+    def _estimate(self) -> float:
+        elapsed = self.now - self.window * self.duration
+        return self.previous_count * (1 - elapsed / self.duration) + self.count
+
+    def wait(self):
+        """Seconds until one more request fits under the limit."""
+        elapsed = self.now - self.window * self.duration
+        room = self.num_requests - 1 - self.count
+        if room >= 0:
+            # The previous window's share decays linearly; wait until it leaves room.
+            if not self.previous_count:
+                return None
+            return max(self.duration * (1 - room / self.previous_count) - elapsed, 0)
+        # This window is full on its own: wait for the next one, then for its share to decay.
+        return self.duration - elapsed + self.duration * max(1 - (self.num_requests - 1) / self.count, 0)
+
+
+class AnonRateThrottle(SlidingWindowMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(SlidingWindowMixin, throttling.UserRateThrottle):
+    def get_cache_key(self, request, view):
+        # Anonymous requests are counted by AnonRateThrottle alone, at its lower rate,
+        # rather than once per scope.
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return super().get_cache_key(request, view)
@@ -6,4 +6,5 @@ from .models import Session
 @admin.register(Session)
 class SessionAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "creator", "price", "start_time")
+    list_select_related = ("creator",)
     search_fields = ("title", "creator__email")
@@ -1,7 +1,21 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _ensure_search_triggers(using, **kwargs):
+    from django.db import connections
+
+    from .search import ensure_sqlite_triggers
+
+    ensure_sqlite_triggers(connections[using])
 
 
 class SessionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "sessions"
     label = "app_sessions"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(_ensure_search_triggers, sender=self)
@@ -0,0 +1,134 @@
+"""
+Shared response cache for the public session catalog.
+
+Entries are keyed by a per-collection version counter. Every committed write to a
+`Session` bumps the counter (see `signals.py`), which orphans every cached list and
+detail response at once; orphaned entries simply expire.
+
+Detail entries are also keyed by a version of their own session. Bookings change
+only that session's seat and booking counters, so they bump just that version
+(`bump_session_version`) and leave the rest of the catalog cached; cached lists
+may show those counters up to CATALOG_CACHE_TIMEOUT seconds old.
+"""
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from config import metrics
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "sessions:collection-version"
+HITS_METRIC = "session_cache_hits_total"
+MISSES_METRIC = "session_cache_misses_total"
+
+metrics.register(HITS_METRIC, "Session list/detail responses served from the shared cache.")
+metrics.register(MISSES_METRIC, "Session list/detail responses that had to be built.")
+
+
+def _initial_version() -> int:
+    # Never restart from a small number after eviction, or stale entries would come back.
+    return time.time_ns() // 1000
+
+
+def collection_version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _initial_version(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_collection_version() -> None:
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, _initial_version(), timeout=None)
+
+
+def _session_version_key(session_id) -> str:
+    return f"sessions:session-version:{session_id}"
+
+
+def bump_session_version(session_id) -> None:
+    """Orphan the cached detail responses of one session, e.g. after a booking changed its counters."""
+    key = _session_version_key(session_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), timeout=None)
+
+
+def _version(session_id=None) -> str:
+    version = collection_version()
+    if session_id is None:
+        return str(version)
+    key = _session_version_key(session_id)
+    session_version = cache.get(key)
+    if session_version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        session_version = cache.get(key)
+    return f"{version}.{session_version}"
+
+
+def response_key(request, kind: str, version: str) -> str:
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    raw = f"{request.build_absolute_uri(request.path)}?{query}"
+    return f"sessions:v{version}:{kind}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def cached_value(request, kind: str, compute, session_id=None):
+    """
+    Memoize a small per-URL value (e.g. ETag validators) under the current collection
+    version (and, given `session_id`, that session's version).
+    """
+    try:
+        key = response_key(request, kind, _version(session_id))
+        value = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Session cache unavailable: {e}")
+        return compute()
+
+    if value is None:
+        value = compute()
+        _store(key, value)
+    return value
+
+
+def cached_response(request, kind: str, build, session_id=None):
+    """
+    Return the cached JSON body for this request, or call `build()` and store its
+    rendered body once the renderer has run. Only successful JSON GETs are cached.
+    Pass `session_id` for a single session's response, see `bump_session_version`.
+    """
+    if request.method != "GET" or getattr(request.accepted_renderer, "format", None) != "json":
+        return build()
+
+    try:
+        key = response_key(request, kind, _version(session_id))
+        content = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Session cache unavailable: {e}")
+        return build()
+
+    if content is not None:
+        metrics.incr(HITS_METRIC)
+        return HttpResponse(content, content_type="application/json")
+
+    metrics.incr(MISSES_METRIC)
+    response = build()
+    if response.status_code == 200 and hasattr(response, "add_post_render_callback"):
+        response.add_post_render_callback(lambda rendered: _store(key, rendered.content))
+    return response
+
+
+def _store(key: str, value) -> None:
+    try:
+        cache.set(key, value, settings.CATALOG_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Failed to store session cache entry: {e}")
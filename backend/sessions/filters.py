@@ -0,0 +1,92 @@
+from django.db import connection
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from rest_framework import filters, serializers
+
+
+class SessionQuerySerializer(serializers.Serializer):
+    """Validates the catalog query parameters accepted by `SessionFilter`."""
+
+    price_min = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    price_max = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    start_after = serializers.DateTimeField(required=False)
+    start_before = serializers.DateTimeField(required=False)
+    creator = serializers.IntegerField(required=False, min_value=1)
+    upcoming = serializers.BooleanField(required=False, default=False)
+
+
+class SessionFilter(filters.BaseFilterBackend):
+    """
+    Narrow the catalog by price range, start_time window, creator and
+    `upcoming=1` (sessions that have not started yet).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, "action", None) != "list":
+            return queryset
+
+        params = SessionQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        if "price_min" in data:
+            queryset = queryset.filter(price__gte=data["price_min"])
+        if "price_max" in data:
+            queryset = queryset.filter(price__lte=data["price_max"])
+        if "start_after" in data:
+            queryset = queryset.filter(start_time__gte=data["start_after"])
+        if "start_before" in data:
+            queryset = queryset.filter(start_time__lt=data["start_before"])
+        if "creator" in data:
+            queryset = queryset.filter(creator_id=data["creator"])
+        if data["upcoming"]:
+            queryset = queryset.filter(start_time__gte=timezone.now())
+        return queryset
+
+
+class SessionSearchFilter(filters.BaseFilterBackend):
+    """
+    Full-text search over `title` and `description` via `?search=`.
+
+    Postgres matches against the generated `search_vector` tsvector column (GIN
+    indexed), SQLite against the `app_sessions_session_fts` FTS5 table. Both are
+    created in migration 0004 and kept in sync by the database itself.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        if getattr(view, "action", None) != "list":
+            return queryset
+
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+
+        if connection.vendor == "postgresql":
+            return queryset.alias(
+                search_match=RawSQL(
+                    "app_sessions_session.search_vector @@ websearch_to_tsquery('english', %s)",
+                    (query,),
+                    output_field=BooleanField(),
+                )
+            ).filter(search_match=True)
+
+        if connection.vendor == "sqlite":
+            return queryset.filter(
+                id__in=RawSQL(
+                    "SELECT rowid FROM app_sessions_session_fts WHERE app_sessions_session_fts MATCH %s",
+                    (self._fts5_query(query),),
+                )
+            )
+
+        terms = Q()
+        for term in query.split():
+            terms &= Q(title__icontains=term) | Q(description__icontains=term)
+        return queryset.filter(terms)
+
+    @staticmethod
+    def _fts5_query(query):
+        # Quote every term so user input can never be parsed as FTS5 operators.
+        return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
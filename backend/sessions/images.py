@@ -0,0 +1,128 @@
+"""
+Resized variants of uploaded session images.
+
+Uploads are stored as-is and can be tens of megabytes. A background job
+(`sessions.generate_image_variants`) decodes the upload once, applies its EXIF
+orientation and writes WebP and JPEG copies at each width in `VARIANT_WIDTHS`
+with all EXIF metadata (camera, GPS...) dropped. `Session.image_variants`
+records them together with the upload they were made from, so stale variants
+are never served after the image is replaced.
+"""
+import io
+import logging
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from jobs.queue import enqueue
+
+from .cache import bump_collection_version
+from .models import Session
+
+logger = logging.getLogger(__name__)
+
+GENERATE_VARIANTS_TASK = "sessions.generate_image_variants"
+
+# Largest first: each variant is downscaled from the previous one.
+VARIANT_WIDTHS = {"hero": 1600, "card": 640, "thumb": 320}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+
+def schedule_variants(session: Session) -> None:
+    """Queue variant generation if the session's uploaded image has none yet."""
+    source = session.image_file.name if session.image_file else ""
+    if source and (session.image_variants or {}).get("source") != source:
+        enqueue(GENERATE_VARIANTS_TASK, session_id=session.pk, source=source)
+
+
+def current_variants(image_file_name: str, image_variants: dict) -> dict:
+    """The `{name: {width, height, webp, jpeg}}` storage names, if they belong to the current upload."""
+    if not image_file_name or not image_variants or image_variants.get("source") != image_file_name:
+        return {}
+    return image_variants.get("sizes", {})
+
+
+def variant_urls(sizes: dict, url) -> dict:
+    """Replace storage names with URLs built by `url(name)`."""
+    return {
+        name: {"width": size["width"], "height": size["height"], "webp": url(size["webp"]), "jpeg": url(size["jpeg"])}
+        for name, size in sizes.items()
+    }
+
+
+def srcset(urls: dict) -> str:
+    """An `<img srcset>` value over the WebP variants, narrowest first."""
+    return ", ".join(f"{v['webp']} {v['width']}w" for v in sorted(urls.values(), key=lambda v: v["width"]))
+
+
+def generate_variants(session_id: int, source: str) -> None:
+    session = Session.objects.filter(pk=session_id).only("id", "image_file", "image_variants").first()
+    if session is None or session.image_file.name != source:
+        # Deleted, or the image was replaced and a newer job will handle it.
+        return
+
+    storage = session.image_file.storage
+    try:
+        with storage.open(source, "rb") as fh:
+            image = Image.open(fh)
+            # Let the JPEG decoder downscale while decoding; a 6000px photo only needs 1600px.
+            image.draft("RGB", (max(VARIANT_WIDTHS.values()),) * 2)
+            image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logger.warning(f"Session {session_id} image {source} cannot be processed: {e}")
+        return
+
+    icc_profile = image.info.get("icc_profile")
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    stem = posixpath.splitext(posixpath.basename(source))[0]
+    directory = f"sessions/variants/{session_id}"
+    sizes, written = {}, []
+    for name, width in VARIANT_WIDTHS.items():
+        if image.width > width:
+            image = image.resize((width, max(round(image.height * width / image.width), 1)), Image.Resampling.LANCZOS)
+        size = {"width": image.width, "height": image.height}
+        for fmt, ext in (("webp", "webp"), ("jpeg", "jpg")):
+            stored = storage.save(f"{directory}/{stem}-{name}.{ext}", ContentFile(_encode(image, fmt, icc_profile)))
+            written.append(stored)
+            size[fmt] = stored
+        sizes[name] = size
+
+    updated = Session.objects.filter(pk=session_id, image_file=source).update(
+        image_variants={"source": source, "sizes": sizes}, updated_at=timezone.now()
+    )
+    if not updated:
+        _delete(storage, written)
+        return
+
+    previous = (session.image_variants or {}).get("sizes", {})
+    _delete(storage, [size[fmt] for size in previous.values() for fmt in ("webp", "jpeg")])
+    # QuerySet.update() skips the post_save signal that normally invalidates cached responses.
+    bump_collection_version()
+
+
+def _encode(image: Image.Image, fmt: str, icc_profile) -> bytes:
+    buffer = io.BytesIO()
+    # No `exif=` argument: Pillow only writes metadata it is explicitly given.
+    options = {"icc_profile": icc_profile} if icc_profile else {}
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4, **options)
+    else:
+        if image.mode == "RGBA":
+            flattened = Image.new("RGB", image.size, (255, 255, 255))
+            flattened.paste(image, mask=image.getchannel("A"))
+            image = flattened
+        image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True, **options)
+    return buffer.getvalue()
+
+
+def _delete(storage, names) -> None:
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.debug(f"Failed to delete image variant {name}: {e}")
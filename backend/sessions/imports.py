@@ -0,0 +1,117 @@
+"""
+Bulk session import from CSV or JSON Lines.
+
+Rows are read from the stream one line at a time, validated with the
+`SessionSerializer` rules a chunk at a time and inserted with one `bulk_create`
+per chunk, so memory stays bounded by the chunk size however long the file is.
+Each chunk commits on its own: valid rows are imported, invalid ones are reported
+by line number. Used by `POST /api/sessions/import/` and `manage.py import_sessions`.
+"""
+import codecs
+import csv
+import json
+
+from rest_framework.exceptions import ValidationError
+
+from .cache import bump_collection_version
+from .models import Session
+from .serializers import SessionSerializer
+
+CHUNK_SIZE = 1000
+# Only this many rows' errors are kept; the rest are counted.
+MAX_ERRORS = 100
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/x-jsonlines": "jsonl",
+}
+
+
+class ImportResult:
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {"created": self.created, "failed": self.failed, "dry_run": self.dry_run, "errors": self.errors}
+
+
+def decode_lines(lines):
+    """Text lines from an iterable of byte lines (a request or a binary file), UTF-8 with an optional BOM."""
+    return codecs.iterdecode(lines, "utf-8-sig")
+
+
+def csv_rows(lines):
+    """`(line, row, None)` per CSV record; the header row names the fields."""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        # Empty cells are left out, so optional columns fall back to their defaults.
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in ("", None)}, None
+
+
+def jsonl_rows(lines):
+    """`(line, row, None)` per JSON object, or `(line, None, error)` for a line that isn't one."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Expected a JSON object."
+            continue
+        yield number, row, None
+
+
+READERS = {"csv": csv_rows, "jsonl": jsonl_rows}
+
+
+def import_sessions(rows, creator, chunk_size=CHUNK_SIZE, dry_run=False, progress=None):
+    """
+    Create a session owned by `creator` for each valid row of `rows` (from `csv_rows`
+    or `jsonl_rows`). `progress`, if given, is called with the result after each chunk.
+    """
+    result = ImportResult(dry_run)
+    # One serializer validates every row, as ListSerializer does with its child.
+    serializer = SessionSerializer(context={})
+    chunk, line = [], 0
+    try:
+        for line, row, error in rows:
+            if error:
+                result.add_error(line, {"non_field_errors": [error]})
+                continue
+            try:
+                chunk.append(Session(creator=creator, **serializer.run_validation(row)))
+            except ValidationError as e:
+                result.add_error(line, e.detail)
+            if len(chunk) >= chunk_size:
+                _insert(chunk, result)
+                chunk = []
+                if progress:
+                    progress(result)
+    except (UnicodeDecodeError, csv.Error) as e:
+        # The stream can't be read past this point; the rows before it still count.
+        result.add_error(line + 1, {"non_field_errors": [f"Unreadable input, import stopped: {e}"]})
+    _insert(chunk, result)
+
+    if result.created and not dry_run:
+        # bulk_create sends no post_save signals, so invalidate the cached catalog once here.
+        bump_collection_version()
+    return result
+
+
+def _insert(sessions, result):
+    if sessions and not result.dry_run:
+        Session.objects.bulk_create(sessions)
+    result.created += len(sessions)
@@ -0,0 +1,118 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from sessions.models import Session
+from sessions.projection import SessionProjection
+from sessions.serializers import SessionSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark SessionSerializer against the SessionProjection list path and check their output is identical'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[10_000, 100_000],
+            help='Row counts to benchmark (default: 10000 100000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per path; the best time is reported (default: 3)',
+        )
+
+    def handle(self, *args, **options):
+        request = Request(RequestFactory().get('/api/sessions/'))
+        renderer = JSONRenderer()
+
+        # Everything happens inside one transaction that is rolled back at the end.
+        with transaction.atomic():
+            creator = User.objects.create_user(
+                email=f'bench-{time.time_ns()}@example.com',
+                name='Bench Creator',
+                role=User.Role.CREATOR,
+                password=None,
+            )
+            created = 0
+            for rows in sorted(options['rows']):
+                created = self._seed(creator, created, rows)
+                queryset = Session.objects.filter(creator=creator).order_by('-start_time', '-id')
+
+                def serializer_path():
+                    data = SessionSerializer(list(queryset), many=True, context={'request': request}).data
+                    return renderer.render(data)
+
+                def projection_path():
+                    projection = SessionProjection(request)
+                    return renderer.render(projection.project(queryset.values(*projection.columns)))
+
+                serializer_time, serializer_body = self._best_of(serializer_path, options['repeat'])
+                projection_time, projection_body = self._best_of(projection_path, options['repeat'])
+
+                if serializer_body != projection_body:
+                    raise CommandError(f'Projection output differs from SessionSerializer at {rows} rows')
+
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'{rows:>9} rows: serializer {serializer_time * 1000:9.1f} ms, '
+                        f'projection {projection_time * 1000:9.1f} ms, '
+                        f'speedup {serializer_time / projection_time:4.1f}x, '
+                        f'{len(projection_body) / 1024:,.0f} KiB identical'
+                    )
+                )
+            transaction.set_rollback(True)
+
+    def _seed(self, creator, existing, target):
+        start = timezone.now()
+        batch = []
+        for i in range(existing, target):
+            image_file = f'sessions/bench-{i % 50}.png' if i % 3 == 0 else None
+            batch.append(
+                Session(
+                    title=f'Benchmark session {i}',
+                    description='A reasonably long description for a benchmark session. ' * 4,
+                    price=Decimal(i % 2000) + Decimal('0.5'),
+                    creator=creator,
+                    image='https://images.example.com/session.jpg' if i % 3 else '',
+                    image_file=image_file,
+                    image_variants=self._variants(image_file) if i % 6 == 0 else {},
+                    start_time=start + timedelta(minutes=i),
+                    duration=timedelta(hours=1, minutes=i % 60),
+                )
+            )
+        Session.objects.bulk_create(batch, batch_size=5000)
+        return target
+
+    def _variants(self, source):
+        stem = source.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+        return {
+            'source': source,
+            'sizes': {
+                name: {'width': width, 'height': width // 2,
+                       'webp': f'sessions/variants/{stem}-{name}.webp', 'jpeg': f'sessions/variants/{stem}-{name}.jpg'}
+                for name, width in (('hero', 1600), ('card', 640), ('thumb', 320))
+            },
+        }
+
+    def _best_of(self, fn, repeat):
+        best, result = None, None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
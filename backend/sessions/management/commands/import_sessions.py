@@ -0,0 +1,65 @@
+import json
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from sessions import imports
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Import sessions for a creator from a CSV file (header row naming the fields) or a JSON Lines file, '
+        'streamed and inserted a chunk at a time. Valid rows are created; invalid ones are reported by line.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for stdin')
+        parser.add_argument('--creator', required=True, help='Email or id of the creator who will own the sessions')
+        parser.add_argument(
+            '--format', choices=sorted(imports.READERS), help='Input format (default: from the file extension, csv for stdin)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=imports.CHUNK_SIZE, help=f'Rows per insert (default: {imports.CHUNK_SIZE})')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate the rows')
+
+    def handle(self, *args, **options):
+        lookup = {'pk': options['creator']} if options['creator'].isdigit() else {'email': options['creator']}
+        try:
+            creator = User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f'No user {options["creator"]}')
+        if creator.role != User.Role.CREATOR:
+            self.stdout.write(self.style.WARNING(f'{creator.email} is not a creator; importing anyway'))
+
+        path = options['path']
+        fmt = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        started = last_report = time.monotonic()
+
+        def progress(result):
+            nonlocal last_report
+            if time.monotonic() - last_report >= 2:
+                last_report = time.monotonic()
+                self.stdout.write(f'  {result.created:,} rows imported, {result.failed:,} failed')
+
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            rows = imports.READERS[fmt](imports.decode_lines(stream))
+            result = imports.import_sessions(
+                rows, creator, chunk_size=options['chunk_size'], dry_run=options['dry_run'], progress=progress
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for error in result.errors:
+            self.stdout.write(f'  line {error["line"]}: {json.dumps(error["errors"])}')
+        if result.failed > len(result.errors):
+            self.stdout.write(f'  ... and {result.failed - len(result.errors):,} more')
+        action = 'Validated' if options['dry_run'] else 'Imported'
+        style = self.style.WARNING if result.failed else self.style.SUCCESS
+        self.stdout.write(style(
+            f'{action} {result.created:,} sessions in {time.monotonic() - started:.1f} s; {result.failed:,} rows failed'
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_sessions', '0002_session_image_file'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['start_time', 'id'], name='session_start_time_id_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_sessions', '0004_session_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum number of bookings; empty means unlimited', null=True),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='seats_taken',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddConstraint(
+            model_name='session',
+            constraint=models.CheckConstraint(condition=models.Q(('capacity__isnull', True), ('seats_taken__lte', models.F('capacity')), _connector='OR'), name='session_seats_within_capacity'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_sessions', '0005_session_capacity_session_seats_taken_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of image_file, see sessions/images.py'),
+        ),
+    ]
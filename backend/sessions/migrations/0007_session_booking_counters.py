@@ -0,0 +1,54 @@
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 2000
+
+
+def backfill_counters(apps, schema_editor):
+    """Count every session's bookings, one primary key range at a time."""
+    Session = apps.get_model('app_sessions', 'Session')
+    Booking = apps.get_model('bookings', 'Booking')
+    per_session = Booking.objects.filter(session=OuterRef('pk')).order_by().values('session')
+
+    def total(aggregate, output_field):
+        # Sessions without bookings get no row from the subquery, hence the Coalesce.
+        return Coalesce(Subquery(per_session.annotate(total=aggregate).values('total')), 0, output_field=output_field)
+
+    last = Session.objects.aggregate(last=Max('pk'))['last'] or 0
+    for start in range(0, last, BATCH_SIZE):
+        Session.objects.filter(pk__gt=start, pk__lte=start + BATCH_SIZE).update(
+            bookings_count=total(Count('id'), models.IntegerField()),
+            confirmed_count=total(Count('id', filter=Q(status='CONFIRMED')), models.IntegerField()),
+            revenue=total(Sum('amount_paid'), models.DecimalField(max_digits=12, decimal_places=2)),
+        )
+
+
+class Migration(migrations.Migration):
+    # Each range is recounted by one UPDATE, and bookings saved in the meantime add
+    # their delta to whatever count is there, so ranges can commit as they finish.
+    atomic = False
+
+    dependencies = [
+        ('app_sessions', '0006_session_image_variants'),
+        ('bookings', '0007_bookingstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='bookings_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='confirmed_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='revenue',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,31 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+class SessionQuerySet(models.QuerySet):
+    def reserve_seat(self, session_id) -> bool:
+        """
+        Atomically take one seat. The conditional UPDATE only locks this session's
+        row, so concurrent bookings of other sessions never wait on each other.
+        Returns False when the session is full.
+        """
+        has_room = Q(capacity__isnull=True) | Q(seats_taken__lt=F("capacity"))
+        return bool(
+            self.filter(has_room, pk=session_id).update(seats_taken=F("seats_taken") + 1, updated_at=timezone.now())
+        )
+
+    def reserve_seats(self, session_ids) -> int:
+        """
+        Take one seat in each of the sessions with a single UPDATE (a cart checkout).
+        Returns how many sessions had room; the caller rolls back unless it is all of them.
+        """
+        has_room = Q(capacity__isnull=True) | Q(seats_taken__lt=F("capacity"))
+        return self.filter(has_room, pk__in=session_ids).update(seats_taken=F("seats_taken") + 1, updated_at=timezone.now())
+
+    def release_seat(self, session_id) -> None:
+        self.filter(pk=session_id, seats_taken__gt=0).update(seats_taken=F("seats_taken") - 1, updated_at=timezone.now())
 
 
 class Session(models.Model):
@@ -9,10 +35,31 @@ class Session(models.Model):
     creator = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="sessions")
     image = models.URLField(blank=True)
     image_file = models.ImageField(upload_to="sessions/", blank=True, null=True, help_text="Upload image file")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Resized copies of image_file, see sessions/images.py")
     start_time = models.DateTimeField()
     duration = models.DurationField()
+    capacity = models.PositiveIntegerField(null=True, blank=True, help_text="Maximum number of bookings; empty means unlimited")
+    seats_taken = models.PositiveIntegerField(default=0)
+    # Kept from the session's bookings in the same transaction as each booking write (see
+    # bookings/stats.py); `manage.py reconcile_session_counters` repairs any drift.
+    bookings_count = models.IntegerField(default=0)
+    confirmed_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SessionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["start_time", "id"], name="session_start_time_id_idx"),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(capacity__isnull=True) | Q(seats_taken__lte=F("capacity")),
+                name="session_seats_within_capacity",
+            ),
+        ]
+
     def __str__(self):
         return self.title
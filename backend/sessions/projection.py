@@ -0,0 +1,144 @@
+"""
+Read-only projection path for session list responses.
+
+`SessionProjection` renders `.values()` rows straight into the same dicts that
+`SessionSerializer(many=True).data` would produce, without instantiating model
+objects or running DRF's per-field machinery for every row. The formatting plan is
+derived from the serializer's own fields once per request, so the output stays
+byte-for-byte identical (see the `bench_session_list` command).
+"""
+import datetime
+import decimal
+import logging
+
+from django.utils import timezone
+from django.utils.duration import duration_string
+from rest_framework import fields as drf_fields
+from rest_framework import relations
+from rest_framework.settings import api_settings
+
+from .images import current_variants, srcset, variant_urls
+from .models import Session
+from .serializers import SessionSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def _decimal_formatter(field):
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def format_decimal(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+
+    return format_decimal
+
+
+def _datetime_formatter(field_tz):
+    # Database datetimes already carry UTC; converting them to the UTC zone is a no-op.
+    passthrough = {field_tz, datetime.timezone.utc} if str(field_tz) == "UTC" else {field_tz}
+
+    def format_datetime(value):
+        if value.tzinfo not in passthrough:
+            value = value.astimezone(field_tz) if timezone.is_aware(value) else timezone.make_aware(value, field_tz)
+        value = value.isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+def _identity(value):
+    return value
+
+
+class SessionProjection:
+    """Build session list items from `.values()` rows."""
+
+    def __init__(self, request):
+        self.request = request
+        self._image_urls = {}
+        self._storage = Session._meta.get_field("image_file").storage
+
+        serializer = SessionSerializer(context={"request": request})
+        self.plan = []
+        columns = {"id"}
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name == "image_url":
+                self.plan.append((name, None, self._image_url))
+                columns.update(("image", "image_file"))
+                continue
+            if name in ("image_variants", "image_srcset"):
+                self.plan.append((name, None, self._image_variants if name == "image_variants" else self._image_srcset))
+                columns.update(("image_file", "image_variants"))
+                continue
+            column = Session._meta.get_field(field.source).attname
+            self.plan.append((name, column, self._formatter(field)))
+            columns.add(column)
+        self.columns = tuple(sorted(columns))
+
+    def _formatter(self, field):
+        """Pick a precomputed formatter, falling back to the field itself for anything unusual."""
+        if isinstance(field, drf_fields.DecimalField):
+            coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            if coerce_to_string and field.decimal_places is not None and not field.localize and not field.normalize_output:
+                return _decimal_formatter(field)
+        if isinstance(field, drf_fields.DateTimeField):
+            output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+            field_tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+            if isinstance(output_format, str) and output_format.lower() == drf_fields.ISO_8601 and field_tz is not None:
+                return _datetime_formatter(field_tz)
+        if isinstance(field, drf_fields.DurationField):
+            if getattr(field, "format", api_settings.DURATION_FORMAT) == "django":
+                return duration_string
+        if isinstance(field, (drf_fields.CharField, drf_fields.IntegerField, relations.PrimaryKeyRelatedField)):
+            # Values come back from the database already as str / int primary keys.
+            return _identity
+        return field.to_representation
+
+    def _image_url(self, row):
+        name = row["image_file"]
+        if not name:
+            return row["image"] or ""
+        try:
+            return self._url(name)
+        except Exception as e:
+            logger.debug(f"Error getting image_url for session {row['id']}: {e}")
+            return row["image"] or ""
+
+    def _url(self, name):
+        url = self._image_urls.get(name)
+        if url is None:
+            url = self._storage.url(name)
+            if self.request:
+                url = self.request.build_absolute_uri(url)
+            self._image_urls[name] = url
+        return url
+
+    def _image_variants(self, row):
+        sizes = current_variants(row["image_file"], row["image_variants"])
+        return variant_urls(sizes, self._url) if sizes else {}
+
+    def _image_srcset(self, row):
+        return srcset(self._image_variants(row))
+
+    def project(self, rows):
+        items = []
+        for row in rows:
+            item = {}
+            for name, column, formatter in self.plan:
+                if column is None:
+                    item[name] = formatter(row)
+                else:
+                    value = row[column]
+                    item[name] = None if value is None else formatter(value)
+            items.append(item)
+        return items
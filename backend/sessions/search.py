@@ -0,0 +1,103 @@
+"""
+Database-side full-text search index for `Session.title` / `Session.description`.
+
+Postgres gets a generated, GIN-indexed `search_vector` tsvector column; SQLite gets
+an external-content FTS5 table kept in sync by triggers. Neither is part of the
+model state, so `SessionSearchFilter` queries them with raw SQL.
+"""
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE app_sessions_session ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX session_search_vector_idx ON app_sessions_session USING GIN (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS session_search_vector_idx",
+    "ALTER TABLE app_sessions_session DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE app_sessions_session_fts USING fts5(
+        title, description, content='app_sessions_session', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS app_sessions_session_fts_ai AFTER INSERT ON app_sessions_session BEGIN
+        INSERT INTO app_sessions_session_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS app_sessions_session_fts_ad AFTER DELETE ON app_sessions_session BEGIN
+        INSERT INTO app_sessions_session_fts(app_sessions_session_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS app_sessions_session_fts_au AFTER UPDATE OF title, description ON app_sessions_session BEGIN
+        INSERT INTO app_sessions_session_fts(app_sessions_session_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO app_sessions_session_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO app_sessions_session_fts(app_sessions_session_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS app_sessions_session_fts_au",
+    "DROP TRIGGER IF EXISTS app_sessions_session_fts_ad",
+    "DROP TRIGGER IF EXISTS app_sessions_session_fts_ai",
+    "DROP TABLE IF EXISTS app_sessions_session_fts",
+]
+
+
+SQLITE_TRIGGERS = ("app_sessions_session_fts_ai", "app_sessions_session_fts_ad", "app_sessions_session_fts_au")
+
+
+def _execute(connection, statements):
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_search_index(connection):
+    if connection.vendor == "postgresql":
+        _execute(connection, POSTGRES_FORWARD)
+    elif connection.vendor == "sqlite":
+        _execute(connection, SQLITE_FORWARD)
+
+
+def uninstall_search_index(connection):
+    if connection.vendor == "postgresql":
+        _execute(connection, POSTGRES_BACKWARD)
+    elif connection.vendor == "sqlite":
+        _execute(connection, SQLITE_BACKWARD)
+
+
+def ensure_sqlite_triggers(connection):
+    """
+    SQLite cannot alter most columns in place, so Django rebuilds the sessions table
+    for many schema changes and the FTS triggers are dropped with the old table.
+    Re-create them (and resync the index) whenever that has happened.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'app_sessions_session_fts'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+            SQLITE_TRIGGERS,
+        )
+        if cursor.fetchone()[0] == len(SQLITE_TRIGGERS):
+            return
+    _execute(connection, SQLITE_FORWARD[1:])
@@ -1,10 +1,15 @@
 from rest_framework import serializers
 
+from config.sparse import SparseFieldsMixin
+
+from .images import current_variants, srcset, variant_urls
 from .models import Session
 
 
-class SessionSerializer(serializers.ModelSerializer):
+class SessionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Session
@@ -17,15 +22,43 @@ class SessionSerializer(serializers.ModelSerializer):
             "image",
             "image_file",
             "image_url",
+            "image_variants",
+            "image_srcset",
             "start_time",
             "duration",
+            "capacity",
+            "seats_taken",
+            "bookings_count",
             "created_at",
             "updated_at",
         )
-        read_only_fields = ("id", "creator", "created_at", "updated_at", "image_url")
+        read_only_fields = (
+            "id",
+            "creator",
+            "seats_taken",
+            "bookings_count",
+            "created_at",
+            "updated_at",
+            "image_url",
+            "image_variants",
+            "image_srcset",
+        )
         extra_kwargs = {
             "image_file": {"write_only": True},
         }
+        # Model columns read by computed fields, for `?fields=` column pruning.
+        column_sources = {
+            "image_url": ("image", "image_file"),
+            "image_variants": ("image_file", "image_variants"),
+            "image_srcset": ("image_file", "image_variants"),
+        }
+
+    def validate_capacity(self, value):
+        if value is not None and self.instance is not None and value < self.instance.seats_taken:
+            raise serializers.ValidationError(
+                f"Capacity cannot be lower than the {self.instance.seats_taken} seats already booked."
+            )
+        return value
 
     def get_image_url(self, obj):
         if obj.image_file:
@@ -42,6 +75,20 @@ class SessionSerializer(serializers.ModelSerializer):
                 logger.debug(f"Error getting image_url for session {obj.id}: {e}")
                 return obj.image or ""
         return obj.image or ""
+
+    def get_image_variants(self, obj):
+        """Resized WebP/JPEG URLs by size name; empty until the background job has made them."""
+        sizes = current_variants(obj.image_file.name if obj.image_file else "", obj.image_variants)
+        if not sizes:
+            return {}
+        storage = obj.image_file.storage
+        request = self.context.get("request") if self.context else None
+        if request:
+            return variant_urls(sizes, lambda name: request.build_absolute_uri(storage.url(name)))
+        return variant_urls(sizes, storage.url)
+
+    def get_image_srcset(self, obj):
+        return srcset(self.get_image_variants(obj))
     
     def to_representation(self, instance):
         """Override to exclude image_file from response."""
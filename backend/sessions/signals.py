@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_collection_version
+from .models import Session
+
+
+# Session bodies show only the creator's id, so user saves (a login's `last_login`,
+# profile edits) leave the catalog alone; deleting a user deletes its sessions,
+# which lands here.
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def invalidate_session_cache(sender, **kwargs):
+    # After the commit, or a concurrent reader could cache the old row under the new version.
+    transaction.on_commit(bump_collection_version)
@@ -0,0 +1,8 @@
+from jobs.queue import task
+
+from .images import GENERATE_VARIANTS_TASK, generate_variants
+
+
+@task(GENERATE_VARIANTS_TASK, max_attempts=3)
+def generate_image_variants(session_id: int, source: str) -> None:
+    generate_variants(session_id, source)
@@ -1,20 +1,48 @@
 import logging
-from rest_framework import viewsets, status
+from rest_framework import filters, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 
+from config.conditional import conditional_response, queryset_validators
+from config.pagination import KeysetPagination
+from config.sparse import only_columns, requested_fields
+
+from .cache import cached_response, cached_value
+from . import imports
+from .filters import SessionFilter, SessionSearchFilter
+from .images import schedule_variants
 from .models import Session
 from .permissions import SessionPermission
+from .projection import SessionProjection
 from .serializers import SessionSerializer
 
 logger = logging.getLogger(__name__)
 
 
+class SessionPagination(KeysetPagination):
+    ordering = ("-start_time", "-id")
+
+
 class SessionViewSet(viewsets.ModelViewSet):
-    queryset = Session.objects.select_related("creator").all().order_by("-start_time")
+    queryset = Session.objects.select_related("creator").all().order_by("-start_time", "-id")
     serializer_class = SessionSerializer
     permission_classes = [SessionPermission]
+    pagination_class = SessionPagination
+    filter_backends = [SessionFilter, SessionSearchFilter, filters.OrderingFilter]
+    ordering_fields = ("price", "start_time")
+    ordering = ("-start_time", "-id")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = requested_fields(self.request)
+        if fields is None:
+            return queryset
+        # Keep the ordering/cursor columns loaded, or the paginator would refetch them per row.
+        fields = fields | {"start_time", *self.ordering_fields}
+        columns = only_columns(Session, fields, SessionSerializer.Meta.column_sources)
+        return queryset.select_related(None).only(*columns)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -22,9 +50,15 @@ class SessionViewSet(viewsets.ModelViewSet):
         return context
     
     def list(self, request, *args, **kwargs):
-        """Override list to add error handling."""
+        """Override list to add error handling, conditional GET and the shared response cache."""
         try:
-            return super().list(request, *args, **kwargs)
+            return conditional_response(
+                request,
+                lambda: self._validators("list-validators", self.filter_queryset(self.get_queryset())),
+                lambda: cached_response(request, "list", lambda: self._projected_list(request)),
+            )
+        except APIException:
+            raise
         except Exception as e:
             logger.exception(f"Error listing sessions: {e}")
             return Response(
@@ -32,8 +66,56 @@ class SessionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def _projected_list(self, request):
+        """Same body as `ModelViewSet.list`, built from `.values()` rows instead of serializer instances."""
+        projection = SessionProjection(request)
+        columns = {*projection.columns, "start_time", *self.ordering_fields}
+        queryset = self.filter_queryset(self.get_queryset()).values(*columns)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(projection.project(page))
+        return Response(projection.project(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_response(
+            request,
+            lambda: self._validators("detail-validators", self.get_queryset().filter(pk=kwargs["pk"]), kwargs["pk"]),
+            lambda: cached_response(
+                request, "detail", lambda: super(SessionViewSet, self).retrieve(request, *args, **kwargs), kwargs["pk"]
+            ),
+        )
+
+    def _validators(self, kind, queryset, session_id=None):
+        # Session bodies don't depend on the requesting user, so neither do their validators.
+        return cached_value(
+            self.request, kind, lambda: queryset_validators(self.request, queryset, per_user=False), session_id
+        )
+
     def perform_create(self, serializer):
-        serializer.save(creator=self.request.user)
+        schedule_variants(serializer.save(creator=self.request.user))
+
+    def perform_update(self, serializer):
+        schedule_variants(serializer.save())
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_sessions(self, request):
+        """
+        Create many sessions at once from a CSV (`text/csv`, with a header row naming the
+        fields) or JSON Lines (`application/x-ndjson`) body. The body is read as a stream,
+        never as `request.data`, so its size doesn't bound memory. `?dry_run=1` only validates.
+        """
+        reader = imports.READERS.get(imports.CONTENT_TYPES.get(request.content_type.split(";")[0].strip()))
+        if reader is None:
+            return Response(
+                {"detail": "Send the sessions as CSV (text/csv) or JSON Lines (application/x-ndjson)."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        dry_run = request.query_params.get("dry_run") in ("1", "true")
+        lines = imports.decode_lines(request.stream or ())
+        result = imports.import_sessions(reader(lines), request.user, dry_run=dry_run)
+        created = result.created and not dry_run
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"], parser_classes=[MultiPartParser, FormParser])
     def upload_image(self, request, pk=None):
@@ -53,6 +135,8 @@ class SessionViewSet(viewsets.ModelViewSet):
 
         session.image_file = request.FILES["image"]
         session.save()
+        # Resized variants are made by a background worker; until then clients fall back to image_url.
+        schedule_variants(session)
 
         serializer = self.get_serializer(session)
         return Response(serializer.data, status=status.HTTP_200_OK)
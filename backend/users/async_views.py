@@ -0,0 +1,120 @@
+"""
+Async versions of the social login endpoints, routed instead of the sync ones
+when the app is served over ASGI (see `users/urls.py`). Behaviour and responses
+match `GoogleLoginView` and `GitHubLoginView`; the calls to Google and GitHub are
+awaited, so a worker keeps serving other requests in the meantime.
+"""
+import asyncio
+
+import aiohttp
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.response import Response
+
+from config.async_views import AsyncAPIView
+
+from . import github
+from .google import averify_google_id_token
+from .serializers import GitHubAccessTokenSerializer, GitHubCodeSerializer, GoogleIdTokenSerializer
+from .views import LoginThrottle, social_login
+
+
+class GoogleLoginView(AsyncAPIView):
+    """
+    Frontend obtains a Google ID token ("credential") via Google Identity Services,
+    then exchanges it here for our app's JWT (SimpleJWT).
+    """
+
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginThrottle]
+
+    async def post(self, request, *args, **kwargs):
+        if not getattr(settings, "GOOGLE_OAUTH_CLIENT_ID", ""):
+            return Response(
+                {
+                    "detail": "Google OAuth client ID is not configured on the server. Set GOOGLE_OAUTH_CLIENT_ID.",
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        serializer = GoogleIdTokenSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        credential = serializer.validated_data["credential"]
+
+        try:
+            payload = await averify_google_id_token(credential, audience=settings.GOOGLE_OAUTH_CLIENT_ID)
+        except Exception:
+            return Response({"detail": "Invalid Google credential."}, status=status.HTTP_400_BAD_REQUEST)
+
+        email = payload.get("email")
+        if not email:
+            return Response({"detail": "Google account email missing."}, status=status.HTTP_400_BAD_REQUEST)
+
+        name = payload.get("name") or email.split("@", 1)[0]
+        avatar = payload.get("picture") or ""
+
+        return Response(await sync_to_async(social_login)(email, name, avatar), status=status.HTTP_200_OK)
+
+
+class GitHubLoginView(AsyncAPIView):
+    """
+    Frontend obtains a GitHub authorization code via GitHub OAuth redirect,
+    then exchanges it here for our app's JWT (SimpleJWT).
+    Supports both authorization code and access token flows.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginThrottle]
+
+    async def post(self, request, *args, **kwargs):
+        # Check if we have a code (OAuth flow) or access_token (direct token)
+        code = request.data.get("code")
+        access_token = request.data.get("access_token")
+
+        if code:
+            # Exchange authorization code for access token
+            serializer = GitHubCodeSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            access_token = await github.aexchange_code(code)
+        elif access_token:
+            # Use provided access token directly
+            serializer = GitHubAccessTokenSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+        else:
+            return Response(
+                {"detail": "Either 'code' or 'access_token' is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not access_token:
+            return Response(
+                {"detail": "Failed to obtain GitHub access token."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            # Verify token and get user info from GitHub API (cached briefly per token)
+            profile = await github.afetch_profile(access_token)
+            email = profile["email"]
+
+            if not email:
+                return Response(
+                    {"detail": "GitHub account email not available. Please ensure your GitHub account has a public email."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            name = profile["name"] or email.split("@", 1)[0]
+            avatar = profile["avatar"]
+
+            return Response(await sync_to_async(social_login)(email, name, avatar), status=status.HTTP_200_OK)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return Response(
+                {"detail": f"Failed to verify GitHub token: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except Exception as e:
+            return Response(
+                {"detail": f"GitHub authentication failed: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
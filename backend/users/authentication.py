@@ -0,0 +1,122 @@
+"""
+JWT authentication without a `users_user` query on every request.
+
+`CachedJWTAuthentication` resolves the token's user from a bounded per-process LRU
+cache. Each entry remembers the user's stamp in the shared cache at the time it
+was loaded; saving or deleting a `User` replaces the stamp (see `signals.py`), so
+every worker drops its copy on the next request and role or `is_active` changes
+take effect immediately. That check is a single GET against Redis. The default
+local-memory cache is per process and could not carry the stamp to other workers,
+so settings only enable this class when `REDIS_URL` is set and fall back to plain
+`JWTAuthentication` otherwise.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+logger = logging.getLogger(__name__)
+
+STAMP_KEY = "auth:user-stamp:{}"
+
+
+class UserCache:
+    """LRU of user rows keyed by primary key. Entries are `(stamp, loaded_at, values)`."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._model = get_user_model()
+        self._attnames = [field.attname for field in self._model._meta.concrete_fields]
+
+    def get(self, user_id, stamp):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] != stamp or time.monotonic() - entry[1] > self.ttl:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        # A fresh instance per request, so views that modify request.user can't corrupt the cache.
+        return self._model.from_db(DEFAULT_DB_ALIAS, self._attnames, entry[2])
+
+    def put(self, user_id, user, stamp) -> None:
+        values = tuple(getattr(user, attname) for attname in self._attnames)
+        with self._lock:
+            self._entries[user_id] = (stamp, time.monotonic(), values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+def user_stamp(user_id):
+    """The user's current stamp in the shared cache, creating one if it was never set or got evicted."""
+    key = STAMP_KEY.format(user_id)
+    stamp = cache.get(key)
+    if stamp is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        stamp = cache.get(key)
+    return stamp
+
+
+def invalidate_user(user_id) -> None:
+    """Make every worker reload the user on its next request."""
+    user_cache.discard(user_id)
+    try:
+        cache.set(STAMP_KEY.format(user_id), time.time_ns(), timeout=None)
+    except Exception as e:
+        # Other workers will still pick the change up once their entries reach AUTH_USER_CACHE_TTL.
+        logger.warning(f"Failed to invalidate cached user {user_id}: {e}")
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            # Read the stamp before loading, so a save that races with the load leaves a stale stamp behind.
+            stamp = user_stamp(user_id)
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable, loading user {user_id} from the database: {e}")
+            return super().get_user(validated_token)
+
+        user = user_cache.get(user_id, stamp)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.put(user_id, user, stamp)
+            return user
+
+        # The same checks JWTAuthentication.get_user runs after its query.
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -0,0 +1,161 @@
+"""
+GitHub OAuth calls used by `GitHubLoginView`.
+
+All calls share the process-wide keep-alive pool (`config.http`), `/user` and
+`/user/emails` are fetched concurrently, and the resulting profile is cached
+briefly under a hash of the access token so repeated logins with the same token
+skip the GitHub API entirely. `aexchange_code` and `afetch_profile` are the same
+calls for the async login view.
+"""
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from config.http import get_async_session, get_session
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CACHE_KEY = "github:profile:{}"
+TIMEOUT = (3.05, 10)
+ASYNC_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=3.05)
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="github-api")
+
+
+def exchange_code(code: str) -> str | None:
+    """Exchange a GitHub authorization code for an access token."""
+    if not settings.GITHUB_OAUTH_CLIENT_ID or not settings.GITHUB_OAUTH_CLIENT_SECRET:
+        return None
+
+    try:
+        response = get_session().post(
+            f"{settings.GITHUB_OAUTH_URL}/login/oauth/access_token",
+            data={
+                "client_id": settings.GITHUB_OAUTH_CLIENT_ID,
+                "client_secret": settings.GITHUB_OAUTH_CLIENT_SECRET,
+                "code": code,
+            },
+            headers={"Accept": "application/json"},
+            timeout=TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.json().get("access_token")
+    except requests.RequestException:
+        return None
+
+
+def fetch_profile(access_token: str) -> dict:
+    """
+    Return `{"email", "name", "avatar"}` for the token's GitHub account; `email` may be
+    empty. Raises `requests.RequestException` if the token can't be verified.
+    """
+    key = PROFILE_CACHE_KEY.format(hashlib.sha256(access_token.encode()).hexdigest())
+    profile = cache.get(key)
+    if profile is not None:
+        return profile
+
+    headers = {"Authorization": f"token {access_token}", "Accept": "application/vnd.github+json"}
+    session = get_session()
+    # /user/emails is only needed when the email is private, but asking up front costs no extra wall time.
+    user_future = _executor.submit(session.get, f"{settings.GITHUB_API_URL}/user", headers=headers, timeout=TIMEOUT)
+    emails_future = _executor.submit(session.get, f"{settings.GITHUB_API_URL}/user/emails", headers=headers, timeout=TIMEOUT)
+
+    user_response = user_future.result()
+    user_response.raise_for_status()
+    github_user = user_response.json()
+
+    emails = None
+    if not github_user.get("email"):
+        try:
+            emails_response = emails_future.result()
+        except requests.RequestException as e:
+            logger.debug(f"Failed to fetch GitHub emails: {e}")
+        else:
+            if emails_response.status_code == 200:
+                emails = emails_response.json()
+
+    profile = _profile(github_user, emails)
+    if profile["email"]:
+        cache.set(key, profile, timeout=settings.GITHUB_PROFILE_CACHE_TTL)
+    return profile
+
+
+async def aexchange_code(code: str) -> str | None:
+    """`exchange_code` over the event loop's shared session."""
+    if not settings.GITHUB_OAUTH_CLIENT_ID or not settings.GITHUB_OAUTH_CLIENT_SECRET:
+        return None
+
+    try:
+        async with get_async_session().post(
+            f"{settings.GITHUB_OAUTH_URL}/login/oauth/access_token",
+            data={
+                "client_id": settings.GITHUB_OAUTH_CLIENT_ID,
+                "client_secret": settings.GITHUB_OAUTH_CLIENT_SECRET,
+                "code": code,
+            },
+            headers={"Accept": "application/json"},
+            timeout=ASYNC_TIMEOUT,
+        ) as response:
+            response.raise_for_status()
+            return (await response.json(content_type=None)).get("access_token")
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+
+
+async def _aget_json(session, path, headers):
+    async with session.get(f"{settings.GITHUB_API_URL}{path}", headers=headers, timeout=ASYNC_TIMEOUT) as response:
+        response.raise_for_status()
+        return await response.json(content_type=None)
+
+
+async def afetch_profile(access_token: str) -> dict:
+    """
+    `fetch_profile` over the event loop's shared session. Raises `aiohttp.ClientError`
+    or `asyncio.TimeoutError` if the token can't be verified.
+    """
+    key = PROFILE_CACHE_KEY.format(hashlib.sha256(access_token.encode()).hexdigest())
+    profile = await cache.aget(key)
+    if profile is not None:
+        return profile
+
+    headers = {"Authorization": f"token {access_token}", "Accept": "application/vnd.github+json"}
+    session = get_async_session()
+    github_user, emails = await asyncio.gather(
+        _aget_json(session, "/user", headers),
+        _aget_json(session, "/user/emails", headers),
+        return_exceptions=True,
+    )
+    if isinstance(github_user, BaseException):
+        raise github_user
+
+    if isinstance(emails, BaseException):
+        if not github_user.get("email"):
+            logger.debug(f"Failed to fetch GitHub emails: {emails}")
+        emails = None
+
+    profile = _profile(github_user, emails)
+    if profile["email"]:
+        await cache.aset(key, profile, timeout=settings.GITHUB_PROFILE_CACHE_TTL)
+    return profile
+
+
+def _profile(github_user: dict, emails: list | None) -> dict:
+    email = github_user.get("email")
+    if not email and emails:
+        primary_email = next((e for e in emails if e.get("primary")), None)
+        if primary_email:
+            email = primary_email.get("email")
+        else:
+            email = emails[0].get("email")
+
+    return {
+        "email": email or "",
+        "name": github_user.get("name") or github_user.get("login") or "",
+        "avatar": github_user.get("avatar_url") or "",
+    }
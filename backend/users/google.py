@@ -0,0 +1,178 @@
+"""
+Google ID token verification with cached signing certificates.
+
+`google.oauth2.id_token.verify_oauth2_token` downloads Google's certificates on
+every call. Here they are kept in memory for as long as their `Cache-Control:
+max-age` allows and shared with the other workers through the default cache.
+Before they expire, a background thread fetches a fresh copy over the pooled
+HTTP session. On the hot path, verification is purely in-process, which is why
+`averify_google_id_token` only leaves the event loop when a fetch is due.
+
+`GOOGLE_OAUTH_CERTS_URL` points verification at another endpoint, e.g. a local
+fake serving a JWKS or `{kid: PEM}` document.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from google.auth import exceptions as google_exceptions
+from google.auth import transport
+from google.auth.transport import requests as google_requests
+from google.oauth2 import id_token as google_id_token
+
+from config.http import get_session
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Used when the endpoint sends no max-age, and the floor for very short ones.
+DEFAULT_MAX_AGE = 300
+MIN_MAX_AGE = 30
+# Start refreshing once this share of the lifetime has passed.
+REFRESH_AFTER = 0.8
+FETCH_TIMEOUT = 5
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _max_age(headers) -> int:
+    match = _MAX_AGE_RE.search(headers.get("Cache-Control", ""))
+    if not match:
+        return DEFAULT_MAX_AGE
+    age = int(headers.get("Age", "0") or 0)
+    return max(int(match.group(1)) - age, MIN_MAX_AGE)
+
+
+class CertificateCache:
+    """The raw certificate document of one URL, with its fetch and expiry times."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.cache_key = f"google:certs:{hashlib.sha256(url.encode()).hexdigest()[:16]}"
+        self._entry = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self) -> bytes:
+        entry, now = self._entry, time.time()
+        if entry is None or now >= entry["expires_at"]:
+            with self._lock:
+                if self._entry is None or time.time() >= self._entry["expires_at"]:
+                    self._entry = self._shared_entry() or self._fetch()
+                entry = self._entry
+        elif now >= entry["refresh_at"] and not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=self._refresh, name="google-certs-refresh", daemon=True).start()
+        return entry["body"]
+
+    def is_fresh(self) -> bool:
+        """Whether `get()` can answer without a blocking fetch."""
+        return self._entry is not None and time.time() < self._entry["expires_at"]
+
+    def _shared_entry(self):
+        try:
+            entry = cache.get(self.cache_key)
+        except Exception as e:
+            logger.warning(f"Failed to read cached Google certificates: {e}")
+            return None
+        return entry if entry and time.time() < entry["expires_at"] else None
+
+    def _fetch(self) -> dict:
+        response = get_session().get(self.url, timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        max_age, now = _max_age(response.headers), time.time()
+        entry = {"body": response.content, "refresh_at": now + max_age * REFRESH_AFTER, "expires_at": now + max_age}
+        try:
+            cache.set(self.cache_key, entry, timeout=max_age)
+        except Exception as e:
+            logger.warning(f"Failed to share Google certificates with other workers: {e}")
+        return entry
+
+    def _refresh(self) -> None:
+        try:
+            shared = self._shared_entry()
+            if shared and shared["refresh_at"] > self._entry["refresh_at"]:
+                # Another worker already refreshed.
+                self._entry = shared
+            elif cache.add(f"{self.cache_key}:refreshing", 1, timeout=FETCH_TIMEOUT * 2):
+                self._entry = self._fetch()
+            else:
+                # Another worker is fetching; look for its copy again in a second.
+                self._entry = {**self._entry, "refresh_at": time.time() + 1}
+        except Exception as e:
+            # Keep serving the current copy; the next request past refresh_at tries again.
+            logger.warning(f"Background refresh of Google certificates failed: {e}")
+        finally:
+            self._refreshing = False
+
+
+class _CachedResponse(transport.Response):
+    def __init__(self, body: bytes):
+        self._body = body
+
+    @property
+    def status(self):
+        return 200
+
+    @property
+    def headers(self):
+        return {"Content-Type": "application/json"}
+
+    @property
+    def data(self):
+        return self._body
+
+
+class CachingRequest(google_requests.Request):
+    """A google-auth transport that answers certificate GETs from the cache and sends the rest through the pool."""
+
+    def __init__(self):
+        super().__init__(session=get_session())
+        self._certificates = {}
+
+    def __call__(self, url, method="GET", body=None, headers=None, timeout=None, **kwargs):
+        if method == "GET" and url == settings.GOOGLE_OAUTH_CERTS_URL:
+            return _CachedResponse(self.certificates(url).get())
+        return super().__call__(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+
+    def certificates(self, url) -> CertificateCache:
+        certificates = self._certificates.get(url)
+        if certificates is None:
+            certificates = self._certificates.setdefault(url, CertificateCache(url))
+        return certificates
+
+
+_request = None
+
+
+def _get_request() -> CachingRequest:
+    global _request
+    if _request is None:
+        _request = CachingRequest()
+    return _request
+
+
+def verify_google_id_token(credential: str, audience: str) -> dict:
+    """`verify_oauth2_token` against `GOOGLE_OAUTH_CERTS_URL`, with cached certificates."""
+    payload = google_id_token.verify_token(
+        credential, _get_request(), audience=audience, certs_url=settings.GOOGLE_OAUTH_CERTS_URL
+    )
+    if payload.get("iss") not in GOOGLE_ISSUERS:
+        raise google_exceptions.GoogleAuthError(f"Wrong issuer {payload.get('iss')!r}")
+    return payload
+
+
+async def averify_google_id_token(credential: str, audience: str) -> dict:
+    """
+    `verify_google_id_token` for async views: in-process while the certificates are
+    fresh, in a worker thread when they have to be fetched first.
+    """
+    if _get_request().certificates(settings.GOOGLE_OAUTH_CERTS_URL).is_fresh():
+        return verify_google_id_token(credential, audience)
+    return await sync_to_async(verify_google_id_token, thread_sensitive=False)(credential, audience)
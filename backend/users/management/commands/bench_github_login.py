@@ -0,0 +1,138 @@
+import json
+import statistics
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from users import github
+from users.views import GitHubLoginView
+
+
+class StubGitHubHandler(BaseHTTPRequestHandler):
+    """
+    Enough of github.com and api.github.com for the login flow. Every response is
+    delayed by `latency`, and the first one on each connection additionally by
+    `handshake`, standing in for the TCP + TLS setup a real connection pays.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; without this, Nagle + delayed ACK add 40 ms.
+    disable_nagle_algorithm = True
+    latency = 0.0
+    handshake = 0.0
+
+    def setup(self):
+        super().setup()
+        self.fresh_connection = True
+
+    def _respond(self, payload):
+        delay = self.latency + (self.handshake if self.fresh_connection else 0)
+        self.fresh_connection = False
+        time.sleep(delay)
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._respond({'access_token': f'gho_{uuid.uuid4().hex}', 'token_type': 'bearer'})
+
+    def do_GET(self):
+        if self.path == '/user':
+            # A private email, so the login needs /user/emails too.
+            self._respond({'login': 'octo-bench', 'name': 'Octo Bench', 'email': None, 'avatar_url': ''})
+        elif self.path == '/user/emails':
+            self._respond([{'email': 'octo-bench@example.com', 'primary': True, 'verified': True}])
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Measure the GitHub login latency breakdown against a local stub GitHub server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20, help='Logins per measurement (default: 20)')
+        parser.add_argument('--latency-ms', type=float, default=40, help='Stub latency per API call (default: 40)')
+        parser.add_argument('--handshake-ms', type=float, default=60, help='Extra latency per new connection (default: 60)')
+
+    def handle(self, *args, **options):
+        StubGitHubHandler.latency = options['latency_ms'] / 1000
+        StubGitHubHandler.handshake = options['handshake_ms'] / 1000
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubGitHubHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        stub_url = f'http://127.0.0.1:{server.server_port}'
+        self.stdout.write(f'Stub GitHub at {stub_url}: {options["latency_ms"]:.0f} ms per call, '
+                          f'{options["handshake_ms"]:.0f} ms per new connection')
+
+        try:
+            with override_settings(
+                GITHUB_OAUTH_URL=stub_url,
+                GITHUB_API_URL=stub_url,
+                GITHUB_OAUTH_CLIENT_ID='bench',
+                GITHUB_OAUTH_CLIENT_SECRET='bench',
+            ):
+                self._run(stub_url, options['logins'])
+        finally:
+            server.shutdown()
+
+    def _run(self, stub_url, logins):
+        # Warm the pool once, as a long-running worker would have.
+        github.fetch_profile(github.exchange_code('warm-up'))
+
+        results = {
+            'before: sequential, new connection per call': [self._timed(lambda: self._unpooled_login(stub_url))
+                                                            for _ in range(logins)],
+            'code exchange (pooled)': [],
+            '/user + /user/emails (pooled, concurrent)': [],
+            'profile for a recently seen token (cached)': [],
+        }
+        for _ in range(logins):
+            token_holder = {}
+            results['code exchange (pooled)'].append(
+                self._timed(lambda: token_holder.setdefault('token', github.exchange_code('bench-code')))
+            )
+            results['/user + /user/emails (pooled, concurrent)'].append(
+                self._timed(lambda: github.fetch_profile(token_holder['token']))
+            )
+            results['profile for a recently seen token (cached)'].append(
+                self._timed(lambda: github.fetch_profile(token_holder['token']))
+            )
+
+        factory = APIRequestFactory()
+        view = GitHubLoginView.as_view(throttle_classes=[])
+        with transaction.atomic():
+            results['after: full POST /api/users/github-login/'] = [
+                self._timed(lambda: view(factory.post('/api/users/github-login/', {'code': 'bench-code'}, format='json')))
+                for _ in range(logins)
+            ]
+            transaction.set_rollback(True)
+
+        for label, timings in results.items():
+            self.stdout.write(f'{label:<50} median {statistics.median(timings):7.1f} ms   '
+                              f'p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:7.1f} ms')
+
+    def _unpooled_login(self, stub_url):
+        """The previous flow: three sequential calls, each on a fresh connection."""
+        token = requests.post(f'{stub_url}/login/oauth/access_token', data={'code': 'x'}, timeout=10).json()['access_token']
+        headers = {'Authorization': f'token {token}'}
+        requests.get(f'{stub_url}/user', headers=headers, timeout=10).json()
+        requests.get(f'{stub_url}/user/emails', headers=headers, timeout=10).json()
+
+    def _timed(self, fn):
+        started = time.perf_counter()
+        fn()
+        return (time.perf_counter() - started) * 1000
@@ -1,7 +1,11 @@
+from django.conf import settings
 from django.urls import path
 
 from .views import BecomeCreatorView, GitHubLoginView, GoogleLoginView, MeView, RegisterView
 
+if settings.SERVER_MODE == "asgi":
+    from .async_views import GitHubLoginView, GoogleLoginView  # noqa: F811
+
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
@@ -1,22 +1,26 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token as google_id_token
-from rest_framework import generics, permissions, status, throttling
+from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 import requests
 
+from ratelimit import throttling
+
+from . import github
+from .google import verify_google_id_token
 from .serializers import GitHubAccessTokenSerializer, GitHubCodeSerializer, GoogleIdTokenSerializer, RegisterSerializer, UserSerializer
 
 User = get_user_model()
 
 
 class LoginThrottle(throttling.AnonRateThrottle):
+    scope = "login"
     rate = "5/minute"
 
 
 class RegisterThrottle(throttling.AnonRateThrottle):
+    scope = "register"
     rate = "10/hour"
 
 
@@ -114,6 +118,38 @@ class BecomeCreatorView(generics.GenericAPIView):
         )
 
 
+def social_login(email: str, name: str, avatar: str) -> dict:
+    """Find or create the user for a verified social login and issue our JWT pair."""
+    user, created = User.objects.get_or_create(
+        email=email,
+        defaults={"name": name, "avatar": avatar},
+    )
+
+    # Keep profile info reasonably fresh (don't clobber custom name/avatar if already set).
+    changed = False
+    if created:
+        changed = True
+    else:
+        if avatar and not user.avatar:
+            user.avatar = avatar
+            changed = True
+        if name and not user.name:
+            user.name = name
+            changed = True
+
+    if changed:
+        user.save(update_fields=["name", "avatar"])
+
+    refresh = RefreshToken.for_user(user)
+    access = refresh.access_token
+
+    return {
+        "access": str(access),
+        "refresh": str(refresh),
+        "user": UserSerializer(user).data,
+    }
+
+
 class GoogleLoginView(generics.GenericAPIView):
     """
     Frontend obtains a Google ID token ("credential") via Google Identity Services,
@@ -138,11 +174,7 @@ class GoogleLoginView(generics.GenericAPIView):
         credential = serializer.validated_data["credential"]
 
         try:
-            payload = google_id_token.verify_oauth2_token(
-                credential,
-                google_requests.Request(),
-                audience=settings.GOOGLE_OAUTH_CLIENT_ID,
-            )
+            payload = verify_google_id_token(credential, audience=settings.GOOGLE_OAUTH_CLIENT_ID)
         except Exception:
             return Response({"detail": "Invalid Google credential."}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -153,37 +185,7 @@ class GoogleLoginView(generics.GenericAPIView):
         name = payload.get("name") or email.split("@", 1)[0]
         avatar = payload.get("picture") or ""
 
-        user, created = User.objects.get_or_create(
-            email=email,
-            defaults={"name": name, "avatar": avatar},
-        )
-
-        # Keep profile info reasonably fresh (don't clobber custom name/avatar if already set).
-        changed = False
-        if created:
-            changed = True
-        else:
-            if avatar and not user.avatar:
-                user.avatar = avatar
-                changed = True
-            if name and not user.name:
-                user.name = name
-                changed = True
-
-        if changed:
-            user.save(update_fields=["name", "avatar"])
-
-        refresh = RefreshToken.for_user(user)
-        access = refresh.access_token
-
-        return Response(
-            {
-                "access": str(access),
-                "refresh": str(refresh),
-                "user": UserSerializer(user).data,
-            },
-            status=status.HTTP_200_OK,
-        )
+        return Response(social_login(email, name, avatar), status=status.HTTP_200_OK)
 
 
 class GitHubLoginView(generics.GenericAPIView):
@@ -205,7 +207,7 @@ class GitHubLoginView(generics.GenericAPIView):
             # Exchange authorization code for access token
             serializer = GitHubCodeSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
-            access_token = self._exchange_code_for_token(code)
+            access_token = github.exchange_code(code)
         elif access_token:
             # Use provided access token directly
             serializer = GitHubAccessTokenSerializer(data=request.data)
@@ -223,24 +225,9 @@ class GitHubLoginView(generics.GenericAPIView):
             )
 
         try:
-            # Verify token and get user info from GitHub API
-            headers = {"Authorization": f"token {access_token}"}
-            user_response = requests.get("https://api.github.com/user", headers=headers, timeout=10)
-            user_response.raise_for_status()
-            github_user = user_response.json()
-
-            # Get email (may need to fetch from email endpoint if not in user response)
-            email = github_user.get("email")
-            if not email:
-                # Try to get email from GitHub email endpoint
-                email_response = requests.get("https://api.github.com/user/emails", headers=headers, timeout=10)
-                if email_response.status_code == 200:
-                    emails = email_response.json()
-                    primary_email = next((e for e in emails if e.get("primary")), None)
-                    if primary_email:
-                        email = primary_email.get("email")
-                    elif emails:
-                        email = emails[0].get("email")
+            # Verify token and get user info from GitHub API (cached briefly per token)
+            profile = github.fetch_profile(access_token)
+            email = profile["email"]
 
             if not email:
                 return Response(
@@ -248,40 +235,10 @@ class GitHubLoginView(generics.GenericAPIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            name = github_user.get("name") or github_user.get("login") or email.split("@", 1)[0]
-            avatar = github_user.get("avatar_url") or ""
-
-            user, created = User.objects.get_or_create(
-                email=email,
-                defaults={"name": name, "avatar": avatar},
-            )
-
-            # Keep profile info reasonably fresh (don't clobber custom name/avatar if already set).
-            changed = False
-            if created:
-                changed = True
-            else:
-                if avatar and not user.avatar:
-                    user.avatar = avatar
-                    changed = True
-                if name and not user.name:
-                    user.name = name
-                    changed = True
-
-            if changed:
-                user.save(update_fields=["name", "avatar"])
+            name = profile["name"] or email.split("@", 1)[0]
+            avatar = profile["avatar"]
 
-            refresh = RefreshToken.for_user(user)
-            access = refresh.access_token
-
-            return Response(
-                {
-                    "access": str(access),
-                    "refresh": str(refresh),
-                    "user": UserSerializer(user).data,
-                },
-                status=status.HTTP_200_OK,
-            )
+            return Response(social_login(email, name, avatar), status=status.HTTP_200_OK)
         except requests.RequestException as e:
             return Response(
                 {"detail": f"Failed to verify GitHub token: {str(e)}"},
@@ -292,24 +249,3 @@ class GitHubLoginView(generics.GenericAPIView):
                 {"detail": f"GitHub authentication failed: {str(e)}"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-
-    def _exchange_code_for_token(self, code: str) -> str | None:
-        """Exchange GitHub authorization code for access token."""
-        if not getattr(settings, "GITHUB_OAUTH_CLIENT_ID", "") or not getattr(settings, "GITHUB_OAUTH_CLIENT_SECRET", ""):
-            return None
-
-        token_url = "https://github.com/login/oauth/access_token"
-        data = {
-            "client_id": settings.GITHUB_OAUTH_CLIENT_ID,
-            "client_secret": settings.GITHUB_OAUTH_CLIENT_SECRET,
-            "code": code,
-        }
-        headers = {"Accept": "application/json"}
-
-        try:
-            response = requests.post(token_url, data=data, headers=headers, timeout=10)
-            response.raise_for_status()
-            token_data = response.json()
-            return token_data.get("access_token")
-        except requests.RequestException:
-            return None
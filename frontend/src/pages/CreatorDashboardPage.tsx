@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from 'react'
+import { useEffect, useState } from 'react'
 import type { FormEvent } from 'react'
 import { Link, useNavigate } from 'react-router-dom'
 import { useAuth } from '../state/auth/AuthContext'
@@ -15,7 +15,7 @@ function minutesToDuration(minutes: number) {
 
 export function CreatorDashboardPage() {
   const navigate = useNavigate()
-  const { user, apiFetch } = useAuth()
+  const { user, apiFetch, apiFetchAll } = useAuth()
 
   const [sessions, setSessions] = useState<Session[]>([])
   const [bookings, setBookings] = useState<Booking[]>([])
@@ -33,16 +33,18 @@ export function CreatorDashboardPage() {
   const [uploadingImage, setUploadingImage] = useState<number | null>(null)
 
   useEffect(() => {
+    if (!user) return
     let mounted = true
     ;(async () => {
       try {
         setError(null)
-        const [allSessions, creatorBookings] = await Promise.all([
-          apiFetch<Session[]>('/api/sessions/', { method: 'GET' }, { skipAuth: true }),
-          apiFetch<Booking[]>('/api/bookings/', { method: 'GET' }),
+        // Only this creator's sessions, every page of them.
+        const [mySessions, creatorBookings] = await Promise.all([
+          apiFetchAll<Session>(`/api/sessions/?creator=${user.id}&page_size=100`, { method: 'GET' }, { skipAuth: true }),
+          apiFetchAll<Booking>('/api/bookings/?page_size=100', { method: 'GET' }),
         ])
         if (!mounted) return
-        setSessions(allSessions)
+        setSessions(mySessions)
         setBookings(creatorBookings)
       } catch (e) {
         const msg = e && typeof e === 'object' && 'message' in e ? String((e as any).message) : 'Failed to load'
@@ -54,9 +56,7 @@ export function CreatorDashboardPage() {
     return () => {
       mounted = false
     }
-  }, [apiFetch])
-
-  const mySessions = useMemo(() => sessions.filter((s) => s.creator === user?.id), [sessions, user?.id])
+  }, [apiFetchAll, user])
 
   async function createSession(e: FormEvent) {
     e.preventDefault()
@@ -237,12 +237,12 @@ export function CreatorDashboardPage() {
 
       {/* My Sessions */}
       <div className="creator-sessions-section">
-        <h2 className="creator-section-title">My Sessions ({mySessions.length})</h2>
-        {mySessions.length === 0 ? (
+        <h2 className="creator-section-title">My Sessions ({sessions.length})</h2>
+        {sessions.length === 0 ? (
           <div className="creator-empty-state">No sessions yet. Create your first session above!</div>
         ) : (
           <div className="creator-sessions-list">
-            {mySessions.map((s) => (
+            {sessions.map((s) => (
               <Link key={s.id} to={`/sessions/${s.id}`} className="creator-session-item">
                 <div className="creator-session-content">
                   <div className="creator-session-title">{s.title}</div>
@@ -1,8 +1,8 @@
 import { useEffect, useMemo, useState, useRef } from 'react'
 import { Link, useNavigate } from 'react-router-dom'
-import { useAuth } from '../state/auth/AuthContext'
+import { pagePath, useAuth } from '../state/auth/AuthContext'
 import { FaArrowLeft } from 'react-icons/fa'
-import type { Booking, Session } from '../types'
+import type { Booking, Paginated, Session } from '../types'
 import './ExploreSessionsPage.css'
 import { loadStripe } from '@stripe/stripe-js'
 
@@ -53,7 +53,10 @@ function SessionCard({ session, onBook, isBooking, canBook, user }: SessionCardP
       {(session.image_url || session.image) && (
         <div className="explore-session-card__image-wrapper">
           <img
-            src={session.image_url || session.image}
+            src={session.image_variants?.card?.jpeg || session.image_url || session.image}
+            srcSet={session.image_srcset || undefined}
+            sizes="(max-width: 640px) 100vw, 400px"
+            loading="lazy"
             alt={session.title}
             className="explore-session-card__image"
           />
@@ -80,6 +83,9 @@ function SessionCard({ session, onBook, isBooking, canBook, user }: SessionCardP
               })}
             </span>
             <span className="explore-session-card__duration">{formatDuration(session.duration)}</span>
+            {!!session.bookings_count && (
+              <span className="explore-session-card__booked">{session.bookings_count} booked</span>
+            )}
           </div>
         </div>
         {session.description && (
@@ -120,6 +126,8 @@ export function ExploreSessionsPage() {
   const [sessions, setSessions] = useState<Session[]>([])
   const [isLoading, setIsLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
+  const [nextPage, setNextPage] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const [bookingStatus, setBookingStatus] = useState<{ [key: number]: string }>({})
   const [bookingSessionId, setBookingSessionId] = useState<number | null>(null)
   const scrollContainerRef = useRef<HTMLDivElement>(null)
@@ -129,8 +137,15 @@ export function ExploreSessionsPage() {
     ;(async () => {
       try {
         setError(null)
-        const data = await apiFetch<Session[]>('/api/sessions/', { method: 'GET' }, { skipAuth: true })
-        if (mounted) setSessions(data)
+        const data = await apiFetch<Paginated<Session>>(
+          '/api/sessions/?upcoming=1&ordering=start_time&page_size=100',
+          { method: 'GET' },
+          { skipAuth: true },
+        )
+        if (mounted) {
+          setSessions(data.results)
+          setNextPage(data.next)
+        }
       } catch (e) {
         const msg = e && typeof e === 'object' && 'message' in e ? String((e as any).message) : 'Failed to load'
         if (mounted) setError(msg)
@@ -143,6 +158,21 @@ export function ExploreSessionsPage() {
     }
   }, [apiFetch])
 
+  async function loadMore() {
+    if (!nextPage) return
+    setIsLoadingMore(true)
+    try {
+      const data = await apiFetch<Paginated<Session>>(pagePath(nextPage), { method: 'GET' }, { skipAuth: true })
+      setSessions((prev) => [...prev, ...data.results])
+      setNextPage(data.next)
+    } catch (e) {
+      // The button stays, so the page can be retried.
+      console.error('Failed to load more sessions:', e)
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
+
   const canBookSession = (session: Session) => {
     if (!user) return false
     // Users and creators can book sessions, but creators cannot book their own sessions
@@ -290,6 +320,11 @@ export function ExploreSessionsPage() {
               </div>
             ))}
           </div>
+          {nextPage ? (
+            <button className="btn btn-secondary" onClick={loadMore} disabled={isLoadingMore}>
+              {isLoadingMore ? 'Loading…' : 'Load more sessions'}
+            </button>
+          ) : null}
         </>
       )}
     </div>
@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from 'react'
 import { Link } from 'react-router-dom'
-import { useAuth } from '../state/auth/AuthContext'
-import type { Session } from '../types'
+import { pagePath, useAuth } from '../state/auth/AuthContext'
+import type { Paginated, Session } from '../types'
 
 function formatMoney(amount: string) {
   const n = Number(amount)
@@ -15,14 +15,23 @@ export function HomePage() {
   const [sessions, setSessions] = useState<Session[]>([])
   const [isLoading, setIsLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
+  const [nextPage, setNextPage] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
 
   useEffect(() => {
     let mounted = true
     ;(async () => {
       try {
         setError(null)
-        const data = await apiFetch<Session[]>('/api/sessions/', { method: 'GET' }, { skipAuth: true })
-        if (mounted) setSessions(data)
+        const data = await apiFetch<Paginated<Session>>(
+          '/api/sessions/?upcoming=1&ordering=start_time&page_size=100',
+          { method: 'GET' },
+          { skipAuth: true },
+        )
+        if (mounted) {
+          setSessions(data.results)
+          setNextPage(data.next)
+        }
       } catch (e) {
         const msg = e && typeof e === 'object' && 'message' in e ? String((e as any).message) : 'Failed to load'
         if (mounted) setError(msg)
@@ -35,13 +44,31 @@ export function HomePage() {
     }
   }, [apiFetch])
 
+  async function loadMore() {
+    if (!nextPage) return
+    setIsLoadingMore(true)
+    try {
+      const data = await apiFetch<Paginated<Session>>(pagePath(nextPage), { method: 'GET' }, { skipAuth: true })
+      setSessions((prev) => [...prev, ...data.results])
+      setNextPage(data.next)
+    } catch (e) {
+      // The button stays, so the page can be retried.
+      console.error('Failed to load more sessions:', e)
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
+
   const cards = useMemo(
     () =>
       sessions.map((s) => (
         <Link key={s.id} to={`/sessions/${s.id}`} className="card session-card">
           {(s.image_url || s.image) && (
             <img
-              src={s.image_url || s.image}
+              src={s.image_variants?.card?.jpeg || s.image_url || s.image}
+              srcSet={s.image_srcset || undefined}
+              sizes="(max-width: 640px) 100vw, 400px"
+              loading="lazy"
               alt={s.title}
               style={{ width: '100%', height: '200px', objectFit: 'cover', borderRadius: '4px 4px 0 0' }}
             />
@@ -72,6 +99,11 @@ export function HomePage() {
       {error ? <div className="card error">Error: {error}</div> : null}
 
       <div className="grid">{cards}</div>
+      {nextPage ? (
+        <button className="btn btn-secondary" onClick={loadMore} disabled={isLoadingMore}>
+          {isLoadingMore ? 'Loading…' : 'Load more sessions'}
+        </button>
+      ) : null}
     </div>
   )
 }
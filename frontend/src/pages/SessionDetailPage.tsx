@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from 'react'
 import { Link, useParams } from 'react-router-dom'
 import { useAuth } from '../state/auth/AuthContext'
-import type { Booking, Session } from '../types'
+import type { Booking, Paginated, Session } from '../types'
 import { loadStripe } from '@stripe/stripe-js'
 import { FaCheckCircle, FaHourglassHalf, FaTimesCircle } from 'react-icons/fa'
 
@@ -17,6 +17,12 @@ export function SessionDetailPage() {
   const [isProcessingPayment, setIsProcessingPayment] = useState(false)
   const [existingBooking, setExistingBooking] = useState<Booking | null>(null)
 
+  // The user's booking of this session, if any, filtered on the server rather than searched for in a page.
+  async function fetchExistingBooking() {
+    const bookings = await apiFetch<Paginated<Booking>>(`/api/bookings/?session=${sessionId}&page_size=1`, { method: 'GET' })
+    return bookings.results[0] ?? null
+  }
+
   useEffect(() => {
     let mounted = true
     ;(async () => {
@@ -28,11 +34,7 @@ export function SessionDetailPage() {
         // Check if user already has a booking for this session
         if (user) {
           try {
-            const bookings = await apiFetch<Booking[]>('/api/bookings/', { method: 'GET' })
-            const existing = bookings.find(b => {
-              const bookingSessionId = typeof b.session === 'object' ? b.session.id : b.session
-              return bookingSessionId === sessionId
-            })
+            const existing = await fetchExistingBooking()
             if (mounted && existing) {
               setExistingBooking(existing)
             }
@@ -85,11 +87,7 @@ export function SessionDetailPage() {
         setIsProcessingPayment(false)
         // Refresh to get the updated booking status
         try {
-          const bookings = await apiFetch<Booking[]>('/api/bookings/', { method: 'GET' })
-          const existing = bookings.find(b => {
-            const bookingSessionId = typeof b.session === 'object' ? b.session.id : b.session
-            return bookingSessionId === sessionId
-          })
+          const existing = await fetchExistingBooking()
           if (existing) setExistingBooking(existing)
         } catch {}
         return
@@ -143,11 +141,7 @@ export function SessionDetailPage() {
         setBookingStatus('You have already booked this session. Check your dashboard to see your existing booking.')
         // Refresh to show the existing booking
         try {
-          const bookings = await apiFetch<Booking[]>('/api/bookings/', { method: 'GET' })
-          const existing = bookings.find(b => {
-            const bookingSessionId = typeof b.session === 'object' ? b.session.id : b.session
-            return bookingSessionId === sessionId
-          })
+          const existing = await fetchExistingBooking()
           if (existing) setExistingBooking(existing)
         } catch {}
       } else {
@@ -183,7 +177,9 @@ export function SessionDetailPage() {
           {(session.image_url || session.image) && (
             <img
               className="hero-image"
-              src={session.image_url || session.image}
+              src={session.image_variants?.hero?.jpeg || session.image_url || session.image}
+              srcSet={session.image_srcset || undefined}
+              sizes="(max-width: 1024px) 100vw, 1024px"
               alt={session.title}
             />
           )}
@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from 'react'
 import { Link } from 'react-router-dom'
 import { useAuth } from '../state/auth/AuthContext'
-import type { Booking, Session } from '../types'
+import type { Booking, Paginated, Session } from '../types'
 import './UserDashboardPage.css'
 import { FaCalendarAlt, FaRupeeSign, FaClock, FaCreditCard, FaMoneyBillWave, FaTimes, FaBars } from 'react-icons/fa'
 import { loadStripe } from '@stripe/stripe-js'
@@ -9,7 +9,7 @@ import { SessionCalendar } from '../components/SessionCalendar'
 import { Sidebar } from '../components/Sidebar'
 
 export function UserDashboardPage() {
-  const { user, apiFetch, becomeCreator } = useAuth()
+  const { user, apiFetch, apiFetchAll, becomeCreator } = useAuth()
   const [bookings, setBookings] = useState<Booking[]>([])
   const [sessions, setSessions] = useState<Session[]>([])
   const [isLoading, setIsLoading] = useState(true)
@@ -27,12 +27,13 @@ export function UserDashboardPage() {
       try {
         setError(null)
         const [bookingsData, sessionsData] = await Promise.all([
-          apiFetch<Booking[]>('/api/bookings/', { method: 'GET' }),
-          apiFetch<Session[]>('/api/sessions/', { method: 'GET' })
+          apiFetchAll<Booking>('/api/bookings/?page_size=100', { method: 'GET' }),
+          // The calendar offers the next 100 sessions, soonest first.
+          apiFetch<Paginated<Session>>('/api/sessions/?upcoming=1&ordering=start_time&page_size=100', { method: 'GET' })
         ])
         if (mounted) {
           setBookings(bookingsData)
-          setSessions(sessionsData)
+          setSessions(sessionsData.results)
         }
       } catch (e) {
         const msg = e && typeof e === 'object' && 'message' in e ? String((e as any).message) : 'Failed to load'
@@ -44,7 +45,7 @@ export function UserDashboardPage() {
     return () => {
       mounted = false
     }
-  }, [apiFetch])
+  }, [apiFetch, apiFetchAll])
 
   useEffect(() => {
     const params = new URLSearchParams(window.location.search)
@@ -60,8 +61,7 @@ export function UserDashboardPage() {
               method: 'POST',
               body: JSON.stringify({ session_id: sessionId }),
             })
-            const data = await apiFetch<Booking[]>('/api/bookings/', { method: 'GET' })
-            setBookings(data)
+            setBookings(await apiFetchAll<Booking>('/api/bookings/?page_size=100', { method: 'GET' }))
           }
         } catch (e) {
           console.error('Payment verification failed:', e)
@@ -73,7 +73,7 @@ export function UserDashboardPage() {
     } else if (paymentStatus === 'cancelled') {
       window.history.replaceState({}, '', '/dashboard')
     }
-  }, [apiFetch])
+  }, [apiFetch, apiFetchAll])
 
 
 
@@ -1,5 +1,5 @@
 import React, { createContext, useContext, useEffect, useMemo, useState } from 'react'
-import type { User } from '../../types'
+import type { Paginated, User } from '../../types'
 
 const ACCESS_TOKEN_KEY = 'accessToken'
 const REFRESH_TOKEN_KEY = 'refreshToken'
@@ -12,6 +12,12 @@ function joinUrl(base: string, path: string) {
   return `${b}${p}`
 }
 
+/** The API path of a page link (`next` / `previous`), which the backend sends as an absolute URL. */
+export function pagePath(link: string) {
+  const url = new URL(link)
+  return `${url.pathname}${url.search}`
+}
+
 async function safeJson(res: Response) {
   const contentType = res.headers.get('content-type') ?? ''
   if (!contentType.includes('application/json')) return null
@@ -45,6 +51,11 @@ type AuthContextValue = {
     init?: RequestInit,
     opts?: { skipAuth?: boolean },
   ) => Promise<T>
+  apiFetchAll: <T = unknown>(
+    path: string,
+    init?: RequestInit,
+    opts?: { skipAuth?: boolean },
+  ) => Promise<T[]>
   refreshSession: () => Promise<boolean>
   updateProfile: (data: { name?: string; avatar?: string }) => Promise<User>
   becomeCreator: () => Promise<User>
@@ -139,6 +150,22 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
     return body as T
   }
 
+  // Every result of a paginated list, following `next` until the last page.
+  async function apiFetchAll<T = unknown>(
+    path: string,
+    init: RequestInit = {},
+    opts: { skipAuth?: boolean } = {},
+  ): Promise<T[]> {
+    const results: T[] = []
+    let next: string | null = path
+    while (next) {
+      const page: Paginated<T> = await apiFetch<Paginated<T>>(next, init, opts)
+      results.push(...page.results)
+      next = page.next ? pagePath(page.next) : null
+    }
+    return results
+  }
+
   async function fetchMe() {
     const me = await apiFetch<User>('/api/users/me/', { method: 'GET' })
     setUser(me)
@@ -240,11 +267,12 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
       githubLogin,
       logout,
       apiFetch,
+      apiFetchAll,
       refreshSession,
       updateProfile,
       becomeCreator,
     }),
-    [user, isLoading, accessToken, refreshToken, login, register, googleLogin, githubLogin, logout, apiFetch, refreshSession, updateProfile, becomeCreator],
+    [user, isLoading, accessToken, refreshToken, login, register, googleLogin, githubLogin, logout, apiFetch, apiFetchAll, refreshSession, updateProfile, becomeCreator],
   )
 
   return <AuthContext.Provider value={value}>{children}</AuthContext.Provider>
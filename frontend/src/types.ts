@@ -8,6 +8,13 @@ export type User = {
   role: Role
 }
 
+export type ImageVariant = {
+  width: number
+  height: number
+  webp: string
+  jpeg: string
+}
+
 export type Session = {
   id: number
   title: string
@@ -17,8 +24,13 @@ export type Session = {
   image: string
   image_file?: string
   image_url?: string
+  image_variants?: Partial<Record<'thumb' | 'card' | 'hero', ImageVariant>>
+  image_srcset?: string
   start_time: string
   duration: string
+  capacity?: number | null
+  seats_taken?: number
+  bookings_count?: number
   created_at: string
   updated_at: string
 }
@@ -36,3 +48,9 @@ export type Booking = {
   created_at: string
 }
 
+
+export type Paginated<T> = {
+  next: string | null
+  previous: string | null
+  results: T[]
+}